@@ -1,7 +1,26 @@
+from typing import Optional, Tuple
+
 from app.persistence.mysql.user_repo_mysql import UserRepositoryMySQL
 from app.persistence.mysql.group_repo_mysql import GroupRepositoryMySQL
 from app.persistence.mysql.expense_repo_mysql import ExpenseRepositoryMySQL
 from app.persistence.mysql.settlement_repo_mysql import SettlementRepositoryMySQL
+from app.persistence.memory.store import MemoryStore
+from app.persistence.memory.user_repo_memory import UserRepositoryMemory
+from app.persistence.memory.group_repo_memory import GroupRepositoryMemory
+from app.persistence.memory.expense_repo_memory import ExpenseRepositoryMemory
+from app.persistence.memory.settlement_repo_memory import SettlementRepositoryMemory
+from app.persistence.sqlite.db import SQLiteDatabase
+from app.persistence.sqlite.user_repo_sqlite import UserRepositorySQLite
+from app.persistence.sqlite.group_repo_sqlite import GroupRepositorySQLite
+from app.persistence.sqlite.expense_repo_sqlite import ExpenseRepositorySQLite
+from app.persistence.sqlite.settlement_repo_sqlite import SettlementRepositorySQLite
+from app.persistence.caching_user_repository import CachingUserRepository
+from app.persistence.instrumentation import QueryRecorder
+
+from app.domain.repositories.user_repository import UserRepository
+from app.domain.repositories.group_repository import GroupRepository
+from app.domain.repositories.expense_repository import ExpenseRepository
+from app.domain.repositories.settlement_repository import SettlementRepository
 
 from app.services.user_service import UserService
 from app.services.group_service import GroupService
@@ -9,35 +28,137 @@ from app.services.expense_service import ExpenseService
 from app.services.settlement_service import SettlementService
 
 from app.domain.domain_services.settlement_calculator import SettlementCalculator
+from app.domain.domain_services.incremental_settlement_calculator import (
+    IncrementalSettlementCalculator,
+)
+
+from app.domain.domain_services.settlement_solver import (
+    ExactSettlementSolver,
+    GreedySettlementSolver,
+    SettlementSolver,
+)
 
-from app.common.config import load_database_config
+from app.common.dirty_groups import DirtyGroups
+from app.common.config import AppConfig, load_app_config, load_database_config
 from app.persistence.mysql.db import MySQLDatabase
 
 
 
-def build_services():
+def build_calculator(
+    name: str, expense_repository: Optional[ExpenseRepository] = None
+) -> SettlementCalculator:
+    """Return the settlement calculator selected by config."""
+    if name == "python":
+        return SettlementCalculator()
+
+    if name == "numpy":
+        from app.domain.domain_services.vectorized_settlement_calculator import (
+            VectorizedSettlementCalculator,
+        )
+        # Reads unloaded groups' split rows directly instead of their expenses
+        return VectorizedSettlementCalculator(expense_repository)
+
+    raise ValueError(f"Unsupported settlement calculator: {name}")
+
+
+def build_solver(config: AppConfig) -> SettlementSolver:
+    """Return the settlement solver selected by config."""
+    if config.settlement_solver == "greedy":
+        return GreedySettlementSolver()
+
+    if config.settlement_solver == "exact":
+        return ExactSettlementSolver(
+            time_budget=config.solver_budget_ms / 1000,
+            max_balances=config.solver_max_balances,
+        )
+
+    raise ValueError(f"Unsupported settlement solver: {config.settlement_solver}")
+
+
+def build_repositories(
+    config: AppConfig, recorder: Optional[QueryRecorder] = None
+) -> Tuple[
+    UserRepository, GroupRepository, ExpenseRepository, SettlementRepository
+]:
+    """Return (user, group, expense, settlement) repositories for the backend."""
+    if config.db_backend == "mysql":
+        # Load DB and create a DB helper
+        db = MySQLDatabase(load_database_config(), recorder=recorder)
+        return (
+            UserRepositoryMySQL(db),
+            GroupRepositoryMySQL(db),
+            ExpenseRepositoryMySQL(db, page_size=config.stream_batch_size),
+            SettlementRepositoryMySQL(db, page_size=config.stream_batch_size),
+        )
+
+    if config.db_backend == "sqlite":
+        sqlite_db = SQLiteDatabase(config.sqlite_path, recorder=recorder)
+        return (
+            UserRepositorySQLite(sqlite_db),
+            GroupRepositorySQLite(sqlite_db),
+            ExpenseRepositorySQLite(sqlite_db, page_size=config.stream_batch_size),
+            SettlementRepositorySQLite(sqlite_db, page_size=config.stream_batch_size),
+        )
+
+    if config.db_backend == "memory":
+        store = MemoryStore()
+        return (
+            UserRepositoryMemory(store),
+            GroupRepositoryMemory(store),
+            ExpenseRepositoryMemory(store, page_size=config.stream_batch_size),
+            SettlementRepositoryMemory(store, page_size=config.stream_batch_size),
+        )
+
+    raise ValueError(f"Unsupported database backend: {config.db_backend}")
+
+
+def build_services(app_config: Optional[AppConfig] = None):
     """Create and return all services with their dependencies wired."""
-    # Load DB and create a DB helper
-    db_config = load_database_config()
-    db = MySQLDatabase(db_config)
+    app_config = app_config or load_app_config()
+
+    # Per-statement timings, readable at runtime via services["query_stats"]
+    recorder = None
+    if app_config.query_stats:
+        recorder = QueryRecorder(slow_threshold=app_config.slow_query_ms / 1000)
 
     # Build repositories
-    user_repo = UserRepositoryMySQL(db)
-    group_repo = GroupRepositoryMySQL(db)
-    expense_repo = ExpenseRepositoryMySQL(db)
-    settlement_repo = SettlementRepositoryMySQL(db)
+    user_repo, group_repo, expense_repo, settlement_repo = build_repositories(
+        app_config, recorder
+    )
+
+    # Users are insert-only, so a write-through cache can front every read
+    if app_config.user_cache_size > 0:
+        user_repo = CachingUserRepository(user_repo, max_size=app_config.user_cache_size)
+
+    # Running balances are shared so expense writes update what settlements read
+    calculator = build_calculator(app_config.settlement_calculator, expense_repo)
+    balance_tracker = None
+    if app_config.balance_tracking:
+        balance_tracker = IncrementalSettlementCalculator(
+            calculator,
+            replay_interval=app_config.balance_replay_seconds,
+        )
+        calculator = balance_tracker
+
+    # Writes flag their group so the background job only revisits changed groups
+    dirty_groups = DirtyGroups()
 
-    
     return {
         "user": UserService(user_repo),
-        "group": GroupService(group_repo, user_repo),
-        "expense": ExpenseService(expense_repo, group_repo, user_repo),
+        "group": GroupService(group_repo, user_repo, dirty_groups),
+        "expense": ExpenseService(
+            expense_repo, group_repo, user_repo, balance_tracker, dirty_groups
+        ),
         "settlement": SettlementService(
             group_repo,
-            SettlementCalculator(),
-            settlement_repo
+            calculator,
+            settlement_repo,
+            build_solver(app_config),
+            dirty_groups
         ),
         "group_repo": group_repo,
+        "query_stats": recorder,
+        "dirty_groups": dirty_groups,
     }
 
 
@@ -2,44 +2,324 @@ import asyncio
 import logging
 """Background tasks that run alongside the CLI."""
 
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Set, Tuple
+from app.common.dirty_groups import DirtyGroups
+from app.common.logger import RateLimitFilter
+from app.domain.entities.user import User
 from app.services.settlement_service import SettlementService
 from app.domain.repositories.group_repository import GroupRepository
 
-logger = logging.getLogger(__name__)  
+logger = logging.getLogger(__name__)
+
+# Per-group balance lines can number thousands per cycle, so they go through
+# their own logger, capped at this many lines per second
+GROUP_LINES_PER_SECOND = 50
+group_logger = logging.getLogger(f"{__name__}.groups")
+group_logger.addFilter(RateLimitFilter(GROUP_LINES_PER_SECOND))
+
+# Re-scan this far behind the watermark so writes that committed late, with an
+# earlier updated_at than rows already seen, are not missed
+WATERMARK_OVERLAP = timedelta(seconds=5)
+
+
+@dataclass(frozen=True)
+class BalanceCycleStats:
+    """Outcome and timing of one pass over the changed groups."""
+    groups: int
+    succeeded: int
+    failed: int
+    timed_out: int
+    # Groups still running from an earlier cycle, or with no free worker
+    # within the timeout; both are retried next cycle
+    skipped: int
+    duration_seconds: float
+
+
+class BalanceLogger:
+    """Recompute and log balances of changed groups on a worker pool.
+
+    A group is revisited when its persisted version moved since the last
+    cycle (found through an updated_at watermark) or when this process
+    marked it dirty; idle groups cost one index range scan, not a recompute.
+    A version that moved without a mark was written by another process, so
+    the service's tracked balances for that group are dropped first.
+
+    Changed groups are read in batches of `batch_size` with one set-based
+    balance query each. Repository and service calls block, so each batch
+    runs on one of `concurrency` threads; the event loop only schedules and
+    waits. A batch slower than group_timeout is reported and left to finish
+    in the background, keeping its thread until then, and its groups are
+    retried once they are no longer running. Batches that find no free
+    thread within the timeout are skipped, and the version scan has its own
+    thread, so a pool full of hung batches cannot stall a cycle.
+    """
+
+    def __init__(
+        self,
+        settlement_service: SettlementService,
+        group_repository: GroupRepository,
+        concurrency: int = 4,
+        group_timeout: float = 10.0,
+        dirty_groups: Optional[DirtyGroups] = None,
+        batch_size: int = 200,
+    ):
+        """Create the logger with its services and limits."""
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        if batch_size < 1:
+            raise ValueError("Batch size must be at least 1")
+
+        self._settlement_service = settlement_service
+        self._group_repo = group_repository
+        self._concurrency = concurrency
+        self._group_timeout = group_timeout
+        self._dirty_groups = dirty_groups
+        self._batch_size = batch_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._scan_executor: Optional[ThreadPoolExecutor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight: Set[int] = set()
+        # Highest updated_at seen, and the version last logged per group
+        self._watermark: Optional[datetime] = None
+        self._logged_versions: Dict[int, int] = {}
+        # Groups that failed, timed out or were still running last cycle
+        self._retry: Set[int] = set()
+        self.last_cycle: Optional[BalanceCycleStats] = None
+
+    async def run(self, interval_seconds: float = 30) -> None:
+        """Run a cycle every interval; overrunning cycles skip the missed ticks."""
+        loop = asyncio.get_running_loop()
+        logger.info(
+            "Background balance logger started "
+            "(interval=%ss, concurrency=%d, batch=%d, timeout=%ss)",
+            interval_seconds, self._concurrency, self._batch_size, self._group_timeout,
+        )
+
+        try:
+            next_run = loop.time()
+            while True:
+                try:
+                    stats = await self.run_cycle()
+                except Exception:
+                    logger.exception("Error while recomputing balances")
+                    stats = None
+
+                next_run += interval_seconds
+                now = loop.time()
+                if now > next_run:
+                    missed = int((now - next_run) // interval_seconds) + 1
+                    next_run += missed * interval_seconds
+                    logger.warning(
+                        "Balance cycle overran the %ss interval (%.2fs); skipping %d tick(s)",
+                        interval_seconds,
+                        stats.duration_seconds if stats else float("nan"),
+                        missed,
+                    )
+
+                # Wait before next run
+                await asyncio.sleep(next_run - now)
+        except asyncio.CancelledError:
+            logger.info("Background balance logger stopped")
+            raise
+        finally:
+            self.close()
+
+    async def run_cycle(self) -> BalanceCycleStats:
+        """Log balances for every changed group once and return the cycle's stats."""
+        loop = asyncio.get_running_loop()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self._concurrency, thread_name_prefix="balance-logger"
+            )
+            self._slots = asyncio.Semaphore(self._concurrency)
+            self._scan_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="balance-scan"
+            )
+
+        started = time.perf_counter()
+        targets = await self._changed_groups(loop)
+
+        # Groups still running from an earlier cycle are not started again
+        outcomes = {group_id: "skipped" for group_id in targets if group_id in self._in_flight}
+        ready = [
+            (group_id, name)
+            for group_id, (name, _) in targets.items()
+            if group_id not in self._in_flight
+        ]
+        batches = [
+            ready[start:start + self._batch_size]
+            for start in range(0, len(ready), self._batch_size)
+        ]
+
+        results = await asyncio.gather(*(self._log_batch(batch) for batch in batches))
+        for batch, outcome in zip(batches, results):
+            for group_id, _ in batch:
+                outcomes[group_id] = outcome
+
+        for group_id, (_, version) in targets.items():
+            outcome = outcomes[group_id]
+            if outcome == "ok":
+                self._retry.discard(group_id)
+                if version is not None:
+                    self._logged_versions[group_id] = version
+            else:
+                self._retry.add(group_id)
+
+        counts = Counter(outcomes.values())
+        stats = BalanceCycleStats(
+            groups=len(targets),
+            succeeded=counts["ok"],
+            failed=counts["failed"],
+            timed_out=counts["timed_out"],
+            skipped=counts["skipped"],
+            duration_seconds=time.perf_counter() - started,
+        )
+        self.last_cycle = stats
+        logger.info(
+            "Balance cycle done | groups=%d | ok=%d | failed=%d | timed_out=%d | "
+            "skipped=%d | duration=%.3fs",
+            stats.groups, stats.succeeded, stats.failed, stats.timed_out,
+            stats.skipped, stats.duration_seconds,
+        )
+        return stats
+
+    async def _changed_groups(self, loop) -> Dict[int, Tuple[Optional[str], Optional[int]]]:
+        """Return {group_id: (name, version)} for groups to log this cycle."""
+        # Drain first: a write marked after this point is caught next cycle
+        marked = self._dirty_groups.drain() if self._dirty_groups is not None else set()
+
+        since = None if self._watermark is None else self._watermark - WATERMARK_OVERLAP
+        stamps = await loop.run_in_executor(
+            self._scan_executor, self._group_repo.get_versions_since, since
+        )
+
+        targets: Dict[int, Tuple[Optional[str], Optional[int]]] = {}
+        external: List[int] = []
+        for stamp in stamps:
+            if self._watermark is None or stamp.updated_at > self._watermark:
+                self._watermark = stamp.updated_at
+            moved = self._logged_versions.get(stamp.id) != stamp.version
+            if moved or stamp.id in marked or stamp.id in self._retry:
+                targets[stamp.id] = (stamp.name, stamp.version)
+            if moved and stamp.id not in marked:
+                external.append(stamp.id)
+
+        # Written by another process: the tracked balances never saw the write
+        if external:
+            self._settlement_service.forget_balances(external)
+
+        # Marked groups outside the scan window (clock skew, old rows)
+        for group_id in (marked | self._retry) - targets.keys():
+            targets[group_id] = (None, None)
+
+        return targets
+
+    def close(self) -> None:
+        """Stop the worker pool without waiting for running groups."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._scan_executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._scan_executor = None
+            self._slots = None
+
+    async def _log_batch(self, batch: List[Tuple[int, Optional[str]]]) -> str:
+        """Run one batch of groups on the pool; return ok, failed, timed_out or skipped."""
+        loop = asyncio.get_running_loop()
+        slots = self._slots
+        try:
+            # Timed-out batches keep their slot until they finish
+            await asyncio.wait_for(slots.acquire(), self._group_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "No free balance worker within %ss | groups=%d | first=%s",
+                self._group_timeout, len(batch), batch[0][0],
+            )
+            return "skipped"
+
+        group_ids = [group_id for group_id, _ in batch]
+        self._in_flight.update(group_ids)
+        future = loop.run_in_executor(self._executor, self._log_balances, batch)
+
+        def finished(done: asyncio.Future) -> None:
+            # Runs when the thread is really done, even after a timeout
+            self._in_flight.difference_update(group_ids)
+            slots.release()
+            if not done.cancelled() and done.exception() is not None:
+                logger.error(
+                    "Balance recompute failed | groups=%d | first=%s",
+                    len(group_ids), group_ids[0],
+                    exc_info=done.exception(),
+                )
+
+        future.add_done_callback(finished)
+
+        try:
+            await asyncio.wait_for(asyncio.shield(future), self._group_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                "Balance recompute exceeded %ss | groups=%d | first=%s",
+                self._group_timeout, len(group_ids), group_ids[0],
+            )
+            return "timed_out"
+        except Exception:
+            # Already logged by the done callback
+            return "failed"
+        return "ok"
+
+    def _log_balances(self, batch: List[Tuple[int, Optional[str]]]) -> None:
+        """Compute and log one batch of groups' balances (runs on a worker thread)."""
+        # Read from the ledger: tracked balances miss other processes' writes
+        balances_by_group = self._settlement_service.get_balances_many(
+            [group_id for group_id, _ in batch], fresh=True
+        )
+
+        for group_id, name in batch:
+            balances = balances_by_group.get(group_id)
+            if balances is None:
+                logger.debug("Group no longer exists | group=%s", group_id)
+                continue
+
+            group_logger.info(
+                "[Group: %s | %s] Balances → %s",
+                name or "?", group_id, _BalanceSummary(balances),
+            )
+
+
+class _BalanceSummary:
+    """Render balances only if the line is actually emitted."""
+
+    __slots__ = ("_balances",)
+
+    def __init__(self, balances: Dict[User, float]):
+        """Keep the balances to render later."""
+        self._balances = balances
+
+    def __str__(self) -> str:
+        """Return "name: balance" pairs, or a placeholder when empty."""
+        return ", ".join(
+            f"{user.name}: {balance:.2f}"
+            for user, balance in self._balances.items()
+        ) or "no balances"
 
 
 async def periodic_balance_logger(
     settlement_service: SettlementService,
     group_repository: GroupRepository,
-    interval_seconds: int = 30
+    interval_seconds: float = 30,
+    concurrency: int = 4,
+    group_timeout: float = 10.0,
+    dirty_groups: Optional[DirtyGroups] = None,
+    batch_size: int = 200,
 ) -> None:
-    """Periodically recompute balances for all groups and log a summary."""
-    logger.info(f"Background balance logger started (interval={interval_seconds}s)")  
-
-    try:
-        
-        while True:
-            try:
-                # Fetch all groups and compute balances
-                groups = group_repository.get_all() or []
-
-                for group in groups:
-                    balances = settlement_service.get_balances(group.id)
-
-                    summary = ", ".join(
-                        f"{user.name}: {balance:.2f}"
-                        for user, balance in balances.items()
-                    ) or "no balances"  
-
-                    logger.info(
-                        f"[Group: {group.name} | {group.id}] Balances → {summary}"
-                    )
-
-            except Exception:
-                logger.exception("Error while recomputing balances")  
-
-            # Wait before next run
-            await asyncio.sleep(interval_seconds)
-    except asyncio.CancelledError:  
-        logger.info("Background balance logger stopped")
-        raise
+    """Periodically recompute balances for changed groups and log a summary."""
+    balance_logger = BalanceLogger(
+        settlement_service, group_repository, concurrency, group_timeout, dirty_groups,
+        batch_size,
+    )
+    await balance_logger.run(interval_seconds)
@@ -11,6 +11,8 @@ class DatabaseConfig:
     user: str
     password: str
     name: str
+    pool_size: int = 5
+    pool_timeout: float = 10.0
 
 
 def load_database_config() -> DatabaseConfig:
@@ -20,4 +22,51 @@ def load_database_config() -> DatabaseConfig:
         user=os.getenv("DB_USER", "root"),
         password=os.getenv("DB_PASSWORD", "root"),
         name=os.getenv("DB_NAME", "expense_manager"),
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    )
+
+
+@dataclass(frozen=True)
+class AppConfig:
+    """Simple container for app-level settings."""
+    db_backend: str = "mysql"
+    sqlite_path: str = "expense_manager.db"
+    settlement_calculator: str = "python"
+    balance_tracking: bool = True
+    balance_replay_seconds: float = 60.0
+    settlement_solver: str = "greedy"
+    solver_budget_ms: int = 200
+    solver_max_balances: int = 16
+    user_cache_size: int = 1024
+    stream_batch_size: int = 500
+    query_stats: bool = True
+    slow_query_ms: float = 200.0
+    balance_log_interval_seconds: float = 30.0
+    balance_log_concurrency: int = 4
+    balance_log_group_timeout_seconds: float = 10.0
+    balance_log_batch_size: int = 200
+
+
+def load_app_config() -> AppConfig:
+    """Load app settings from environment variables."""
+    return AppConfig(
+        db_backend=os.getenv("DB_BACKEND", "mysql").lower(),
+        sqlite_path=os.getenv("SQLITE_PATH", "expense_manager.db"),
+        settlement_calculator=os.getenv("SETTLEMENT_CALCULATOR", "python").lower(),
+        balance_tracking=os.getenv("BALANCE_TRACKING", "on").lower() in ("1", "on", "true", "yes"),
+        balance_replay_seconds=float(os.getenv("BALANCE_REPLAY_SECONDS", "60")),
+        settlement_solver=os.getenv("SETTLEMENT_SOLVER", "greedy").lower(),
+        solver_budget_ms=int(os.getenv("SETTLEMENT_SOLVER_BUDGET_MS", "200")),
+        solver_max_balances=int(os.getenv("SETTLEMENT_SOLVER_MAX_BALANCES", "16")),
+        user_cache_size=int(os.getenv("USER_CACHE_SIZE", "1024")),
+        stream_batch_size=int(os.getenv("STREAM_BATCH_SIZE", "500")),
+        query_stats=os.getenv("QUERY_STATS", "on").lower() in ("1", "on", "true", "yes"),
+        slow_query_ms=float(os.getenv("SLOW_QUERY_MS", "200")),
+        balance_log_interval_seconds=float(os.getenv("BALANCE_LOG_INTERVAL_SECONDS", "30")),
+        balance_log_concurrency=int(os.getenv("BALANCE_LOG_CONCURRENCY", "4")),
+        balance_log_group_timeout_seconds=float(
+            os.getenv("BALANCE_LOG_GROUP_TIMEOUT_SECONDS", "10")
+        ),
+        balance_log_batch_size=int(os.getenv("BALANCE_LOG_BATCH_SIZE", "200")),
     )
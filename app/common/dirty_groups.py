@@ -0,0 +1,32 @@
+"""In-process record of groups written since the background job last looked."""
+
+import threading
+
+
+class DirtyGroups:
+    """Thread-safe set of group ids marked by service writes.
+
+    This is the fast path for changes made by this process; the version
+    column on expense_groups catches writes from other processes.
+    """
+
+    def __init__(self):
+        """Create an empty set."""
+        self._ids: set[int] = set()
+        self._lock = threading.Lock()
+
+    def mark(self, group_id: int) -> None:
+        """Record that a group changed."""
+        with self._lock:
+            self._ids.add(group_id)
+
+    def drain(self) -> set[int]:
+        """Return the marked ids and start a new empty set."""
+        with self._lock:
+            ids, self._ids = self._ids, set()
+        return ids
+
+    def __len__(self) -> int:
+        """Number of groups currently marked."""
+        with self._lock:
+            return len(self._ids)
@@ -0,0 +1,7 @@
+"""Lookup key helpers shared by user repositories and caches."""
+
+
+def normalize_key(value: str) -> str:
+    """Normalize a name or email the way the unique indexes do."""
+    # Matches LOWER(TRIM(...)): SQL TRIM only removes spaces, unlike str.strip()
+    return value.strip(" ").lower()
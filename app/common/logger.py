@@ -1,19 +1,126 @@
-"""Logging setup for console and file output."""
+"""Logging setup for console and file output.
 
+Log calls only put records on an in-process queue; a QueueListener thread
+formats them and does the console and file I/O, so service and worker
+threads never block on disk writes.
+"""
+
+import atexit
+import copy
 import logging
-from logging.handlers import RotatingFileHandler
 import os
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional, Tuple
+
+from pythonjsonlogger import jsonlogger
 
 
 LOG_DIR = "logs"
 LOG_FILE = os.path.join(LOG_DIR, "app.log")
+SLOW_QUERY_LOG_FILE = os.path.join(LOG_DIR, "slow_queries.log")
+
+# Statements over the slow-query threshold are logged here (own file only)
+SLOW_QUERY_LOGGER = "app.slow_queries"
+
+TEXT_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+JSON_FORMAT = "%(asctime)s %(levelname)s %(name)s %(threadName)s %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class _LocalQueueHandler(QueueHandler):
+    """QueueHandler for an in-process queue.
+
+    The stock prepare() formats the whole record, traceback included, into
+    the message on the calling thread. Records here never leave the process,
+    so only the message is merged (its args may change after the call) and
+    exc_info is left for the writer thread's formatter.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Return a copy of the record with its message merged."""
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        return record
+
+
+class _LoggerFilter(logging.Filter):
+    """Pass records from one logger subtree, or everything except it."""
+
+    def __init__(self, name: str, exclude: bool = False):
+        """Create the filter for a logger name."""
+        super().__init__(name)
+        self._exclude = exclude
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether the record should be emitted."""
+        return super().filter(record) != self._exclude
+
+
+class RateLimitFilter(logging.Filter):
+    """Let at most `rate` records per message template through every `per` seconds.
+
+    Meant for high-volume periodic messages such as per-group lines: records
+    over the limit are dropped before any formatting or queueing, and the
+    next record that passes reports how many similar ones were dropped.
+    """
+
+    def __init__(self, rate: int, per: float = 1.0):
+        """Create the filter with its budget per window."""
+        super().__init__()
+        if rate < 1:
+            raise ValueError("Rate must be at least 1")
+        self._rate = rate
+        self._per = per
+        self._lock = threading.Lock()
+        # template -> (window start, passed in window, suppressed since last pass)
+        self._windows: Dict[str, Tuple[float, int, int]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        """Return whether the record fits in its template's budget."""
+        key = str(record.msg)
+        now = time.monotonic()
 
+        with self._lock:
+            started, passed, suppressed = self._windows.get(key, (now, 0, 0))
+            if now - started >= self._per:
+                started, passed = now, 0
+            if passed >= self._rate:
+                self._windows[key] = (started, passed, suppressed + 1)
+                return False
+            self._windows[key] = (started, passed + 1, 0)
+
+        if suppressed:
+            record.suppressed = suppressed
+            if isinstance(record.args, tuple):
+                record.msg = f"{record.msg} (%d similar suppressed)"
+                record.args = (*record.args, suppressed)
+        return True
+
+
+def setup_logging(log_format: Optional[str] = None) -> QueueListener:
+    """Initialize queued console + rotating file logging and return the listener.
+
+    log_format picks the file format, "json" (default) or "text"; it falls
+    back to the LOG_FORMAT environment variable. The console stays text.
+    """
+    global _listener
+
+    log_format = (log_format or os.getenv("LOG_FORMAT", "json")).lower()
+    if log_format not in ("json", "text"):
+        raise ValueError(f"Unknown log format: {log_format}")
 
-def setup_logging():
-    """Initialize console + rotating file logging."""
     # Ensure log directory exists
     os.makedirs(LOG_DIR, exist_ok=True)
 
+    # Flush and stop the writer of an earlier setup
+    stop_logging()
+
     # Configure root logger
     logger = logging.getLogger()
     logger.setLevel(logging.INFO)
@@ -23,28 +130,64 @@ def setup_logging():
         logger.removeHandler(handler)
         handler.close()
 
-    # Consistent log format
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+    text_formatter = logging.Formatter(TEXT_FORMAT)
+    file_formatter = (
+        jsonlogger.JsonFormatter(JSON_FORMAT)
+        if log_format == "json"
+        else text_formatter
     )
 
     # Console output
     console_handler = logging.StreamHandler()
     console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
+    console_handler.setFormatter(text_formatter)
 
     # Rotating file output
     file_handler = RotatingFileHandler(
         LOG_FILE,
         maxBytes=5 * 1024 * 1024,
         backupCount=3,
-        encoding="utf-8"  
+        encoding="utf-8"
     )
     file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
+    file_handler.setFormatter(file_formatter)
+
+    # Dedicated slow-query log, kept out of the console and app.log
+    slow_handler = RotatingFileHandler(
+        SLOW_QUERY_LOG_FILE,
+        maxBytes=5 * 1024 * 1024,
+        backupCount=3,
+        encoding="utf-8"
+    )
+    slow_handler.setFormatter(file_formatter)
+    slow_handler.addFilter(_LoggerFilter(SLOW_QUERY_LOGGER))
+    for handler in (console_handler, file_handler):
+        handler.addFilter(_LoggerFilter(SLOW_QUERY_LOGGER, exclude=True))
+
+    # Callers only enqueue; one writer thread formats and does the I/O
+    log_queue: queue.Queue = queue.Queue()
+    logger.addHandler(_LocalQueueHandler(log_queue))
+    logging.getLogger(SLOW_QUERY_LOGGER).propagate = True
+
+    _listener = QueueListener(
+        log_queue, console_handler, file_handler, slow_handler,
+        respect_handler_level=True,
+    )
+    _listener.start()
+
+    logger.info("Logging initialized (file format: %s)", log_format)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+
+    if _listener is not None:
+        listener, _listener = _listener, None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
 
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
-    
-    logger.info("Logging initialized")  
 
+atexit.register(stop_logging)
@@ -0,0 +1,11 @@
+"""Money helpers shared by persistence backends."""
+
+from decimal import ROUND_HALF_UP, Decimal
+
+
+def to_cents(value: float) -> int:
+    """Convert an amount to cents the way a DECIMAL(10,2) column stores it."""
+    return int(
+        Decimal(repr(float(value))).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+        * 100
+    )
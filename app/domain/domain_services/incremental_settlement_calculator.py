@@ -0,0 +1,178 @@
+"""Stateful settlement calculator that keeps running balances per group."""
+
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+
+from app.common.money import to_cents
+
+from ..entities.expense import Expense
+from ..entities.group import Group
+from ..entities.settlement import Settlement
+from ..entities.user import User
+from .settlement_calculator import SettlementCalculator
+
+
+class IncrementalSettlementCalculator(SettlementCalculator):
+    """Hold per-group running balances and apply write deltas to them.
+
+    A group is tracked once it has been seeded from a full computation.
+    Writes to untracked groups are ignored; they are picked up by the next
+    full computation. Tracked balances are considered stale after
+    replay_interval seconds so callers re-verify them against a full replay.
+    """
+
+    def __init__(
+        self,
+        base: SettlementCalculator | None = None,
+        replay_interval: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Create the calculator around a full-replay calculator."""
+        self._base = base or SettlementCalculator()
+        self._replay_interval = replay_interval
+        self._clock = clock
+        self._balances: dict[int, dict[User, float]] = {}
+        self._verified_at: dict[int, float] = {}
+        # Per-group write counter so a replay racing with a write is not seeded
+        self._writes: dict[int, int] = {}
+        # Writes between writing() entry and exit, possibly already committed
+        self._pending: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def calculate_balances(self, group: Group) -> dict[User, float]:
+        """Return each user's net balance by replaying the full ledger."""
+        return self._base.calculate_balances(group)
+
+    def get_balances(self, group_id: int) -> dict[User, float] | None:
+        """Return tracked balances, or None when untracked or due for a replay."""
+        with self._lock:
+            balances = self._balances.get(group_id)
+            if balances is None:
+                return None
+            if self._clock() - self._verified_at[group_id] >= self._replay_interval:
+                return None
+            return dict(balances)
+
+    def replay_token(self, group_id: int) -> int:
+        """Return a token to take before reading the data for a full replay."""
+        with self._lock:
+            return self._writes.get(group_id, 0)
+
+    def seed(
+        self,
+        group_id: int,
+        balances: dict[User, float],
+        token: int | None = None,
+    ) -> dict[User, float]:
+        """Start tracking a group from a full replay; return the drift found.
+
+        Drift maps each user to (tracked - replayed) where the two differ by
+        at least a cent; it is empty for newly tracked or consistent groups.
+        When token is given and a write happened since it was taken, or one
+        is still in progress, the replay may have missed that write or may
+        already include it before its delta is applied, so the group is left
+        untracked instead.
+        """
+        with self._lock:
+            if token is not None and (
+                self._writes.get(group_id, 0) != token or self._pending.get(group_id)
+            ):
+                self._balances.pop(group_id, None)
+                self._verified_at.pop(group_id, None)
+                return {}
+
+            previous = self._balances.get(group_id)
+            self._balances[group_id] = dict(balances)
+            self._verified_at[group_id] = self._clock()
+
+        if previous is None:
+            return {}
+
+        drift: dict[User, float] = {}
+        for user in previous.keys() | balances.keys():
+            delta = previous.get(user, 0.0) - balances.get(user, 0.0)
+            if abs(delta) >= 0.01:
+                drift[user] = delta
+        return drift
+
+    def forget(self, group_id: int) -> None:
+        """Stop tracking a group."""
+        with self._lock:
+            self._balances.pop(group_id, None)
+            self._verified_at.pop(group_id, None)
+
+    @contextmanager
+    def writing(self, group_id: int) -> Iterator[None]:
+        """Bracket a repository write and the apply_* call that follows it.
+
+        Replays seeded while the write is in progress are refused, so a
+        replay that already reads the committed row is never counted twice.
+        """
+        with self._lock:
+            self._writes[group_id] = self._writes.get(group_id, 0) + 1
+            self._pending[group_id] = self._pending.get(group_id, 0) + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._writes[group_id] += 1
+                if self._pending[group_id] == 1:
+                    del self._pending[group_id]
+                else:
+                    self._pending[group_id] -= 1
+
+    def apply_expense(self, group_id: int, expense: Expense) -> None:
+        """Add an expense to a tracked group's balances."""
+        self._apply_expense(group_id, expense, 1)
+
+    def revert_expense(self, group_id: int, expense: Expense) -> None:
+        """Remove a previously applied expense from a tracked group."""
+        self._apply_expense(group_id, expense, -1)
+
+    def apply_settlement(self, group_id: int, settlement: Settlement) -> None:
+        """Apply a recorded settlement to a tracked group's balances."""
+        self._apply_settlement(group_id, settlement, 1)
+
+    def revert_settlement(self, group_id: int, settlement: Settlement) -> None:
+        """Undo a previously applied settlement."""
+        self._apply_settlement(group_id, settlement, -1)
+
+    def _apply_expense(self, group_id: int, expense: Expense, sign: int) -> None:
+        """Apply an expense's split and payer credit with the given sign."""
+        splits = expense.split()
+        if not splits:
+            return
+
+        with self._lock:
+            self._writes[group_id] = self._writes.get(group_id, 0) + 1
+            balances = self._balances.get(group_id)
+            if balances is None:
+                return
+
+            # Cents per row, as the ledger stores them, so replays do not drift
+            for user, owed in splits.items():
+                balances[user] = balances.get(user, 0) - sign * to_cents(owed) / 100
+
+            balances[expense.paid_by] = (
+                balances.get(expense.paid_by, 0) + sign * to_cents(expense.amount) / 100
+            )
+
+    def _apply_settlement(
+        self, group_id: int, settlement: Settlement, sign: int
+    ) -> None:
+        """Move a settlement amount from creditor to debtor with the given sign."""
+        amount = sign * to_cents(settlement.amount) / 100
+
+        with self._lock:
+            self._writes[group_id] = self._writes.get(group_id, 0) + 1
+            balances = self._balances.get(group_id)
+            if balances is None:
+                return
+
+            # Settlements only adjust users who appear in the group's expenses
+            if settlement.debtor in balances:
+                balances[settlement.debtor] += amount
+            if settlement.creditor in balances:
+                balances[settlement.creditor] -= amount
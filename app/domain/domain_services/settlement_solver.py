@@ -0,0 +1,225 @@
+"""Settlement solvers that turn net balances into suggested transfers."""
+
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+
+from ..entities.user import User
+
+Transfer = tuple[User, User, float]
+
+# Balances within a cent of zero are treated as settled
+_TOLERANCE_CENTS = 1
+
+# The subset DP keeps two lists of 2^n ints; 22 balances is ~70 MB, and
+# each extra balance doubles it, so larger caps are rejected up front
+MAX_EXACT_BALANCES = 22
+
+# Largest default size the pure Python DP solves within the default 200 ms
+# budget (about 70 ms at 16; 17 already takes about 190 ms)
+DEFAULT_MAX_BALANCES = 16
+
+
+@dataclass(frozen=True)
+class SettlementSolution:
+    """Suggested transfers plus the solver mode that produced them."""
+
+    transfers: list[Transfer]
+    mode: str
+
+
+def greedy_transfers(balances: dict[User, float]) -> list[Transfer]:
+    """Greedily match largest debtors with largest creditors."""
+    debtors: list[tuple[User, float]] = []
+    creditors: list[tuple[User, float]] = []
+
+    for user, balance in balances.items():
+        if balance < -0.01:
+            debtors.append((user, -balance))  # store positive value owed
+        elif balance > 0.01:
+            creditors.append((user, balance))
+
+    debtors.sort(key=lambda x: x[1], reverse=True)
+    creditors.sort(key=lambda x: x[1], reverse=True)
+
+    suggestions: list[Transfer] = []
+
+    debtor_idx = 0
+    creditor_idx = 0
+
+    while debtor_idx < len(debtors) and creditor_idx < len(creditors):
+        debtor, debt_amount = debtors[debtor_idx]
+        creditor, credit_amount = creditors[creditor_idx]
+
+        amount = min(debt_amount, credit_amount)
+        suggestions.append((debtor, creditor, round(amount, 2)))
+
+        debt_amount -= amount
+        credit_amount -= amount
+
+        if debt_amount <= 0.01:
+            debtor_idx += 1
+        else:
+            debtors[debtor_idx] = (debtor, debt_amount)
+
+        if credit_amount <= 0.01:
+            creditor_idx += 1
+        else:
+            creditors[creditor_idx] = (creditor, credit_amount)
+
+    return suggestions
+
+
+class SettlementSolver(ABC):
+    """Turns net balances into suggested transfers."""
+
+    @abstractmethod
+    def solve(self, balances: dict[User, float]) -> SettlementSolution:
+        """Return the transfers that settle the balances."""
+        pass
+
+
+class GreedySettlementSolver(SettlementSolver):
+    """Fast heuristic: largest debtor pays largest creditor."""
+
+    def solve(self, balances: dict[User, float]) -> SettlementSolution:
+        """Return greedy transfers for the balances."""
+        return SettlementSolution(greedy_transfers(balances), "greedy")
+
+
+class _BudgetExceeded(Exception):
+    """Internal signal that the exact search ran out of time."""
+
+
+class ExactSettlementSolver(SettlementSolver):
+    """Minimum number of transfers via zero-sum subset partitioning.
+
+    n non-zero balances that split into k zero-sum subsets need exactly n - k
+    transfers, so the solver maximizes k with a bitmask DP over subsets
+    (O(n * 2^n)). Groups with more than max_balances non-zero balances, or
+    searches exceeding time_budget seconds, fall back to the fallback
+    solver's plan (greedy by default).
+    """
+
+    def __init__(
+        self,
+        time_budget: float = 0.2,
+        max_balances: int = DEFAULT_MAX_BALANCES,
+        clock: Callable[[], float] = time.monotonic,
+        fallback: SettlementSolver | None = None,
+    ):
+        """Create the solver with a time budget, a size cap and a fallback."""
+        if max_balances > MAX_EXACT_BALANCES:
+            raise ValueError(
+                f"Exact solver max_balances must be at most {MAX_EXACT_BALANCES}"
+            )
+        self._time_budget = time_budget
+        self._max_balances = max_balances
+        self._clock = clock
+        self._fallback = fallback or GreedySettlementSolver()
+
+    def solve(self, balances: dict[User, float]) -> SettlementSolution:
+        """Return a minimum-transfer plan, or the fallback plan."""
+        entries = [
+            (user, balance) for user, balance in balances.items() if abs(balance) > 0.01
+        ]
+        if len(entries) > self._max_balances:
+            return self._fallback.solve(balances)
+
+        # Exact opposites always settle best as their own one-transfer group
+        groups, rest = self._pair_opposites(entries)
+
+        try:
+            groups.extend(self._zero_sum_groups(rest))
+        except _BudgetExceeded:
+            return self._fallback.solve(balances)
+
+        # A zero-sum group of m balances settles in at most m - 1 transfers,
+        # so the result never needs more than any other plan
+        transfers: list[Transfer] = []
+        for group in groups:
+            transfers.extend(greedy_transfers(dict(group)))
+
+        return SettlementSolution(transfers, "exact")
+
+    @staticmethod
+    def _pair_opposites(
+        entries: list[tuple[User, float]]
+    ) -> tuple[list[list[tuple[User, float]]], list[tuple[User, float]]]:
+        """Split off (x, -x) pairs; return (pair groups, remaining entries)."""
+        waiting: dict[int, list[tuple[User, float]]] = {}
+        groups: list[list[tuple[User, float]]] = []
+
+        for user, balance in entries:
+            cents = round(balance * 100)
+            partners = waiting.get(-cents)
+            if partners:
+                groups.append([partners.pop(), (user, balance)])
+            else:
+                waiting.setdefault(cents, []).append((user, balance))
+
+        rest = [entry for bucket in waiting.values() for entry in bucket]
+        return groups, rest
+
+    def _zero_sum_groups(
+        self, entries: list[tuple[User, float]]
+    ) -> list[list[tuple[User, float]]]:
+        """Partition entries into the maximum number of zero-sum groups."""
+        n = len(entries)
+        if n == 0:
+            return []
+
+        deadline = self._clock() + self._time_budget
+        cents = [round(balance * 100) for _, balance in entries]
+        full = (1 << n) - 1
+
+        # dp[mask]: most zero-sum prefixes over any ordering of mask's members
+        sums = [0] * (full + 1)
+        dp = [0] * (full + 1)
+
+        for mask in range(1, full + 1):
+            if not mask & 0x3FF and self._clock() > deadline:
+                raise _BudgetExceeded()
+
+            low = mask & -mask
+            sums[mask] = sums[mask ^ low] + cents[low.bit_length() - 1]
+
+            best = 0
+            rest = mask
+            while rest:
+                bit = rest & -rest
+                if dp[mask ^ bit] > best:
+                    best = dp[mask ^ bit]
+                rest ^= bit
+
+            dp[mask] = best + (abs(sums[mask]) <= _TOLERANCE_CENTS)
+
+        # Walk back to recover an ordering, then cut it at zero-sum prefixes
+        order: list[int] = []
+        mask = full
+        while mask:
+            target = dp[mask] - (abs(sums[mask]) <= _TOLERANCE_CENTS)
+            rest = mask
+            while rest:
+                bit = rest & -rest
+                if dp[mask ^ bit] == target:
+                    break
+                rest ^= bit
+            order.append(bit.bit_length() - 1)
+            mask ^= bit
+        order.reverse()
+
+        groups: list[list[tuple[User, float]]] = []
+        current: list[tuple[User, float]] = []
+        prefix = 0
+        for idx in order:
+            current.append(entries[idx])
+            prefix += cents[idx]
+            if abs(prefix) <= _TOLERANCE_CENTS:
+                groups.append(current)
+                current = []
+        if current:
+            groups.append(current)
+
+        return groups
@@ -0,0 +1,95 @@
+"""NumPy-backed settlement calculator for large group ledgers."""
+
+from ..entities.group import Group
+from ..entities.user import User
+from ..repositories.expense_repository import ExpenseRepository, LedgerColumns
+from .settlement_calculator import SettlementCalculator
+
+try:
+    import numpy as np
+except ImportError:  # optional dependency, see the "fast" extra
+    np = None
+
+
+class VectorizedSettlementCalculator(SettlementCalculator):
+    """Compute balances by flattening the ledger into index arrays.
+
+    Each split row and each payer credit becomes one (user index, amount)
+    entry; balances are then a single weighted np.bincount. With an expense
+    repository, groups whose expenses are not loaded yet are flattened from
+    the stored split rows in one pass, so no Expense or split strategy is
+    built and the sums match the group_balances ledger. Loaded groups are
+    flattened from their expenses. Entries are emitted in the same order as
+    SettlementCalculator visits them, so for loaded groups the floating
+    point sums are identical.
+    """
+
+    def __init__(self, expense_repository: ExpenseRepository | None = None):
+        """Fail fast when NumPy is not installed."""
+        if np is None:
+            raise ImportError(
+                "VectorizedSettlementCalculator requires numpy "
+                "(pip install 'smart-group-expense-manager[fast]')"
+            )
+        self._expense_repo = expense_repository
+
+    def calculate_balances(self, group: Group) -> dict[User, float]:
+        """Return each user's net balance in the group."""
+        users, user_idx, amounts = self.ledger_arrays(group)
+        if not users:
+            return {}
+
+        totals = self.balances_from_arrays(user_idx, amounts, len(users))
+        return {user: float(total) for user, total in zip(users, totals, strict=True)}
+
+    def ledger_arrays(
+        self, group: Group
+    ) -> tuple[list[User], "np.ndarray", "np.ndarray"]:
+        """Flatten the group's ledger into (users, user index array, signed amounts)."""
+        if (
+            self._expense_repo is not None
+            and group.id is not None
+            and not group.expenses_loaded
+        ):
+            users, user_idx, amounts = self._expense_repo.get_ledger_columns(group.id)
+        else:
+            users, user_idx, amounts = self.expense_columns(group)
+
+        return (
+            users,
+            np.asarray(user_idx, dtype=np.intp),
+            np.asarray(amounts, dtype=np.float64),
+        )
+
+    @staticmethod
+    def expense_columns(group: Group) -> LedgerColumns:
+        """Flatten a group's in-memory expenses into ledger columns."""
+        users: list[User] = []
+        # Keyed on user.id: hashing the User dataclass per entry is the hot cost
+        index: dict[int, int] = {}
+        user_idx: list[int] = []
+        amounts: list[float] = []
+
+        def idx_of(user: User) -> int:
+            pos = index.get(user.id)
+            if pos is None:
+                pos = index[user.id] = len(users)
+                users.append(user)
+            return pos
+
+        for expense in group.expenses:
+            for user, owed in expense.split().items():
+                user_idx.append(idx_of(user))
+                amounts.append(-owed)
+
+            user_idx.append(idx_of(expense.paid_by))
+            amounts.append(expense.amount)
+
+        return users, user_idx, amounts
+
+    @staticmethod
+    def balances_from_arrays(
+        user_idx: "np.ndarray", amounts: "np.ndarray", user_count: int
+    ) -> "np.ndarray":
+        """Sum signed amounts per user index."""
+        return np.bincount(user_idx, weights=amounts, minlength=user_count)
@@ -1,19 +1,48 @@
 """Group entity with members and expenses."""
 
-from typing import List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
 from .user import User
 from .expense import Expense
 
 
+@dataclass(frozen=True)
+class GroupSummary:
+    """Lightweight read-only projection of a group header."""
+    id: int
+    name: str
+    member_count: int
+    expense_count: int
+
+
+@dataclass(frozen=True)
+class GroupVersion:
+    """Change stamp of a group; every write that touches the group bumps it."""
+    id: int
+    name: str
+    version: int
+    updated_at: datetime
+
+
 class Group:
     """Represents an expense group."""
 
-    def __init__(self, group_id: Optional[int], name: str):
-        """Create a group with id and name."""
+    def __init__(
+        self,
+        group_id: Optional[int],
+        name: str,
+        expenses_loader: Optional[Callable[[], List[Expense]]] = None,
+    ):
+        """Create a group with id and name; expenses may be loaded lazily."""
         self.id = group_id
         self.name = name
         self._members: List[User] = []
         self._expenses: List[Expense] = []
+        self._expenses_loader = expenses_loader
+        # Membership changes not yet persisted, keyed by user id
+        self._added_members: Dict[Optional[int], User] = {}
+        self._removed_members: Dict[Optional[int], User] = {}
 
     def add_member(self, user: User) -> None:
         """Add a user to the group."""
@@ -22,11 +51,16 @@ class Group:
                 raise ValueError(f"User '{user.name}' is already a member of this group")
         self._members.append(user)
 
+        if self._removed_members.pop(user.id, None) is None:
+            self._added_members[user.id] = user
+
     def remove_member(self, user: User) -> None:
         """Remove a user from the group."""
         for idx, member in enumerate(self._members):
             if member.id == user.id:
                 del self._members[idx]
+                if self._added_members.pop(member.id, None) is None:
+                    self._removed_members[member.id] = member
                 return
         raise ValueError("User not part of this group")
 
@@ -34,6 +68,20 @@ class Group:
         """Add an expense to the group."""
         self._expenses.append(expense)
 
+    def pending_member_changes(self) -> Tuple[List[User], List[User]]:
+        """Return (added, removed) members since the last persisted state."""
+        return list(self._added_members.values()), list(self._removed_members.values())
+
+    def mark_members_clean(self) -> None:
+        """Forget pending membership changes once they are persisted."""
+        self._added_members.clear()
+        self._removed_members.clear()
+
+    @property
+    def expenses_loaded(self) -> bool:
+        """Return True once the expense list is in memory."""
+        return self._expenses_loader is None
+
     @property
     def members(self) -> List[User]:
         """Return a copy of the members list."""
@@ -41,5 +89,15 @@ class Group:
 
     @property
     def expenses(self) -> List[Expense]:
-        """Return a copy of the expenses list."""
+        """Return a copy of the expenses list, loading it on first access."""
+        if self._expenses_loader is not None:
+            # Cleared only after a successful load so a failed one is retried
+            loaded = self._expenses_loader()
+            # Expenses added in memory may have been persisted before this load
+            loaded_ids = {expense.id for expense in loaded}
+            self._expenses = loaded + [
+                expense for expense in self._expenses
+                if expense.id is None or expense.id not in loaded_ids
+            ]
+            self._expenses_loader = None
         return list(self._expenses)
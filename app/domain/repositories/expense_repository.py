@@ -1,7 +1,11 @@
 """Expense repository interface."""
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Iterator, List, Optional, Tuple
 from ..entities.expense import Expense
+from ..entities.user import User
+
+# (users, index into users per entry, signed amount per entry)
+LedgerColumns = Tuple[List[User], List[int], List[float]]
 
 
 """Abstract interface for expense data access."""
@@ -16,3 +20,24 @@ class ExpenseRepository(ABC):
     @abstractmethod
     def get_by_group(self, group_id: int) -> List[Expense]:
         pass
+
+    @abstractmethod
+    def save_many(self, expenses: List[Expense], group_id: int) -> List[Expense]:
+        """Persist many expenses for a group in one transaction."""
+        pass
+
+    @abstractmethod
+    def iter_by_group(
+        self, group_id: int, batch_size: Optional[int] = None
+    ) -> Iterator[Expense]:
+        """Stream a group's expenses in id order without loading them all."""
+        pass
+
+    @abstractmethod
+    def get_ledger_columns(self, group_id: int) -> LedgerColumns:
+        """Return a group's stored splits and payer credits as flat columns.
+
+        Each split row is one (participant, -share) entry and each expense adds
+        a (payer, +amount) entry after its splits; no Expense is built.
+        """
+        pass
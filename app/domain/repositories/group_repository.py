@@ -1,8 +1,10 @@
 """Group repository interface."""
 
 from abc import ABC, abstractmethod
-from typing import Optional, List
-from app.domain.entities.group import Group
+from datetime import datetime
+from typing import Dict, Iterable, Optional, List
+from app.domain.entities.group import Group, GroupSummary, GroupVersion
+from app.domain.entities.user import User
 
 
 class GroupRepository(ABC):
@@ -15,7 +17,22 @@ class GroupRepository(ABC):
 
     @abstractmethod
     def get_by_id(self, group_id: int) -> Optional[Group]:
-        """Fetch a group by id."""
+        """Fetch a group with members; expenses load on first access."""
+        pass
+
+    @abstractmethod
+    def get_summary(self, group_id: int) -> Optional[GroupSummary]:
+        """Fetch a group header (name and counts) without members or expenses."""
+        pass
+
+    @abstractmethod
+    def exists(self, group_id: int) -> bool:
+        """Return True if the group exists."""
+        pass
+
+    @abstractmethod
+    def get_members_by_ids(self, group_id: int, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Return the given users that are members of the group, keyed by id."""
         pass
 
     @abstractmethod
@@ -23,3 +40,7 @@ class GroupRepository(ABC):
         """Return all groups (read-only)."""
         pass
 
+    @abstractmethod
+    def get_versions_since(self, since: Optional[datetime]) -> List[GroupVersion]:
+        """Return change stamps of groups updated at or after since (all if None)."""
+        pass
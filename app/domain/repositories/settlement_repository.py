@@ -1,7 +1,8 @@
 """Settlement repository interface."""
 from abc import ABC, abstractmethod
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional
 from ..entities.settlement import Settlement
+from ..entities.user import User
 
 
 class SettlementRepository(ABC):
@@ -21,3 +22,29 @@ class SettlementRepository(ABC):
     def get_all(self) -> List[Settlement]:
         """Get all settlements."""
         pass
+
+    @abstractmethod
+    def iter_by_group(
+        self, group_id: int, batch_size: Optional[int] = None
+    ) -> Iterator[Settlement]:
+        """Stream a group's settlements newest first without loading them all."""
+        pass
+
+    @abstractmethod
+    def iter_all(self, batch_size: Optional[int] = None) -> Iterator[Settlement]:
+        """Stream all settlements newest first without loading them all."""
+        pass
+
+    @abstractmethod
+    def get_net_balances(self, group_id: int) -> Dict[User, float]:
+        """Return each user's net balance (expenses minus settlements) for a group."""
+        pass
+
+    @abstractmethod
+    def get_net_balances_many(self, group_ids: Iterable[int]) -> Dict[int, Dict[User, float]]:
+        """Return net balances keyed by group for a batch of groups.
+
+        Existing groups without balances map to an empty dict; ids of groups
+        that do not exist are left out.
+        """
+        pass
@@ -1,7 +1,7 @@
 """User repository interface."""
 
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from ..entities.user import User
 
 
@@ -18,11 +18,21 @@ class UserRepository(ABC):
         """Fetch a user by id."""
         pass
 
+    @abstractmethod
+    def get_many_by_ids(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Fetch several users at once, keyed by id; unknown ids are omitted."""
+        pass
+
     @abstractmethod
     def get_by_email(self, email: str) -> Optional[User]:
         """Fetch a user by email."""
         pass
 
+    @abstractmethod
+    def get_by_name(self, name: str) -> Optional[User]:
+        """Fetch a user by name (case-insensitive, surrounding spaces ignored)."""
+        pass
+
     @abstractmethod
     def get_all(self) -> list[User]:
         """Return all users."""
@@ -1,12 +1,19 @@
 """Menu-driven CLI entry point and handlers."""
 
 import asyncio
+import contextlib
+import itertools
+import threading
+from typing import Callable, TypeVar
 
 from app.common.logger import setup_logging
 from app.bootstrap.container import build_services
 from app.common.background_tasks import periodic_balance_logger
+from app.common.config import load_app_config
 from app.domain.split_strategies.factory import SplitType
 
+T = TypeVar("T")
+
 
 class MenuDrivenInterface:
     """Interactive CLI for user, group, expense, and settlement flows."""
@@ -79,11 +86,7 @@ class MenuDrivenInterface:
                 print(f"   Email: {existing_by_email.email}")
                 return
 
-            existing_by_name = None
-            for user in self.services["user"].list_users():
-                if user.name.strip().lower() == normalized_name:
-                    existing_by_name = user
-                    break
+            existing_by_name = self.services["user"].get_user_by_name(normalized_name)
 
             if existing_by_name:
                 print(" User already exists with this name!")
@@ -347,7 +350,7 @@ class MenuDrivenInterface:
             print("\n Expense added successfully!")
             print(f"   ID: {expense.id}")
             try:
-                group = self.services["group"].get_group_details(int(group_id))
+                group = self.services["group"].get_group_summary(int(group_id))
                 print(f"   Group: {group.name} ({group.id})")
             except Exception:
                 print(f"   Group ID: {group_id}")
@@ -409,15 +412,17 @@ class MenuDrivenInterface:
                 print(" Invalid number format!")
                 return
 
-            expenses = self.services["expense"].list_expenses(group_id)
+            # Pages are fetched as the loop advances, so large groups never load at once
+            expenses = self.services["expense"].iter_expenses(group_id)
 
-            if not expenses:
+            first = next(expenses, None)
+            if first is None:
                 print("No expenses recorded for this group.")
                 return
 
-            group_details = self.services["group"].get_group_details(int(group_id))
-            print(f"\n--- Expenses for {group_details.name} ---")
-            for expense in expenses:
+            group_summary = self.services["group"].get_group_summary(int(group_id))
+            print(f"\n--- Expenses for {group_summary.name} ---")
+            for expense in itertools.chain([first], expenses):
                 print(f"\nID: {expense.id}")
                 print(f"   Paid By: {expense.paid_by.name} ({expense.paid_by.id})")
                 print(f"   Amount: {expense.amount:.2f}")
@@ -525,32 +530,31 @@ class MenuDrivenInterface:
                 return
 
             try:
-                group_details = self.services["group"].get_group_details(group_id)
-                suggestions = self.services["settlement"].get_settlement_suggestions(group_id)
+                plan = self.services["settlement"].get_settlement_plan(group_id)
             except ValueError as ve:
                 print(f" Error: {ve}")
                 return
 
-            print(f"\n--- Settlement Suggestions for {group_details.name} ---")
-            print(f"Group Members: {', '.join(f'{m.name} ({m.id})' for m in group_details.members)}")
+            print(f"\n--- Settlement Suggestions for {plan.group_name} ---")
+            print(f"Group Members: {', '.join(f'{m.name} ({m.id})' for m in plan.members)}")
 
-            if not suggestions:
+            if not plan.suggestions:
                 print("\n Everyone is settled up already!")
                 return
 
-            print("\nSuggested Payments:")
-            for idx, (payer, receiver, amount) in enumerate(suggestions, 1):
+            mode_label = "minimum transfers" if plan.mode == "exact" else "greedy"
+            print(f"\nSuggested Payments ({mode_label}):")
+            for idx, (payer, receiver, amount) in enumerate(plan.suggestions, 1):
                 print(f"   {idx}. {payer.name} ({payer.id}) ➜ {receiver.name} ({receiver.id}): {amount:.2f}")
 
-            post_balances = self.services["settlement"].get_balances_after_settlement(group_id)
             print("\nBalances After Settlement (simulated):")
-            for user, amount in post_balances.items():
+            for user, amount in plan.balances_after.items():
                 print(f"   {user.name} ({user.id}): {amount:.2f}")
 
             # Ask if user wants to record settlements
             record = input("\nRecord these settlements in database? (y/n): ").strip().lower()
             if record == 'y':
-                for payer, receiver, amount in suggestions:
+                for payer, receiver, amount in plan.suggestions:
                     self.services["settlement"].record_settlement(
                         group_id, payer.id, receiver.id, amount
                     )
@@ -564,7 +568,12 @@ class MenuDrivenInterface:
         """Run the main menu loop."""
         while self.running:
             self.display_main_menu()
-            choice = input("Select an option: ").strip()
+            try:
+                choice = input("Select an option: ").strip()
+            except EOFError:
+                # stdin closed (Ctrl+D or piped input ran out)
+                self.running = False
+                break
 
             if choice == "1":
                 self.user_menu()
@@ -580,30 +589,75 @@ class MenuDrivenInterface:
                 print(" Invalid choice. Please try again.")
 
 
+def run_in_daemon_thread(func: Callable[[], T]) -> "asyncio.Future[T]":
+    """Run a blocking callable in a daemon thread and await its result.
+
+    Unlike asyncio.to_thread, a thread parked in input() never holds up
+    interpreter exit after the event loop has shut down.
+    """
+    loop = asyncio.get_running_loop()
+    future: "asyncio.Future[T]" = loop.create_future()
+
+    def settle(result, error) -> None:
+        if future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def target() -> None:
+        try:
+            result, error = func(), None
+        except BaseException as exc:
+            result, error = None, exc
+        # The loop is already closed if the CLI was interrupted meanwhile
+        with contextlib.suppress(RuntimeError):
+            loop.call_soon_threadsafe(settle, result, error)
+
+    threading.Thread(target=target, name="cli-menu", daemon=True).start()
+    return future
+
+
 async def main_async():
     """Create services, start background task, and run the CLI."""
     # logging.basicConfig(level=logging.INFO)
 
-    services = build_services()
+    app_config = load_app_config()
+    services = build_services(app_config)
 
-    asyncio.create_task(
+    background = asyncio.create_task(
         periodic_balance_logger(
             settlement_service=services["settlement"],
             group_repository=services["group_repo"],
-            interval_seconds=30
+            interval_seconds=app_config.balance_log_interval_seconds,
+            concurrency=app_config.balance_log_concurrency,
+            group_timeout=app_config.balance_log_group_timeout_seconds,
+            dirty_groups=services["dirty_groups"],
+            batch_size=app_config.balance_log_batch_size,
         )
     )
 
     menu = MenuDrivenInterface(services)
-    menu.run()
+    try:
+        # input() and service calls block, so the menu runs in its own thread
+        # and the event loop stays free for background tasks
+        await run_in_daemon_thread(menu.run)
+    finally:
+        menu.running = False
+        background.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await background
 
 
 def main():
     """Program entry point."""
     setup_logging()
-    asyncio.run(main_async())
+    try:
+        asyncio.run(main_async())
+    except KeyboardInterrupt:
+        print("\nExiting.")
 
 
 if __name__ == "__main__":
     main()
-
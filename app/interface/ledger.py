@@ -0,0 +1,51 @@
+"""Maintenance command to rebuild or verify the group_balances ledger.
+
+Usage:
+    python -m app.interface.ledger verify [--group ID]
+    python -m app.interface.ledger rebuild [--group ID]
+"""
+
+import argparse
+import sys
+
+from app.common.config import load_database_config
+from app.common.logger import setup_logging
+from app.persistence.mysql.balance_ledger import BalanceLedgerMySQL
+from app.persistence.mysql.db import MySQLDatabase
+
+
+def main(argv=None) -> int:
+    """Run the ledger command and return a process exit code."""
+    parser = argparse.ArgumentParser(description="Maintain the balance ledger")
+    parser.add_argument("command", choices=["verify", "rebuild"])
+    parser.add_argument("--group", type=int, default=None, help="limit to one group id")
+    args = parser.parse_args(argv)
+
+    setup_logging()
+    db = MySQLDatabase(load_database_config())
+    ledger = BalanceLedgerMySQL(db)
+
+    try:
+        if args.command == "rebuild":
+            written = ledger.rebuild(args.group)
+            print(f" Ledger rebuilt ({written} rows written)")
+            return 0
+
+        mismatches = ledger.verify(args.group)
+        if not mismatches:
+            print(" Ledger matches recomputed balances")
+            return 0
+
+        print(f" Ledger has {len(mismatches)} mismatched rows:")
+        for m in mismatches:
+            print(
+                f"   group={m.group_id} user={m.user_id} "
+                f"ledger={m.ledger_cents / 100:.2f} expected={m.expected_cents / 100:.2f}"
+            )
+        return 1
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
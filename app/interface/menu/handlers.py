@@ -1,5 +1,6 @@
 """Menu handlers that map CLI actions to services."""
 
+import itertools
 from typing import Dict, List, Optional
 
 from app.services.user_service import UserService
@@ -126,12 +127,13 @@ class MenuHandlers:
     def list_expenses(self, group_id: int) -> None:
         """List expenses for a group via the expense service."""
         try:
-            expenses = self.expense_service.list_expenses(group_id)
-            if not expenses:
+            expenses = self.expense_service.iter_expenses(group_id)
+            first = next(expenses, None)
+            if first is None:
                 print(" No expenses found")
                 return
 
-            for exp in expenses:
+            for exp in itertools.chain([first], expenses):
                 print(f"- {exp.id} | {exp.amount:.2f} | paid by {exp.paid_by.name} ({exp.paid_by.id})")
         except Exception as e:
             print(f" Failed to list expenses: {e}")
@@ -155,17 +157,16 @@ class MenuHandlers:
     def generate_settlement(self, group_id: int) -> None:
         """Show settlement suggestions for a group."""
         try:
-            suggestions = self.settlement_service.get_settlement_suggestions(group_id)
-            if not suggestions:
+            plan = self.settlement_service.get_settlement_plan(group_id)
+            if not plan.suggestions:
                 print(" No settlements required")
                 return
 
-            for payer, receiver, amount in suggestions:
+            for payer, receiver, amount in plan.suggestions:
                 print(f"- {payer.name} pays {receiver.name} amount {amount:.2f}")
 
-            post_balances = self.settlement_service.get_balances_after_settlement(group_id)
             print("\nBalances After Settlement (simulated):")
-            for user, amount in post_balances.items():
+            for user, amount in plan.balances_after.items():
                 print(f"- {user.name} ({user.id}): {amount:.2f}")
         except Exception as e:
             print(f" Failed to generate settlement: {e}")
\ No newline at end of file
@@ -0,0 +1,189 @@
+"""Write-through LRU cache in front of any UserRepository."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from app.common.keys import normalize_key
+from app.domain.entities.user import User
+from app.domain.repositories.user_repository import UserRepository
+
+
+@dataclass(frozen=True)
+class UserCacheStats:
+    """Snapshot of cache usage counters."""
+
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+
+
+class CachingUserRepository(UserRepository):
+    """Serve users by id, email and name from a bounded LRU cache.
+
+    Users are only ever inserted, so cached entries never go stale through
+    this process; save() invalidates anything under the saved name or email
+    and writes the new row through. Lookups that miss are not cached negatively.
+    """
+
+    def __init__(self, inner: UserRepository, max_size: int = 1024):
+        """Wrap a repository with a cache holding at most max_size users."""
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+
+        self._inner = inner
+        self._max_size = max_size
+        self._by_id: "OrderedDict[int, User]" = OrderedDict()
+        self._id_by_email: dict[str, int] = {}
+        self._id_by_name: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._lock = threading.Lock()
+
+    def save(self, user: User) -> User:
+        """Persist through the inner repository and cache the saved row."""
+        self._invalidate(user)
+        saved = self._inner.save(user)
+        self._remember(saved)
+        return saved
+
+    def get_by_id(self, user_id: int) -> User | None:
+        """Fetch a user by id, from the cache when possible."""
+        with self._lock:
+            user = self._lookup(user_id)
+        if user is not None:
+            return user
+
+        user = self._inner.get_by_id(user_id)
+        if user is not None:
+            self._remember(user)
+        return user
+
+    def get_many_by_ids(self, user_ids: Iterable[int]) -> dict[int, User]:
+        """Fetch several users, only asking the inner repository for misses."""
+        found: dict[int, User] = {}
+        missing: list[int] = []
+
+        with self._lock:
+            for user_id in dict.fromkeys(user_ids):
+                user = self._lookup(user_id)
+                if user is None:
+                    missing.append(user_id)
+                else:
+                    found[user_id] = user
+
+        if missing:
+            fetched = self._inner.get_many_by_ids(missing)
+            for user in fetched.values():
+                self._remember(user)
+            found.update(fetched)
+
+        return found
+
+    def get_by_email(self, email: str) -> User | None:
+        """Fetch a user by email (case-insensitive), from the cache when possible."""
+        with self._lock:
+            user = self._lookup_key(self._id_by_email, normalize_key(email))
+        if user is not None:
+            return user
+
+        user = self._inner.get_by_email(email)
+        if user is not None:
+            self._remember(user)
+        return user
+
+    def get_by_name(self, name: str) -> User | None:
+        """Fetch a user by name (case-insensitive), from the cache when possible."""
+        with self._lock:
+            user = self._lookup_key(self._id_by_name, normalize_key(name))
+        if user is not None:
+            return user
+
+        user = self._inner.get_by_name(name)
+        if user is not None:
+            self._remember(user)
+        return user
+
+    def get_all(self) -> list:
+        """Return all users from the inner repository without caching them."""
+        # A full listing would push up to max_size cold users into the LRU
+        # and evict the hot entries that lookups actually reuse
+        return self._inner.get_all()
+
+    def invalidate(self, user_id: int | None = None) -> None:
+        """Drop one cached user, or everything when no id is given."""
+        with self._lock:
+            if user_id is None:
+                self._by_id.clear()
+                self._id_by_email.clear()
+                self._id_by_name.clear()
+                return
+
+            self._forget(user_id)
+
+    def stats(self) -> UserCacheStats:
+        """Return a snapshot of the cache counters."""
+        with self._lock:
+            return UserCacheStats(
+                size=len(self._by_id),
+                max_size=self._max_size,
+                hits=self._hits,
+                misses=self._misses,
+            )
+
+    def _lookup(self, user_id: int) -> User | None:
+        """Return a cached user and count the hit or miss; caller holds the lock."""
+        user = self._by_id.get(user_id)
+        if user is None:
+            self._misses += 1
+            return None
+
+        self._by_id.move_to_end(user_id)
+        self._hits += 1
+        return user
+
+    def _lookup_key(self, index: dict[str, int], key: str) -> User | None:
+        """Return a cached user through a secondary index; caller holds the lock."""
+        user_id = index.get(key)
+        if user_id is None:
+            self._misses += 1
+            return None
+        return self._lookup(user_id)
+
+    def _remember(self, user: User) -> None:
+        """Insert or refresh a user, evicting the least recently used entry."""
+        if user.id is None:
+            return
+
+        with self._lock:
+            self._forget(user.id)
+
+            self._by_id[user.id] = user
+            self._id_by_email[normalize_key(user.email)] = user.id
+            self._id_by_name[normalize_key(user.name)] = user.id
+
+            while len(self._by_id) > self._max_size:
+                self._forget(next(iter(self._by_id)))
+
+    def _forget(self, user_id: int) -> None:
+        """Drop a user and its index entries; caller holds the lock."""
+        user = self._by_id.pop(user_id, None)
+        if user is None:
+            return
+        if self._id_by_email.get(normalize_key(user.email)) == user_id:
+            del self._id_by_email[normalize_key(user.email)]
+        if self._id_by_name.get(normalize_key(user.name)) == user_id:
+            del self._id_by_name[normalize_key(user.name)]
+
+    def _invalidate(self, user: User) -> None:
+        """Drop whatever users are cached under this user's email or name."""
+        with self._lock:
+            for index, key in (
+                (self._id_by_email, normalize_key(user.email)),
+                (self._id_by_name, normalize_key(user.name)),
+            ):
+                user_id = index.pop(key, None)
+                if user_id is not None:
+                    self._forget(user_id)
@@ -0,0 +1,142 @@
+"""Backend-neutral assembly of Expense entities from expense+split join rows."""
+
+from collections.abc import Callable, Iterable
+
+from app.domain.entities.expense import Expense
+from app.domain.entities.user import User
+from app.domain.repositories.expense_repository import LedgerColumns
+from app.domain.split_strategies.base import SplitStrategy
+from app.persistence.identity_map import intern_user
+
+
+def assemble_expenses(
+    rows: Iterable[tuple],
+    strategy_factory: Callable[[str, dict[User, float]], SplitStrategy],
+    user_cache: dict[int, User] | None = None,
+) -> list[Expense]:
+    """Build Expense objects from expense+split join rows ordered by expense id."""
+    cache: dict[int, User] = {} if user_cache is None else user_cache
+    expenses: list[Expense] = []
+
+    current_id = None
+    header: tuple = ()
+    participants: list[User] = []
+    amounts: dict[User, float] = {}
+
+    def flush() -> None:
+        expense_id, paid_by, amount, split_type = header
+        expenses.append(
+            Expense(
+                expense_id=int(expense_id),
+                paid_by=paid_by,
+                amount=float(amount),
+                participants=participants,
+                split_strategy=strategy_factory(split_type, amounts),
+                split_type=split_type,
+            )
+        )
+
+    for (
+        expense_id,
+        payer_id,
+        payer_name,
+        payer_email,
+        amount,
+        split_type,
+        user_id,
+        user_name,
+        user_email,
+        split_amount,
+    ) in rows:
+        if expense_id != current_id:
+            if current_id is not None:
+                flush()
+
+            paid_by = cache.get(payer_id)
+            if not paid_by:
+                paid_by = intern_user(payer_id, payer_name, payer_email)
+                cache[payer_id] = paid_by
+
+            current_id = expense_id
+            header = (expense_id, paid_by, amount, split_type)
+            participants = []
+            amounts = {}
+
+        participant = cache.get(user_id)
+        if not participant:
+            participant = intern_user(user_id, user_name, user_email)
+            cache[user_id] = participant
+
+        participants.append(participant)
+        amounts[participant] = float(split_amount)
+
+    if current_id is not None:
+        flush()
+
+    return expenses
+
+
+def ledger_columns(
+    rows: Iterable[tuple], user_cache: dict[int, User] | None = None
+) -> LedgerColumns:
+    """Flatten expense+split join rows ordered by expense id in one pass.
+
+    Entries come out in the order SettlementCalculator visits them: each
+    expense's splits as negative shares, then its payer's credit.
+    """
+    cache: dict[int, User] = {} if user_cache is None else user_cache
+    users: list[User] = []
+    index: dict[int, int] = {}
+    user_idx: list[int] = []
+    amounts: list[float] = []
+
+    def idx_of(user_id: int, name: str, email: str) -> int:
+        pos = index.get(user_id)
+        if pos is None:
+            user = cache.get(user_id)
+            if not user:
+                user = cache[user_id] = intern_user(user_id, name, email)
+            pos = index[user_id] = len(users)
+            users.append(user)
+        return pos
+
+    current_id = None
+    payer: tuple = ()
+
+    for (
+        expense_id,
+        payer_id,
+        payer_name,
+        payer_email,
+        amount,
+        _,
+        user_id,
+        user_name,
+        user_email,
+        split_amount,
+    ) in rows:
+        if expense_id != current_id:
+            if current_id is not None:
+                user_idx.append(idx_of(*payer[:3]))
+                amounts.append(payer[3])
+
+            current_id = expense_id
+            payer = (payer_id, payer_name, payer_email, float(amount))
+
+        user_idx.append(idx_of(user_id, user_name, user_email))
+        amounts.append(-float(split_amount))
+
+    if current_id is not None:
+        user_idx.append(idx_of(*payer[:3]))
+        amounts.append(payer[3])
+
+    return users, user_idx, amounts
+
+
+def percentages_from_shares(amounts: dict[User, float]) -> dict[User, float]:
+    """Turn the stored shares of a percentage split back into percentages."""
+    total = sum(amounts.values())
+    if not total:
+        # A zero-amount expense keeps no ratios; any valid split gives zero shares
+        return {user: 100 / len(amounts) for user in amounts}
+    return {user: value * 100 / total for user, value in amounts.items()}
@@ -0,0 +1,51 @@
+"""Process-wide identity map so each user id maps to one User instance."""
+
+import threading
+import weakref
+
+from app.domain.entities.user import User
+
+
+class UserIdentityMap:
+    """Intern User instances by id while anything still references them.
+
+    Entries are held weakly, so users drop out once no expense, group or
+    cache refers to them. A row whose name or email differs from the
+    interned instance replaces it.
+    """
+
+    def __init__(self):
+        """Create an empty identity map."""
+        self._users: "weakref.WeakValueDictionary[int, User]" = (
+            weakref.WeakValueDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def intern(self, user_id: int, name: str, email: str) -> User:
+        """Return the shared User for this row, creating it if needed."""
+        with self._lock:
+            user = self._users.get(user_id)
+            if user is not None and user.name == name and user.email == email:
+                return user
+
+            user = User(user_id, name, email)
+            self._users[user_id] = user
+            return user
+
+    def get(self, user_id: int) -> User | None:
+        """Return the interned user for an id, if still alive."""
+        with self._lock:
+            return self._users.get(user_id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._users)
+
+
+# Shared by every repository in the process
+user_identity_map = UserIdentityMap()
+
+
+def intern_user(user_id: int, name: str, email: str) -> User:
+    """Intern a user row in the shared identity map."""
+    return user_identity_map.intern(int(user_id), name, email)
@@ -0,0 +1,260 @@
+"""Per-statement timing, row counts and call-site histograms for DB access."""
+
+import bisect
+import logging
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from app.common.logger import SLOW_QUERY_LOGGER
+
+slow_query_logger = logging.getLogger(SLOW_QUERY_LOGGER)
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open
+BUCKET_BOUNDS_MS: tuple[float, ...] = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+@dataclass(frozen=True)
+class StatementStats:
+    """Aggregated timings for the statements issued from one call site."""
+
+    call_site: str
+    count: int
+    total_seconds: float
+    max_seconds: float
+    rows: int
+    # Counts per BUCKET_BOUNDS_MS bucket, plus one overflow bucket
+    buckets: tuple[int, ...]
+
+    @property
+    def mean_seconds(self) -> float:
+        """Average statement time."""
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+class QueryRecorder:
+    """Thread-safe sink that aggregates statement timings per call site.
+
+    Statements slower than slow_threshold seconds are also written to the
+    slow-query log with their SQL, duration, rows and call site.
+    """
+
+    def __init__(self, slow_threshold: float | None = 0.2):
+        """Create an empty recorder; None disables the slow-query log."""
+        self._slow_threshold = slow_threshold
+        self._stats: dict[str, list[Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, call_site: str, sql: str, seconds: float, rows: int) -> None:
+        """Add one finished statement to its call site's histogram."""
+        bucket = bisect.bisect_left(BUCKET_BOUNDS_MS, seconds * 1000)
+
+        with self._lock:
+            entry = self._stats.get(call_site)
+            if entry is None:
+                # [count, total, max, rows, buckets]
+                entry = [0, 0.0, 0.0, 0, [0] * (len(BUCKET_BOUNDS_MS) + 1)]
+                self._stats[call_site] = entry
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+            entry[3] += rows
+            entry[4][bucket] += 1
+
+        if self._slow_threshold is not None and seconds >= self._slow_threshold:
+            slow_query_logger.warning(
+                "%.1f ms | rows=%d | %s | %s",
+                seconds * 1000,
+                rows,
+                call_site,
+                " ".join(sql.split()),
+            )
+
+    def snapshot(self) -> dict[str, StatementStats]:
+        """Return current aggregates keyed by call site."""
+        with self._lock:
+            return {
+                call_site: StatementStats(
+                    call_site=call_site,
+                    count=entry[0],
+                    total_seconds=entry[1],
+                    max_seconds=entry[2],
+                    rows=entry[3],
+                    buckets=tuple(entry[4]),
+                )
+                for call_site, entry in self._stats.items()
+            }
+
+    def reset(self) -> None:
+        """Drop all aggregates."""
+        with self._lock:
+            self._stats.clear()
+
+
+class InstrumentedCursor:
+    """Cursor proxy that times each statement and counts the rows it returns.
+
+    A statement is finished, and recorded, when its result is fully fetched,
+    the next statement runs, or the cursor is closed or discarded; fetch time
+    counts towards the statement so unbuffered reads are measured too.
+    """
+
+    def __init__(self, raw, recorder: QueryRecorder):
+        """Wrap a raw DB-API cursor."""
+        self._raw = raw
+        self._recorder = recorder
+        self._pending: list[Any] | None = None
+
+    def execute(self, sql, *args, **kwargs):
+        """Run a statement and start timing it."""
+        return self._run(self._raw.execute, sql, args, kwargs)
+
+    def executemany(self, sql, *args, **kwargs):
+        """Run a batched statement and start timing it."""
+        return self._run(self._raw.executemany, sql, args, kwargs)
+
+    def fetchone(self):
+        """Fetch one row, adding it to the current statement."""
+        row = self._timed_fetch(self._raw.fetchone)
+        if row is None:
+            self._finish()
+        elif self._pending is not None:
+            self._pending[3] += 1
+        return row
+
+    def fetchmany(self, *args, **kwargs):
+        """Fetch a batch of rows, adding them to the current statement."""
+        rows = self._timed_fetch(self._raw.fetchmany, *args, **kwargs)
+        if self._pending is not None:
+            self._pending[3] += len(rows)
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        """Fetch the remaining rows and finish the statement."""
+        rows = self._timed_fetch(self._raw.fetchall)
+        if self._pending is not None:
+            self._pending[3] += len(rows)
+        self._finish()
+        return rows
+
+    def __iter__(self):
+        """Stream rows, finishing the statement once they run out."""
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        """Finish the current statement and close the raw cursor."""
+        self._finish()
+        return self._raw.close()
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else (lastrowid, rowcount, ...) to the raw cursor."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __del__(self):
+        self._finish()
+
+    def _run(self, method, sql, args, kwargs):
+        """Finish any previous statement, then time this one's execution."""
+        self._finish()
+        call_site = find_call_site()
+        started = time.perf_counter()
+        try:
+            result = method(sql, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            # [sql, call_site, elapsed, rows]
+            self._pending = [sql, call_site, elapsed, 0]
+
+        # sqlite3's execute returns the raw cursor; keep callers on the proxy
+        return self if result is self._raw else result
+
+    def _timed_fetch(self, method, *args, **kwargs):
+        """Call a fetch method and add its time to the current statement."""
+        started = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            if self._pending is not None:
+                self._pending[2] += time.perf_counter() - started
+
+    def _finish(self) -> None:
+        """Record the current statement, if any."""
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            sql, call_site, elapsed, rows = pending
+            if not rows:
+                rowcount = getattr(self._raw, "rowcount", -1)
+                rows = rowcount if isinstance(rowcount, int) and rowcount > 0 else 0
+            self._recorder.record(call_site, sql, elapsed, rows)
+
+
+class InstrumentedConnection:
+    """Connection proxy whose cursors record every statement."""
+
+    def __init__(self, raw, recorder: QueryRecorder):
+        """Wrap a raw (or pooled) DB-API connection."""
+        self._raw = raw
+        self._recorder = recorder
+
+    def cursor(self, *args, **kwargs) -> InstrumentedCursor:
+        """Return an instrumented cursor."""
+        return InstrumentedCursor(self._raw.cursor(*args, **kwargs), self._recorder)
+
+    def execute(self, sql, *args) -> InstrumentedCursor:
+        """sqlite3-style shortcut: run a statement on a new instrumented cursor."""
+        cursor = self.cursor()
+        cursor.execute(sql, *args)
+        return cursor
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate commit/rollback/close and the rest to the raw connection."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._raw.close()
+
+
+def find_call_site(max_depth: int = 12) -> str:
+    """Name the repository method issuing a statement, e.g. 'UserRepositoryMySQL.get_by_id'."""
+    frame = sys._getframe(1)
+    fallback = None
+
+    for _ in range(max_depth):
+        if frame is None:
+            break
+        module = frame.f_globals.get("__name__", "")
+        # Skip this module, connection helpers and context-manager plumbing
+        if (
+            module != __name__
+            and module != "contextlib"
+            and not module.endswith((".db", ".pool"))
+        ):
+            owner = frame.f_locals.get("self")
+            if owner is not None and not frame.f_code.co_name.startswith("__"):
+                return f"{type(owner).__name__}.{frame.f_code.co_name}"
+            if fallback is None:
+                fallback = f"{frame.f_globals.get('__name__')}.{frame.f_code.co_name}"
+        frame = frame.f_back
+
+    return fallback or "unknown"
@@ -0,0 +1,180 @@
+"""In-memory implementation for expense repository."""
+
+import bisect
+from collections.abc import Callable, Iterable, Iterator
+
+from app.common.money import to_cents
+from app.domain.entities.expense import Expense
+from app.domain.entities.user import User
+from app.domain.repositories.expense_repository import (
+    ExpenseRepository,
+    LedgerColumns,
+)
+from app.domain.split_strategies.base import SplitStrategy
+from app.domain.split_strategies.custom import CustomSplitStrategy
+from app.domain.split_strategies.equal import EqualSplitStrategy
+from app.domain.split_strategies.percentage import PercentageSplitStrategy
+from app.persistence.expense_rows import ledger_columns, percentages_from_shares
+from app.persistence.identity_map import intern_user
+
+from .store import ExpenseRow, MemoryStore, cents_to_amount
+
+# Expenses per page when streaming
+_PAGE_SIZE = 500
+
+
+class ExpenseRepositoryMemory(ExpenseRepository):
+    """Stores expenses in a MemoryStore indexed by group."""
+
+    def __init__(self, store: MemoryStore, page_size: int = _PAGE_SIZE):
+        """Create repo over a shared store with the streaming page size."""
+        self._store = store
+        self._page_size = page_size
+
+    def save(self, expense: Expense, group_id: int) -> Expense:
+        """Insert an expense, its splits and its ledger deltas atomically."""
+        return self.save_many([expense], group_id)[0]
+
+    def save_many(self, expenses: list[Expense], group_id: int) -> list[Expense]:
+        """Insert many expenses for a group in one locked update."""
+        if not expenses:
+            return []
+
+        # Validate every split up front so a bad row never touches the tables
+        all_splits = [expense.split() for expense in expenses]
+        store = self._store
+
+        with store.lock:
+            if group_id not in store.groups:
+                raise ValueError("Group not found")
+
+            for expense, splits in zip(expenses, all_splits, strict=False):
+                for user in (expense.paid_by, *splits):
+                    if user.id not in store.users:
+                        raise ValueError(f"User {user.id} not found")
+
+            deltas: dict[int, int] = {}
+            for expense, splits in zip(expenses, all_splits, strict=False):
+                row = ExpenseRow(
+                    id=store.next_id("expenses"),
+                    group_id=group_id,
+                    paid_by=expense.paid_by.id,
+                    amount_cents=to_cents(expense.amount),
+                    split_type=expense.split_type,
+                    splits=[
+                        (user.id, to_cents(value)) for user, value in splits.items()
+                    ],
+                )
+                store.expenses[row.id] = row
+                store.group_expenses.setdefault(group_id, []).append(row.id)
+                expense.id = row.id
+
+                if row.splits:
+                    deltas[row.paid_by] = deltas.get(row.paid_by, 0) + row.amount_cents
+                    for user_id, cents in row.splits:
+                        deltas[user_id] = deltas.get(user_id, 0) - cents
+
+            store.apply_balance_deltas(group_id, deltas, from_expense=True)
+            store.bump_group_version(group_id)
+
+        return expenses
+
+    def get_by_group(self, group_id: int) -> list[Expense]:
+        """Return all expenses for a group that have splits."""
+        store = self._store
+
+        with store.lock:
+            rows = [
+                store.expenses[eid]
+                for eid in store.group_expenses.get(group_id, [])
+                if store.expenses[eid].splits
+            ]
+            return build_expenses(store, rows, self._create_strategy)
+
+    def get_ledger_columns(self, group_id: int) -> LedgerColumns:
+        """Return the group's stored splits and payer credits as flat columns."""
+        store = self._store
+
+        with store.lock:
+            rows = [
+                (
+                    row.id,
+                    row.paid_by,
+                    *store.users[row.paid_by],
+                    cents_to_amount(row.amount_cents),
+                    row.split_type,
+                    user_id,
+                    *store.users[user_id],
+                    cents_to_amount(cents),
+                )
+                for row in map(
+                    store.expenses.get, store.group_expenses.get(group_id, [])
+                )
+                for user_id, cents in row.splits
+            ]
+        return ledger_columns(rows)
+
+    def iter_by_group(
+        self, group_id: int, batch_size: int | None = None
+    ) -> Iterator[Expense]:
+        """Stream a group's expenses that have splits in id order, one page at a time."""
+        store = self._store
+        limit = batch_size or self._page_size
+        after_id = 0
+
+        while True:
+            with store.lock:
+                ids = store.group_expenses.get(group_id, [])
+                start = bisect.bisect_right(ids, after_id)
+                scanned = ids[start : start + limit]
+                rows = [
+                    store.expenses[eid] for eid in scanned if store.expenses[eid].splits
+                ]
+                page = build_expenses(store, rows, self._create_strategy)
+
+            yield from page
+
+            if len(scanned) < limit:
+                return
+            after_id = scanned[-1]
+
+    @staticmethod
+    def _create_strategy(split_type: str, amounts: dict[User, float]) -> SplitStrategy:
+        """Create appropriate strategy based on split_type."""
+        if split_type == "EqualSplitStrategy":
+            return EqualSplitStrategy()
+        elif split_type == "PercentageSplitStrategy":
+            return PercentageSplitStrategy(percentages_from_shares(amounts))
+        else:  # CustomSplitStrategy
+            return CustomSplitStrategy(amounts)
+
+
+def build_expenses(
+    store: MemoryStore,
+    rows: Iterable[ExpenseRow],
+    strategy_factory: Callable[[str, dict[User, float]], SplitStrategy],
+) -> list[Expense]:
+    """Materialize Expense entities from stored rows; caller holds the lock."""
+    expenses: list[Expense] = []
+
+    for row in rows:
+        paid_by = intern_user(row.paid_by, *store.users[row.paid_by])
+        participants: list[User] = []
+        amounts: dict[User, float] = {}
+        for user_id, cents in row.splits:
+            participant = intern_user(user_id, *store.users[user_id])
+            participants.append(participant)
+            amounts[participant] = cents_to_amount(cents)
+
+        expenses.append(
+            Expense(
+                expense_id=row.id,
+                paid_by=paid_by,
+                amount=cents_to_amount(row.amount_cents),
+                participants=participants,
+                split_strategy=strategy_factory(row.split_type, amounts),
+                split_type=row.split_type,
+            )
+        )
+
+    return expenses
@@ -0,0 +1,146 @@
+"""In-memory implementation for group repository."""
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from app.domain.entities.group import Group, GroupSummary, GroupVersion
+from app.domain.entities.user import User
+from app.domain.repositories.group_repository import GroupRepository
+from app.domain.split_strategies.custom import CustomSplitStrategy
+from app.persistence.identity_map import intern_user
+
+from .expense_repo_memory import build_expenses
+from .store import MemoryStore
+
+
+class GroupRepositoryMemory(GroupRepository):
+    """Stores groups and memberships in a MemoryStore."""
+
+    def __init__(self, store: MemoryStore):
+        """Create repo over a shared store."""
+        self._store = store
+
+    def save(self, group: Group) -> Group:
+        """Insert or update a group, applying only membership changes."""
+        added, removed = group.pending_member_changes()
+        store = self._store
+
+        with store.lock:
+            # Validate everything first so a bad member leaves the store untouched
+            if group.id is not None and group.id not in store.groups:
+                raise ValueError("Group not found")
+            for member in added:
+                if member.id not in store.users:
+                    raise ValueError(f"User {member.id} not found")
+
+            if group.id is None:
+                group_id = store.next_id("groups")
+                store.group_members[group_id] = {}
+            else:
+                group_id = group.id
+
+            store.groups[group_id] = group.name
+            members = store.group_members[group_id]
+            for member in removed:
+                members.pop(member.id, None)
+            for member in added:
+                members[member.id] = None
+            store.bump_group_version(group_id)
+
+        group.id = group_id
+        group.mark_members_clean()
+        return group
+
+    def get_by_id(self, group_id: int) -> Group | None:
+        """Fetch a group with members; expenses load on first access."""
+        store = self._store
+
+        with store.lock:
+            name = store.groups.get(group_id)
+            if name is None:
+                return None
+            members = self._members(group_id)
+
+        group = Group(
+            group_id=group_id,
+            name=name,
+            expenses_loader=lambda: self._load_expenses(group_id),
+        )
+        for member in members:
+            group.add_member(member)
+        group.mark_members_clean()
+        return group
+
+    def get_summary(self, group_id: int) -> GroupSummary | None:
+        """Return a group header with member and expense counts."""
+        store = self._store
+
+        with store.lock:
+            name = store.groups.get(group_id)
+            if name is None:
+                return None
+            return GroupSummary(
+                id=group_id,
+                name=name,
+                member_count=len(store.group_members.get(group_id, ())),
+                expense_count=len(store.group_expenses.get(group_id, ())),
+            )
+
+    def exists(self, group_id: int) -> bool:
+        """Return True if the group exists."""
+        return group_id in self._store.groups
+
+    def get_members_by_ids(
+        self, group_id: int, user_ids: Iterable[int]
+    ) -> dict[int, User]:
+        """Return the given users that are members of the group, keyed by id."""
+        store = self._store
+
+        with store.lock:
+            members = store.group_members.get(group_id, {})
+            return {
+                user_id: intern_user(user_id, *store.users[user_id])
+                for user_id in user_ids
+                if user_id in members
+            }
+
+    def get_all(self) -> list[Group]:
+        """Return all groups (read-only)."""
+        with self._store.lock:
+            rows = list(self._store.groups.items())
+        return [Group(group_id=group_id, name=name) for group_id, name in rows]
+
+    def get_versions_since(self, since: datetime | None) -> list[GroupVersion]:
+        """Return change stamps of groups updated at or after since (all if None)."""
+        store = self._store
+        with store.lock:
+            return [
+                GroupVersion(
+                    id=group_id,
+                    name=store.groups[group_id],
+                    version=version,
+                    updated_at=updated_at,
+                )
+                for group_id, (version, updated_at) in store.group_versions.items()
+                if since is None or updated_at >= since
+            ]
+
+    def _members(self, group_id: int) -> list[User]:
+        """Materialize a group's members; caller holds the lock."""
+        store = self._store
+        return [
+            intern_user(user_id, *store.users[user_id])
+            for user_id in store.group_members.get(group_id, {})
+        ]
+
+    def _load_expenses(self, group_id: int):
+        """Materialize a group's expenses with custom split strategies."""
+        store = self._store
+
+        with store.lock:
+            rows = [
+                store.expenses[eid] for eid in store.group_expenses.get(group_id, [])
+            ]
+            return build_expenses(
+                store, rows, lambda split_type, amounts: CustomSplitStrategy(amounts)
+            )
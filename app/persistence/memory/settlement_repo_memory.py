@@ -0,0 +1,155 @@
+"""In-memory implementation for settlement repository."""
+
+import bisect
+from collections.abc import Iterable, Iterator
+
+from app.common.money import to_cents
+from app.domain.entities.settlement import Settlement
+from app.domain.entities.user import User
+from app.domain.repositories.settlement_repository import SettlementRepository
+from app.persistence.identity_map import intern_user
+
+from .store import MemoryStore, SettlementRow, cents_to_amount
+
+# Settlements per page when streaming
+_PAGE_SIZE = 500
+
+
+class SettlementRepositoryMemory(SettlementRepository):
+    """Stores settlements in a MemoryStore indexed by group."""
+
+    def __init__(self, store: MemoryStore, page_size: int = _PAGE_SIZE):
+        """Create repo over a shared store with the streaming page size."""
+        self._store = store
+        self._page_size = page_size
+
+    def save(self, settlement: Settlement) -> Settlement:
+        """Insert a settlement and move its amount in the ledger atomically."""
+        store = self._store
+        cents = to_cents(settlement.amount)
+
+        with store.lock:
+            if settlement.group_id not in store.groups:
+                raise ValueError("Group not found")
+            for user in (settlement.debtor, settlement.creditor):
+                if user.id not in store.users:
+                    raise ValueError(f"User {user.id} not found")
+
+            row = SettlementRow(
+                id=store.next_id("settlements"),
+                group_id=settlement.group_id,
+                debtor_id=settlement.debtor.id,
+                creditor_id=settlement.creditor.id,
+                amount_cents=cents,
+                settlement_date=settlement.settlement_date,
+            )
+            store.settlements[row.id] = row
+            store.group_settlements.setdefault(row.group_id, []).append(row.id)
+
+            deltas = {row.debtor_id: cents}
+            deltas[row.creditor_id] = deltas.get(row.creditor_id, 0) - cents
+            store.apply_balance_deltas(row.group_id, deltas, from_expense=False)
+            store.bump_group_version(row.group_id)
+
+        settlement.id = row.id
+        return settlement
+
+    def get_by_group(self, group_id: int) -> list[Settlement]:
+        """Get all settlements for a group, newest first."""
+        with self._store.lock:
+            ids = list(self._store.group_settlements.get(group_id, []))
+        return self._newest_first(ids)
+
+    def get_all(self) -> list[Settlement]:
+        """Get all settlements, newest first."""
+        with self._store.lock:
+            ids = list(self._store.settlements)
+        return self._newest_first(ids)
+
+    def iter_by_group(
+        self, group_id: int, batch_size: int | None = None
+    ) -> Iterator[Settlement]:
+        """Stream a group's settlements by descending id."""
+        return self._iter_pages(group_id, batch_size or self._page_size)
+
+    def iter_all(self, batch_size: int | None = None) -> Iterator[Settlement]:
+        """Stream all settlements by descending id."""
+        return self._iter_pages(None, batch_size or self._page_size)
+
+    def get_net_balances(self, group_id: int) -> dict[User, float]:
+        """Read net balances for users who appear in the group's expenses."""
+        store = self._store
+
+        with store.lock:
+            return self._read_balances(group_id)
+
+    def get_net_balances_many(
+        self, group_ids: Iterable[int]
+    ) -> dict[int, dict[User, float]]:
+        """Read net balances for a batch of groups under one lock acquisition."""
+        store = self._store
+
+        with store.lock:
+            return {
+                group_id: self._read_balances(group_id)
+                for group_id in sorted(set(group_ids))
+                if group_id in store.groups
+            }
+
+    def _read_balances(self, group_id: int) -> dict[User, float]:
+        """Build one group's balances; the caller holds the store lock."""
+        store = self._store
+        ledger = store.balances.get(group_id, {})
+        return {
+            intern_user(user_id, *store.users[user_id]): cents_to_amount(net_cents)
+            for user_id, (net_cents, in_expenses) in sorted(ledger.items())
+            if in_expenses
+        }
+
+    def _iter_pages(self, group_id: int | None, limit: int) -> Iterator[Settlement]:
+        """Yield settlements by descending id, one page per lock acquisition."""
+        store = self._store
+        before_id: int | None = None
+
+        while True:
+            with store.lock:
+                if group_id is None:
+                    ids = list(store.settlements)
+                else:
+                    ids = store.group_settlements.get(group_id, [])
+                end = (
+                    len(ids)
+                    if before_id is None
+                    else bisect.bisect_left(ids, before_id)
+                )
+                page = [
+                    self._to_settlement(store.settlements[sid])
+                    for sid in reversed(ids[max(0, end - limit) : end])
+                ]
+
+            yield from page
+
+            if len(page) < limit:
+                return
+            before_id = page[-1].id
+
+    def _newest_first(self, ids: list[int]) -> list[Settlement]:
+        """Materialize settlements ordered by date, then id, descending."""
+        store = self._store
+
+        with store.lock:
+            rows = [store.settlements[sid] for sid in ids]
+            rows.sort(key=lambda row: (row.settlement_date, row.id), reverse=True)
+            return [self._to_settlement(row) for row in rows]
+
+    def _to_settlement(self, row: SettlementRow) -> Settlement:
+        """Build a Settlement entity from a stored row; caller holds the lock."""
+        users = self._store.users
+        return Settlement(
+            settlement_id=row.id,
+            group_id=row.group_id,
+            debtor=intern_user(row.debtor_id, *users[row.debtor_id]),
+            creditor=intern_user(row.creditor_id, *users[row.creditor_id]),
+            amount=cents_to_amount(row.amount_cents),
+            settlement_date=row.settlement_date,
+        )
@@ -0,0 +1,92 @@
+"""Shared in-process tables and indexes backing the memory repositories."""
+
+import itertools
+import threading
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+
+
+@dataclass
+class ExpenseRow:
+    """Stored expense header plus its split rows as (user_id, cents)."""
+
+    id: int
+    group_id: int
+    paid_by: int
+    amount_cents: int
+    split_type: str
+    splits: list[tuple[int, int]] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class SettlementRow:
+    """Stored settlement record."""
+
+    id: int
+    group_id: int
+    debtor_id: int
+    creditor_id: int
+    amount_cents: int
+    settlement_date: date
+
+
+class MemoryStore:
+    """Tables, secondary indexes and id sequences shared by the repositories.
+
+    Rows are stored the way the MySQL schema stores them (ids, cents), so
+    repositories materialize fresh entities on every read. One re-entrant
+    lock serializes writes; callers hold it for multi-table updates.
+    """
+
+    def __init__(self):
+        """Create empty tables."""
+        self.lock = threading.RLock()
+
+        self.users: dict[int, tuple[str, str]] = {}
+        self.user_id_by_email: dict[str, int] = {}
+        self.user_id_by_name: dict[str, int] = {}
+
+        self.groups: dict[int, str] = {}
+        # Member ids per group in insertion order (dict as an ordered set)
+        self.group_members: dict[int, dict[int, None]] = {}
+        # group_id -> (version, updated_at as naive UTC, like the SQL backends)
+        self.group_versions: dict[int, tuple[int, datetime]] = {}
+
+        self.expenses: dict[int, ExpenseRow] = {}
+        self.group_expenses: dict[int, list[int]] = {}
+
+        self.settlements: dict[int, SettlementRow] = {}
+        self.group_settlements: dict[int, list[int]] = {}
+
+        # group_id -> user_id -> [net_cents, in_expenses]
+        self.balances: dict[int, dict[int, list[int]]] = {}
+
+        self._sequences = {
+            name: itertools.count(1)
+            for name in ("users", "groups", "expenses", "settlements")
+        }
+
+    def next_id(self, table: str) -> int:
+        """Return the next auto-increment id for a table."""
+        return next(self._sequences[table])
+
+    def apply_balance_deltas(
+        self, group_id: int, deltas: dict[int, int], from_expense: bool
+    ) -> None:
+        """Add per-user cent deltas to a group's ledger; caller holds the lock."""
+        ledger = self.balances.setdefault(group_id, {})
+        for user_id, cents in deltas.items():
+            entry = ledger.setdefault(user_id, [0, 0])
+            entry[0] += cents
+            entry[1] = max(entry[1], int(from_expense))
+
+    def bump_group_version(self, group_id: int) -> None:
+        """Mark a group changed; caller holds the lock."""
+        version = self.group_versions.get(group_id, (-1, None))[0] + 1
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        self.group_versions[group_id] = (version, now)
+
+
+def cents_to_amount(cents: int) -> float:
+    """Convert stored cents back to an amount."""
+    return cents / 100
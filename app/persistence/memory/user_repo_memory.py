@@ -0,0 +1,69 @@
+"""In-memory implementation for user repository."""
+
+from collections.abc import Iterable
+
+from app.common.keys import normalize_key
+from app.domain.entities.user import User
+from app.domain.repositories.user_repository import UserRepository
+from app.persistence.identity_map import intern_user
+
+from .store import MemoryStore
+
+
+class UserRepositoryMemory(UserRepository):
+    """Stores users in a MemoryStore with email and name indexes."""
+
+    def __init__(self, store: MemoryStore):
+        """Create repo over a shared store."""
+        self._store = store
+
+    def save(self, user: User) -> User:
+        """Insert a user, enforcing the unique name and email keys."""
+        store = self._store
+        email_key = normalize_key(user.email)
+        name_key = normalize_key(user.name)
+
+        with store.lock:
+            if email_key in store.user_id_by_email:
+                raise ValueError(f"Duplicate email: {user.email}")
+            if name_key in store.user_id_by_name:
+                raise ValueError(f"Duplicate name: {user.name}")
+
+            user_id = store.next_id("users")
+            store.users[user_id] = (user.name, user.email)
+            store.user_id_by_email[email_key] = user_id
+            store.user_id_by_name[name_key] = user_id
+
+        return intern_user(user_id, user.name, user.email)
+
+    def get_by_id(self, user_id: int) -> User | None:
+        """Fetch a user by id."""
+        row = self._store.users.get(user_id)
+        if not row:
+            return None
+        return intern_user(user_id, *row)
+
+    def get_many_by_ids(self, user_ids: Iterable[int]) -> dict[int, User]:
+        """Fetch several users at once, keyed by id."""
+        users: dict[int, User] = {}
+        for user_id in user_ids:
+            row = self._store.users.get(user_id)
+            if row:
+                users[user_id] = intern_user(user_id, *row)
+        return users
+
+    def get_by_email(self, email: str) -> User | None:
+        """Fetch a user by email (case-insensitive)."""
+        user_id = self._store.user_id_by_email.get(normalize_key(email))
+        return self.get_by_id(user_id) if user_id is not None else None
+
+    def get_by_name(self, name: str) -> User | None:
+        """Fetch a user by name (case-insensitive)."""
+        user_id = self._store.user_id_by_name.get(normalize_key(name))
+        return self.get_by_id(user_id) if user_id is not None else None
+
+    def get_all(self) -> list:
+        """Return all users ordered by id."""
+        with self._store.lock:
+            rows = list(self._store.users.items())
+        return [intern_user(user_id, *row) for user_id, row in rows]
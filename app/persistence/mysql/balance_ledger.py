@@ -0,0 +1,229 @@
+"""Incrementally maintained per-group balance ledger (group_balances table)."""
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from app.domain.entities.user import User
+from app.persistence.identity_map import intern_user
+
+from .db import MySQLDatabase
+
+# Maximum ids bound into a single IN (...) list
+_IN_CHUNK = 1000
+
+# Net cents per (group, user) recomputed from full history; from_expense marks
+# users who appear in the group's expenses (only they are reported).
+_AGGREGATE_SQL = """
+    SELECT t.group_id, t.user_id, SUM(t.cents), MAX(t.from_expense)
+    FROM (
+        SELECT e.group_id, e.paid_by AS user_id,
+               CAST(ROUND(e.amount * 100) AS SIGNED) AS cents, 1 AS from_expense
+        FROM expenses e
+        WHERE EXISTS (SELECT 1 FROM expense_splits es WHERE es.expense_id = e.id)
+          {expense_filter}
+        UNION ALL
+        SELECT e.group_id, es.user_id, -CAST(ROUND(es.amount * 100) AS SIGNED), 1
+        FROM expense_splits es
+        JOIN expenses e ON e.id = es.expense_id
+        WHERE 1 = 1 {expense_filter}
+        UNION ALL
+        SELECT s.group_id, s.debtor_id, CAST(ROUND(s.amount * 100) AS SIGNED), 0
+        FROM settlements s
+        WHERE 1 = 1 {settlement_filter}
+        UNION ALL
+        SELECT s.group_id, s.creditor_id, -CAST(ROUND(s.amount * 100) AS SIGNED), 0
+        FROM settlements s
+        WHERE 1 = 1 {settlement_filter}
+    ) t
+    GROUP BY t.group_id, t.user_id
+"""
+
+
+@dataclass(frozen=True)
+class LedgerMismatch:
+    """A ledger row that disagrees with the balance recomputed from history."""
+
+    group_id: int
+    user_id: int
+    ledger_cents: int
+    expected_cents: int
+
+
+def apply_balance_deltas(
+    cursor,
+    group_id: int,
+    deltas: dict[int, int],
+    from_expense: bool,
+) -> None:
+    """Add per-user cent deltas to the ledger inside the caller's transaction."""
+    if not deltas:
+        return
+
+    cursor.executemany(
+        """
+        INSERT INTO group_balances (group_id, user_id, net_cents, in_expenses)
+        VALUES (%s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE
+            net_cents = net_cents + VALUES(net_cents),
+            in_expenses = GREATEST(in_expenses, VALUES(in_expenses))
+        """,
+        [
+            (group_id, user_id, cents, int(from_expense))
+            for user_id, cents in deltas.items()
+        ],
+    )
+
+
+def bump_group_version(cursor, group_id: int) -> None:
+    """Mark a group changed inside the caller's transaction (updated_at follows)."""
+    cursor.execute(
+        "UPDATE expense_groups SET version = version + 1 WHERE id = %s", (group_id,)
+    )
+
+
+class BalanceLedgerMySQL:
+    """Reads, rebuilds and verifies the group_balances ledger."""
+
+    def __init__(self, db: MySQLDatabase):
+        """Create the ledger helper with DB helper."""
+        self._db = db
+
+    def get_balances(self, group_id: int) -> dict[User, float]:
+        """Return net balances for a group with a single indexed read."""
+        conn = self._db.connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                """
+                SELECT u.id, u.name, u.email, gb.net_cents
+                FROM group_balances gb
+                JOIN users u ON u.id = gb.user_id
+                WHERE gb.group_id = %s AND gb.in_expenses = 1
+                ORDER BY u.id
+                """,
+                (group_id,),
+            )
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
+
+        return {intern_user(row[0], row[1], row[2]): int(row[3]) / 100 for row in rows}
+
+    def get_balances_many(
+        self, group_ids: Iterable[int]
+    ) -> dict[int, dict[User, float]]:
+        """Return net balances keyed by group, one indexed read per chunk of groups."""
+        ids = sorted(set(group_ids))
+        balances: dict[int, dict[User, float]] = {}
+        conn = self._db.connect()
+        cursor = conn.cursor()
+
+        try:
+            for start in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[start : start + _IN_CHUNK]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                # LEFT JOINs keep existing groups that have no ledger rows yet
+                cursor.execute(
+                    f"""
+                    SELECT g.id, u.id, u.name, u.email, gb.net_cents
+                    FROM expense_groups g
+                    LEFT JOIN group_balances gb ON gb.group_id = g.id AND gb.in_expenses = 1
+                    LEFT JOIN users u ON u.id = gb.user_id
+                    WHERE g.id IN ({placeholders})
+                    ORDER BY g.id, u.id
+                    """,
+                    tuple(chunk),
+                )
+                for row in cursor.fetchall():
+                    group = balances.setdefault(int(row[0]), {})
+                    if row[1] is not None:
+                        group[intern_user(row[1], row[2], row[3])] = int(row[4]) / 100
+        finally:
+            cursor.close()
+            conn.close()
+
+        return balances
+
+    def rebuild(self, group_id: int | None = None) -> int:
+        """Recompute ledger rows from full history; return rows written."""
+        conn = self._db.connect()
+        cursor = conn.cursor()
+
+        try:
+            if group_id is None:
+                cursor.execute("DELETE FROM group_balances")
+            else:
+                cursor.execute(
+                    "DELETE FROM group_balances WHERE group_id = %s", (group_id,)
+                )
+
+            sql, params = self._aggregate_query(group_id)
+            cursor.execute(
+                "INSERT INTO group_balances (group_id, user_id, net_cents, in_expenses) "
+                + sql,
+                params,
+            )
+            written = cursor.rowcount
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        return written
+
+    def verify(self, group_id: int | None = None) -> list[LedgerMismatch]:
+        """Compare ledger rows with balances recomputed from full history."""
+        conn = self._db.connect()
+        cursor = conn.cursor()
+
+        try:
+            sql, params = self._aggregate_query(group_id)
+            cursor.execute(sql, params)
+            expected = {
+                (int(row[0]), int(row[1])): int(row[2]) for row in cursor.fetchall()
+            }
+
+            if group_id is None:
+                cursor.execute(
+                    "SELECT group_id, user_id, net_cents FROM group_balances"
+                )
+            else:
+                cursor.execute(
+                    "SELECT group_id, user_id, net_cents FROM group_balances "
+                    "WHERE group_id = %s",
+                    (group_id,),
+                )
+            actual = {
+                (int(row[0]), int(row[1])): int(row[2]) for row in cursor.fetchall()
+            }
+        finally:
+            cursor.close()
+            conn.close()
+
+        mismatches: list[LedgerMismatch] = []
+        for key in sorted(expected.keys() | actual.keys()):
+            ledger_cents = actual.get(key, 0)
+            expected_cents = expected.get(key, 0)
+            if ledger_cents != expected_cents:
+                mismatches.append(
+                    LedgerMismatch(key[0], key[1], ledger_cents, expected_cents)
+                )
+
+        return mismatches
+
+    @staticmethod
+    def _aggregate_query(group_id: int | None) -> tuple[str, tuple]:
+        """Return the full-history aggregate, optionally limited to one group."""
+        if group_id is None:
+            return _AGGREGATE_SQL.format(expense_filter="", settlement_filter=""), ()
+
+        sql = _AGGREGATE_SQL.format(
+            expense_filter="AND e.group_id = %s",
+            settlement_filter="AND s.group_id = %s",
+        )
+        return sql, (group_id, group_id, group_id, group_id)
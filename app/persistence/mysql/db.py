@@ -1,18 +1,45 @@
-"""MySQL connection helper with retry logic."""
+"""MySQL connection helper with retry logic and connection pooling."""
 
 import time
+from typing import Optional
 import mysql.connector  # type: ignore
-from mysql.connector import Error  # type: ignore  
+from mysql.connector import Error  # type: ignore
+
+from app.persistence.instrumentation import InstrumentedConnection, QueryRecorder
+from .pool import ConnectionPool, PoolStats
 
 
 class MySQLDatabase:
-    """Provides DB connections using stored config."""
+    """Provides pooled DB connections using stored config."""
 
-    def __init__(self, config):
-        """Store DB config for later connections."""
+    def __init__(self, config, recorder: Optional[QueryRecorder] = None):
+        """Store DB config and set up a lazily filled connection pool."""
         self._config = config
+        self._recorder = recorder
+        self._pool = ConnectionPool(
+            factory=self._open_connection,
+            max_size=config.pool_size,
+            timeout=config.pool_timeout,
+            validate=self._is_alive,
+            reset=self._reset,
+        )
 
     def connect(self):
+        """Borrow a pooled connection; close() hands it back to the pool."""
+        conn = self._pool.acquire()
+        if self._recorder is not None:
+            return InstrumentedConnection(conn, self._recorder)
+        return conn
+
+    def pool_stats(self) -> PoolStats:
+        """Return pool usage counters (waits, checkouts, creations, ...)."""
+        return self._pool.stats()
+
+    def close(self) -> None:
+        """Close all idle pooled connections."""
+        self._pool.close_all()
+
+    def _open_connection(self):
         """Open a DB connection with retries."""
         retries = 10
         delay = 2
@@ -31,5 +58,15 @@ class MySQLDatabase:
                     raise
                 time.sleep(delay)
 
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        """Check a borrowed connection is still usable."""
+        if not conn.is_connected():
+            return False
+        conn.ping(reconnect=False)
+        return True
 
-
+    @staticmethod
+    def _reset(conn) -> None:
+        """End any open transaction so the next borrower sees fresh data."""
+        conn.rollback()
@@ -1,152 +1,313 @@
 """MySQL implementation for expense repository."""
 
-from typing import List, Dict
+from typing import Callable, Dict, Iterator, List, Optional
 from app.domain.entities.expense import Expense
 from app.domain.entities.user import User
-from app.domain.repositories.expense_repository import ExpenseRepository
+from app.persistence.expense_rows import (
+    assemble_expenses,
+    ledger_columns,
+    percentages_from_shares,
+)
+from app.domain.repositories.expense_repository import (
+    ExpenseRepository,
+    LedgerColumns,
+)
+from app.domain.split_strategies.base import SplitStrategy
 from app.domain.split_strategies.custom import CustomSplitStrategy
 from app.domain.split_strategies.equal import EqualSplitStrategy
 from app.domain.split_strategies.percentage import PercentageSplitStrategy
+from app.common.money import to_cents
+from .balance_ledger import apply_balance_deltas, bump_group_version
 from .db import MySQLDatabase
 
 
+# Rows per multi-row INSERT, kept well under max_allowed_packet
+_BATCH_SIZE = 1000
+
+# Expenses per keyset page when streaming
+_PAGE_SIZE = 500
+
+
 class ExpenseRepositoryMySQL(ExpenseRepository):
     """Handles expense persistence in MySQL."""
 
-    def __init__(self, db: MySQLDatabase):
-        """Create repo with DB helper."""
+    def __init__(self, db: MySQLDatabase, page_size: int = _PAGE_SIZE):
+        """Create repo with DB helper and the streaming page size."""
         self._db = db
+        self._page_size = page_size
 
     def save(self, expense: Expense, group_id: int) -> Expense:
-        """Insert an expense and its splits."""
+        """Insert an expense and its splits in one transaction."""
+        splits = expense.split()
+
         conn = self._db.connect()
         cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            INSERT INTO expenses (group_id, paid_by, amount, split_type)
-            VALUES (%s, %s, %s, %s)
-            """,
-            (
-                group_id,
-                expense.paid_by.id,
-                expense.amount,
-                expense.split_strategy.__class__.__name__
+        try:
+            conn.start_transaction()
+            cursor.execute(
+                """
+                INSERT INTO expenses (group_id, paid_by, amount, split_type)
+                VALUES (%s, %s, %s, %s)
+                """,
+                self._expense_row(expense, group_id)
             )
-        )
+            expense_id = cursor.lastrowid
 
-        expense_id = cursor.lastrowid
-        expense.id = expense_id
-
-        for user, value in expense.split().items():
-            cursor.execute(
+            cursor.executemany(
                 """
                 INSERT INTO expense_splits (expense_id, user_id, amount)
                 VALUES (%s, %s, %s)
                 """,
-                (expense_id, user.id, value)
+                [(expense_id, user.id, value) for user, value in splits.items()]
             )
 
-        conn.commit()
-        cursor.close()
-        conn.close()
+            apply_balance_deltas(
+                cursor, group_id, self._balance_deltas(expense, splits), from_expense=True
+            )
+            bump_group_version(cursor, group_id)
 
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        expense.id = expense_id
         return expense
 
-    def get_by_group(self, group_id: int) -> List[Expense]:
-        """Return all expenses for a group."""
+    def save_many(self, expenses: List[Expense], group_id: int) -> List[Expense]:
+        """Insert many expenses and their splits in batched statements."""
+        if not expenses:
+            return []
+
+        # Validate every split up front so a bad row never opens a transaction
+        all_splits = [expense.split() for expense in expenses]
+
         conn = self._db.connect()
         cursor = conn.cursor()
 
         try:
+            # The snapshot hides rows other sessions commit meanwhile, so the
+            # id read-back below only sees this transaction's inserts
+            conn.start_transaction(consistent_snapshot=True)
+            expense_ids = self._insert_expense_rows(cursor, expenses, group_id)
+
+            split_rows = [
+                (expense_id, user.id, value)
+                for expense_id, splits in zip(expense_ids, all_splits)
+                for user, value in splits.items()
+            ]
+            for start in range(0, len(split_rows), _BATCH_SIZE):
+                cursor.executemany(
+                    """
+                    INSERT INTO expense_splits (expense_id, user_id, amount)
+                    VALUES (%s, %s, %s)
+                    """,
+                    split_rows[start:start + _BATCH_SIZE]
+                )
+
+            deltas: Dict[int, int] = {}
+            for expense, splits in zip(expenses, all_splits):
+                for user_id, cents in self._balance_deltas(expense, splits).items():
+                    deltas[user_id] = deltas.get(user_id, 0) + cents
+            apply_balance_deltas(cursor, group_id, deltas, from_expense=True)
+            bump_group_version(cursor, group_id)
+
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+        for expense, expense_id in zip(expenses, expense_ids):
+            expense.id = expense_id
+        return expenses
+
+    def _insert_expense_rows(
+        self, cursor, expenses: List[Expense], group_id: int
+    ) -> List[int]:
+        """Insert expense headers and return their ids in input order."""
+        sql = """
+            INSERT INTO expenses (group_id, paid_by, amount, split_type)
+            VALUES (%s, %s, %s, %s)
+        """
+        rows = [self._expense_row(expense, group_id) for expense in expenses]
+
+        # executemany sends one multi-row INSERT per chunk. Its ids increase in
+        # row order but need not be consecutive (innodb_autoinc_lock_mode=2),
+        # so they are read back from LAST_INSERT_ID(), the chunk's first id.
+        ids: List[int] = []
+        for start in range(0, len(rows), _BATCH_SIZE):
+            chunk = rows[start:start + _BATCH_SIZE]
+            cursor.executemany(sql, chunk)
             cursor.execute(
                 """
-                SELECT e.id, e.paid_by, payer.name, payer.email, e.amount, e.split_type
-                FROM expenses e
-                JOIN users payer ON payer.id = e.paid_by
-                WHERE e.group_id = %s
-                ORDER BY e.id
+                SELECT id FROM expenses
+                WHERE group_id = %s AND id >= LAST_INSERT_ID()
+                ORDER BY id
+                LIMIT %s
                 """,
-                (group_id,)
+                (group_id, len(chunk))
             )
-            rows = cursor.fetchall()
+            chunk_ids = [int(row[0]) for row in cursor.fetchall()]
+            if len(chunk_ids) != len(chunk):
+                raise RuntimeError(
+                    f"Expected {len(chunk)} inserted expense ids, read {len(chunk_ids)}"
+                )
+            ids.extend(chunk_ids)
+        return ids
+
+    @staticmethod
+    def _expense_row(expense: Expense, group_id: int) -> tuple:
+        """Return the expenses table values for an expense."""
+        return (
+            group_id,
+            expense.paid_by.id,
+            expense.amount,
+            expense.split_strategy.__class__.__name__
+        )
+
+    def get_by_group(self, group_id: int) -> List[Expense]:
+        """Return all expenses for a group."""
+        conn = self._db.connect()
+        try:
+            return fetch_group_expenses(conn, group_id, self._create_strategy)
         finally:
-            cursor.close()
+            conn.close()
 
-        if not rows:
+    def get_ledger_columns(self, group_id: int) -> LedgerColumns:
+        """Return the group's stored splits and payer credits as flat columns."""
+        conn = self._db.connect()
+        try:
+            return fetch_group_ledger(conn, group_id)
+        finally:
             conn.close()
-            return []
 
-        user_cache: Dict[int, User] = {}
-        expenses: List[Expense] = []
-
-        for expense_id, payer_id, payer_name, payer_email, amount, split_type in rows:
-            paid_by = user_cache.get(payer_id)
-            if not paid_by:
-                paid_by = User(int(payer_id), payer_name, payer_email)
-                user_cache[payer_id] = paid_by
-
-            participants, amounts = self._fetch_expense_splits(conn, expense_id, user_cache)
-            if not participants:
-                continue
-
-            # Reconstruct strategy based on split_type stored in DB
-            strategy = self._create_strategy(split_type, amounts)
-            expenses.append(
-                Expense(
-                    expense_id=int(expense_id),
-                    paid_by=paid_by,
-                    amount=float(amount),
-                    participants=participants,
-                    split_strategy=strategy,
-                    split_type=split_type
+    def iter_by_group(
+        self, group_id: int, batch_size: Optional[int] = None
+    ) -> Iterator[Expense]:
+        """Stream a group's expenses in id order, one keyset page at a time.
+
+        Each page borrows a pooled connection only while it is read, so a slow
+        consumer never pins a connection between pages.
+        """
+        limit = batch_size or self._page_size
+        after_id = 0
+
+        while True:
+            conn = self._db.connect()
+            try:
+                page = fetch_expense_page(
+                    conn, group_id, after_id, limit, self._create_strategy
                 )
-            )
+            finally:
+                conn.close()
 
-        conn.close()
-        return expenses
+            yield from page
+
+            if len(page) < limit:
+                return
+            after_id = page[-1].id
+
+    @staticmethod
+    def _balance_deltas(expense: Expense, splits: Dict[User, float]) -> Dict[int, int]:
+        """Return per-user ledger deltas in cents for an expense."""
+        if not splits:
+            return {}
+
+        deltas = {expense.paid_by.id: to_cents(expense.amount)}
+        for user, value in splits.items():
+            deltas[user.id] = deltas.get(user.id, 0) - to_cents(value)
+        return deltas
 
     def _create_strategy(self, split_type: str, amounts: Dict[User, float]):
         """Create appropriate strategy based on split_type."""
         if split_type == "EqualSplitStrategy":
             return EqualSplitStrategy()
         elif split_type == "PercentageSplitStrategy":
-            return PercentageSplitStrategy(amounts)
+            return PercentageSplitStrategy(percentages_from_shares(amounts))
         else:  # CustomSplitStrategy
             return CustomSplitStrategy(amounts)
 
-    def _fetch_expense_splits(
-        self,
-        conn,
-        expense_id: int,
-        cache: Dict[int, User]
-    ) -> tuple[List[User], Dict[User, float]]:
-        """Load participants and amounts for an expense."""
-        cursor = conn.cursor()
-        try:
-            cursor.execute(
-                """
-                SELECT u.id, u.name, u.email, es.amount
-                FROM expense_splits es
-                JOIN users u ON u.id = es.user_id
-                WHERE es.expense_id = %s
-                """,
-                (expense_id,)
-            )
-            rows = cursor.fetchall()
-        finally:
-            cursor.close()
 
-        participants: List[User] = []
-        amounts: Dict[User, float] = {}
+_GROUP_ROWS_SQL = """
+    SELECT e.id, e.paid_by, payer.name, payer.email, e.amount, e.split_type,
+           u.id, u.name, u.email, es.amount
+    FROM expenses e
+    JOIN users payer ON payer.id = e.paid_by
+    JOIN expense_splits es ON es.expense_id = e.id
+    JOIN users u ON u.id = es.user_id
+    WHERE e.group_id = %s
+    ORDER BY e.id, es.id
+"""
 
-        for user_id, name, email, amount in rows:
-            participant = cache.get(user_id)
-            if not participant:
-                participant = User(int(user_id), name, email)
-                cache[user_id] = participant
 
-            participants.append(participant)
-            amounts[participant] = float(amount)
+def fetch_group_expenses(
+    conn,
+    group_id: int,
+    strategy_factory: Callable[[str, Dict[User, float]], SplitStrategy],
+) -> List[Expense]:
+    """Load a group's expenses with their splits in a single query."""
+    cursor = conn.cursor()
+    try:
+        cursor.execute(_GROUP_ROWS_SQL, (group_id,))
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+
+    return assemble_expenses(rows, strategy_factory)
 
-        return participants, amounts
+
+def fetch_group_ledger(conn, group_id: int) -> LedgerColumns:
+    """Flatten a group's split rows into ledger columns as they stream in."""
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(_GROUP_ROWS_SQL, (group_id,))
+        return ledger_columns(cursor)
+    finally:
+        cursor.close()
+
+
+def fetch_expense_page(
+    conn,
+    group_id: int,
+    after_id: int,
+    limit: int,
+    strategy_factory: Callable[[str, Dict[User, float]], SplitStrategy],
+) -> List[Expense]:
+    """Load up to limit expenses with id > after_id, streaming the join rows.
+
+    Like fetch_group_expenses, only expenses with splits are returned; they
+    are filtered while picking the page ids, so the page length still tells
+    the caller whether more pages remain.
+    """
+    # Unbuffered: rows are decoded as they arrive instead of all at once
+    cursor = conn.cursor(buffered=False)
+    try:
+        cursor.execute(
+            """
+            SELECT e.id, e.paid_by, payer.name, payer.email, e.amount, e.split_type,
+                   u.id, u.name, u.email, es.amount
+            FROM (
+                SELECT id FROM expenses x
+                WHERE group_id = %s AND id > %s
+                  AND EXISTS (SELECT 1 FROM expense_splits es WHERE es.expense_id = x.id)
+                ORDER BY id
+                LIMIT %s
+            ) page
+            JOIN expenses e ON e.id = page.id
+            JOIN users payer ON payer.id = e.paid_by
+            JOIN expense_splits es ON es.expense_id = e.id
+            JOIN users u ON u.id = es.user_id
+            ORDER BY e.id, es.id
+            """,
+            (group_id, after_id, limit)
+        )
+        return assemble_expenses(cursor, strategy_factory)
+    finally:
+        cursor.close()
@@ -1,12 +1,15 @@
 """MySQL implementation for group repository."""
 
-from typing import Optional, List, Dict
-from app.domain.entities.group import Group
+from datetime import datetime
+from typing import Dict, Iterable, Optional, List
+from app.domain.entities.group import Group, GroupSummary, GroupVersion
 from app.domain.entities.user import User
+from app.persistence.identity_map import intern_user
 from app.domain.entities.expense import Expense
 from app.domain.repositories.group_repository import GroupRepository
 from app.domain.split_strategies.custom import CustomSplitStrategy
 from .db import MySQLDatabase
+from .expense_repo_mysql import fetch_group_expenses
 
 
 class GroupRepositoryMySQL(GroupRepository):
@@ -17,11 +20,14 @@ class GroupRepositoryMySQL(GroupRepository):
         self._db = db
 
     def save(self, group: Group) -> Group:
-        """Insert or update a group and its members."""
+        """Insert or update a group, writing only membership changes."""
+        added, removed = group.pending_member_changes()
+
         conn = self._db.connect()
         cursor = conn.cursor()
 
         try:
+            conn.start_transaction()
             if group.id is None:
                 cursor.execute(
                     "INSERT INTO expense_groups (name) VALUES (%s)",
@@ -30,18 +36,22 @@ class GroupRepositoryMySQL(GroupRepository):
                 group_id = cursor.lastrowid
             else:
                 cursor.execute(
-                    "UPDATE expense_groups SET name = %s WHERE id = %s",
+                    "UPDATE expense_groups SET name = %s, version = version + 1 WHERE id = %s",
                     (group.name, group.id)
                 )
                 group_id = group.id
 
-            cursor.execute(
-                "DELETE FROM group_members WHERE group_id = %s",
-                (group_id,)
-            )
+            if removed:
+                placeholders = ", ".join(["%s"] * len(removed))
+                cursor.execute(
+                    f"""
+                    DELETE FROM group_members
+                    WHERE group_id = %s AND user_id IN ({placeholders})
+                    """,
+                    (group_id, *[member.id for member in removed])
+                )
 
-            members = group.members
-            if members:
+            if added:
                 cursor.executemany(
                     """
                     INSERT INTO group_members (group_id, user_id)
@@ -50,19 +60,24 @@ class GroupRepositoryMySQL(GroupRepository):
                     """,
                     [
                         (group_id, member.id)
-                        for member in members
+                        for member in added
                     ]
                 )
 
             conn.commit()
-            group.id = group_id
-            return group
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             cursor.close()
             conn.close()
 
+        group.id = group_id
+        group.mark_members_clean()
+        return group
+
     def get_by_id(self, group_id: int) -> Optional[Group]:
-        """Fetch a group with members and expenses."""
+        """Fetch a group with members; expenses load on first access."""
         conn = self._db.connect()
         cursor = conn.cursor()
 
@@ -76,135 +91,172 @@ class GroupRepositoryMySQL(GroupRepository):
             if not row:
                 return None
 
-            group = Group(group_id=int(row[0]), name=row[1])
+            loaded_id = int(row[0])
+            group = Group(
+                group_id=loaded_id,
+                name=row[1],
+                expenses_loader=lambda: self._load_expenses(loaded_id),
+            )
 
             for member in self._fetch_members(conn, group.id):
                 group.add_member(member)
-
-            for expense in self._fetch_expenses(conn, group.id):
-                group.add_expense(expense)
+            group.mark_members_clean()
 
             return group
         finally:
             cursor.close()
             conn.close()
 
-    def get_all(self) -> List[Group]:
-        """Return all groups (read-only)."""
+    def get_summary(self, group_id: int) -> Optional[GroupSummary]:
+        """Fetch a group header (name and counts) without members or expenses."""
         conn = self._db.connect()
         cursor = conn.cursor()
 
-        cursor.execute("SELECT id, name FROM expense_groups")
-        rows = cursor.fetchall()
+        try:
+            cursor.execute(
+                """
+                SELECT g.id, g.name,
+                       (SELECT COUNT(*) FROM group_members gm WHERE gm.group_id = g.id),
+                       (SELECT COUNT(*) FROM expenses e WHERE e.group_id = g.id)
+                FROM expense_groups g
+                WHERE g.id = %s
+                """,
+                (group_id,)
+            )
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
 
-        cursor.close()
-        conn.close()
+        if not row:
+            return None
 
-        return [
-            Group(group_id=int(row[0]), name=row[1])
-            for row in rows
-        ]
+        return GroupSummary(
+            id=int(row[0]),
+            name=row[1],
+            member_count=int(row[2]),
+            expense_count=int(row[3]),
+        )
 
-    def _fetch_members(self, conn, group_id: int) -> List[User]:
-        """Load group members for a given group id."""
+    def exists(self, group_id: int) -> bool:
+        """Return True if the group exists (primary key probe)."""
+        conn = self._db.connect()
         cursor = conn.cursor()
-        rows: List[tuple] = []
+
         try:
             cursor.execute(
-                """
-                SELECT u.id, u.name, u.email
-                FROM group_members gm
-                JOIN users u ON gm.user_id = u.id
-                WHERE gm.group_id = %s
-                """,
+                "SELECT 1 FROM expense_groups WHERE id = %s",
                 (group_id,)
             )
-            rows = cursor.fetchall()
+            row = cursor.fetchone()
         finally:
             cursor.close()
+            conn.close()
 
-        return [User(int(row[0]), row[1], row[2]) for row in rows]
+        return row is not None
 
-    def _fetch_expenses(self, conn, group_id: int) -> List[Expense]:
-        """Load expenses for a given group id."""
+    def get_members_by_ids(self, group_id: int, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Return the given users that are members of the group, keyed by id."""
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return {}
+
+        conn = self._db.connect()
         cursor = conn.cursor()
-        rows: List[tuple] = []
+
         try:
+            placeholders = ", ".join(["%s"] * len(ids))
             cursor.execute(
-                """
-                SELECT e.id, e.paid_by, payer.name, payer.email, e.amount, e.split_type
-                FROM expenses e
-                JOIN users payer ON payer.id = e.paid_by
-                WHERE e.group_id = %s
+                f"""
+                SELECT u.id, u.name, u.email
+                FROM group_members gm
+                JOIN users u ON u.id = gm.user_id
+                WHERE gm.group_id = %s AND gm.user_id IN ({placeholders})
                 """,
-                (group_id,)
+                (group_id, *ids)
             )
             rows = cursor.fetchall()
         finally:
             cursor.close()
+            conn.close()
+
+        return {int(row[0]): intern_user(row[0], row[1], row[2]) for row in rows}
+
+    def get_all(self) -> List[Group]:
+        """Return all groups (read-only)."""
+        conn = self._db.connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute("SELECT id, name FROM expense_groups")
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
 
-        if not rows:
-            return []
-
-        user_cache: Dict[int, User] = {}
-        expenses: List[Expense] = []
-
-        for expense_id, payer_id, payer_name, payer_email, amount, split_type in rows:
-            paid_by = user_cache.get(payer_id) or User(int(payer_id), payer_name, payer_email)
-            user_cache[payer_id] = paid_by
-
-            participants, amounts = self._fetch_expense_splits(conn, expense_id, user_cache)
-            if not participants:
-                continue
-
-            strategy = CustomSplitStrategy(amounts)
-            expenses.append(
-                Expense(
-                    expense_id=int(expense_id),
-                    paid_by=paid_by,
-                    amount=float(amount),
-                    participants=participants,
-                    split_strategy=strategy,
-                    split_type=split_type
+        return [
+            Group(group_id=int(row[0]), name=row[1])
+            for row in rows
+        ]
+
+    def get_versions_since(self, since: Optional[datetime]) -> List[GroupVersion]:
+        """Return change stamps of groups updated at or after since (all if None)."""
+        conn = self._db.connect()
+        cursor = conn.cursor()
+
+        try:
+            if since is None:
+                cursor.execute(
+                    "SELECT id, name, version, updated_at FROM expense_groups"
                 )
-            )
+            else:
+                # Range scan on idx_groups_updated_at
+                cursor.execute(
+                    """
+                    SELECT id, name, version, updated_at
+                    FROM expense_groups
+                    WHERE updated_at >= %s
+                    """,
+                    (since,)
+                )
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
 
-        return expenses
+        return [
+            GroupVersion(id=int(row[0]), name=row[1], version=int(row[2]), updated_at=row[3])
+            for row in rows
+        ]
 
-    def _fetch_expense_splits(
-        self,
-        conn,
-        expense_id: int,
-        cache: Dict[int, User]
-    ) -> tuple[List[User], Dict[User, float]]:
-        """Load participants and amounts for an expense."""
+    def _fetch_members(self, conn, group_id: int) -> List[User]:
+        """Load group members for a given group id."""
         cursor = conn.cursor()
         rows: List[tuple] = []
         try:
             cursor.execute(
                 """
-                SELECT u.id, u.name, u.email, es.amount
-                FROM expense_splits es
-                JOIN users u ON u.id = es.user_id
-                WHERE es.expense_id = %s
+                SELECT u.id, u.name, u.email
+                FROM group_members gm
+                JOIN users u ON gm.user_id = u.id
+                WHERE gm.group_id = %s
                 """,
-                (expense_id,)
+                (group_id,)
             )
             rows = cursor.fetchall()
         finally:
             cursor.close()
 
-        participants: List[User] = []
-        amounts: Dict[User, float] = {}
-
-        for user_id, name, email, amount in rows:
-            user = cache.get(user_id)
-            if not user:
-                user = User(int(user_id), name, email)
-                cache[user_id] = user
-
-            participants.append(user)
-            amounts[user] = float(amount)
-
-        return participants, amounts
+        return [intern_user(row[0], row[1], row[2]) for row in rows]
 
+    def _load_expenses(self, group_id: int) -> List[Expense]:
+        """Load expenses for a given group id on a fresh connection."""
+        conn = self._db.connect()
+        try:
+            return fetch_group_expenses(
+                conn,
+                group_id,
+                lambda split_type, amounts: CustomSplitStrategy(amounts),
+            )
+        finally:
+            conn.close()
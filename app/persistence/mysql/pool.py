@@ -0,0 +1,200 @@
+"""Bounded connection pool used by the MySQL database helper."""
+
+import contextlib
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the checkout timeout."""
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Snapshot of pool usage counters."""
+
+    size: int
+    idle: int
+    in_use: int
+    checkouts: int
+    creations: int
+    waits: int
+    timeouts: int
+    discarded: int
+
+
+class PooledConnection:
+    """Connection proxy whose close() returns the connection to the pool."""
+
+    def __init__(self, pool: "ConnectionPool", raw):
+        """Wrap a raw DB connection owned by the pool."""
+        self._pool = pool
+        self._raw = raw
+        self._released = False
+
+    def close(self) -> None:
+        """Return the connection to the pool instead of closing it."""
+        if self._released:
+            return
+        self._released = True
+        self._pool.release(self._raw)
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the raw connection."""
+        if self._released:
+            raise RuntimeError("Connection has already been returned to the pool")
+        return getattr(self._raw, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class ConnectionPool:
+    """Thread-safe bounded pool of reusable DB connections."""
+
+    def __init__(
+        self,
+        factory: Callable[[], Any],
+        max_size: int = 5,
+        timeout: float = 10.0,
+        validate: Callable[[Any], bool] | None = None,
+        reset: Callable[[Any], None] | None = None,
+    ):
+        """Create a pool that opens connections lazily via factory."""
+        if max_size < 1:
+            raise ValueError("Pool size must be at least 1")
+
+        self._factory = factory
+        self._max_size = max_size
+        self._timeout = timeout
+        self._validate = validate
+        self._reset = reset
+
+        self._idle: list[Any] = []
+        self._size = 0
+        self._cond = threading.Condition()
+
+        self._checkouts = 0
+        self._creations = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._discarded = 0
+
+    def acquire(self) -> PooledConnection:
+        """Borrow a live connection, waiting up to the configured timeout."""
+        deadline = time.monotonic() + self._timeout
+        waited = False
+
+        while True:
+            raw = None
+            create = False
+
+            with self._cond:
+                while not self._idle and self._size >= self._max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._timeouts += 1
+                        raise PoolTimeoutError(
+                            f"No connection available within {self._timeout:.1f}s "
+                            f"(pool size={self._max_size})"
+                        )
+                    if not waited:
+                        waited = True
+                        self._waits += 1
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    raw = self._idle.pop()
+                else:
+                    # Reserve a slot before opening the connection outside the lock
+                    self._size += 1
+                    create = True
+
+            if create:
+                try:
+                    raw = self._factory()
+                except Exception:
+                    self._drop_slot()
+                    raise
+                with self._cond:
+                    self._creations += 1
+                    self._checkouts += 1
+                return PooledConnection(self, raw)
+
+            if self._is_alive(raw):
+                with self._cond:
+                    self._checkouts += 1
+                return PooledConnection(self, raw)
+
+            # Stale connection: discard it and try again with the freed slot
+            self._discard(raw)
+
+    def release(self, raw) -> None:
+        """Return a borrowed connection to the idle list."""
+        if self._reset:
+            try:
+                self._reset(raw)
+            except Exception:
+                self._discard(raw)
+                return
+
+        with self._cond:
+            self._idle.append(raw)
+            self._cond.notify()
+
+    def close_all(self) -> None:
+        """Close every idle connection held by the pool."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._size -= len(idle)
+            self._cond.notify_all()
+
+        for raw in idle:
+            self._close_quietly(raw)
+
+    def stats(self) -> PoolStats:
+        """Return a snapshot of the pool counters."""
+        with self._cond:
+            return PoolStats(
+                size=self._size,
+                idle=len(self._idle),
+                in_use=self._size - len(self._idle),
+                checkouts=self._checkouts,
+                creations=self._creations,
+                waits=self._waits,
+                timeouts=self._timeouts,
+                discarded=self._discarded,
+            )
+
+    def _is_alive(self, raw) -> bool:
+        """Run the liveness check, treating errors as a dead connection."""
+        if not self._validate:
+            return True
+        try:
+            return bool(self._validate(raw))
+        except Exception:
+            return False
+
+    def _discard(self, raw) -> None:
+        """Close a broken connection and free its slot."""
+        self._close_quietly(raw)
+        with self._cond:
+            self._discarded += 1
+        self._drop_slot()
+
+    def _drop_slot(self) -> None:
+        """Give a reserved slot back and wake one waiter."""
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @staticmethod
+    def _close_quietly(raw) -> None:
+        with contextlib.suppress(Exception):
+            raw.close()
@@ -1,43 +1,69 @@
 """MySQL implementation for settlement repository."""
 
-from typing import List
+from typing import Dict, Iterable, Iterator, List, Optional
 from datetime import date
 from app.domain.entities.settlement import Settlement
 from app.domain.entities.user import User
+from app.persistence.identity_map import intern_user
 from app.domain.repositories.settlement_repository import SettlementRepository
+from app.common.money import to_cents
+from .balance_ledger import BalanceLedgerMySQL, apply_balance_deltas, bump_group_version
 from .db import MySQLDatabase
 
 
+# Settlements per keyset page when streaming
+_PAGE_SIZE = 500
+
+_SETTLEMENT_COLUMNS = """
+    SELECT s.id, s.group_id, s.debtor_id, d.name, d.email,
+           s.creditor_id, c.name, c.email, s.amount, s.settlement_date
+    FROM settlements s
+    JOIN users d ON d.id = s.debtor_id
+    JOIN users c ON c.id = s.creditor_id
+"""
+
+
 class SettlementRepositoryMySQL(SettlementRepository):
     """Handles settlement persistence in MySQL."""
 
-    def __init__(self, db: MySQLDatabase):
-        """Create repo with DB helper."""
+    def __init__(self, db: MySQLDatabase, page_size: int = _PAGE_SIZE):
+        """Create repo with DB helper and the streaming page size."""
         self._db = db
+        self._page_size = page_size
+        self._ledger = BalanceLedgerMySQL(db)
 
     def save(self, settlement: Settlement) -> Settlement:
         """Insert a settlement payment record."""
         conn = self._db.connect()
         cursor = conn.cursor()
 
-        cursor.execute(
-            """
-            INSERT INTO settlements (group_id, debtor_id, creditor_id, amount, settlement_date)
-            VALUES (%s, %s, %s, %s, %s)
-            """,
-            (
-                settlement.group_id,
-                settlement.debtor.id,
-                settlement.creditor.id,
-                settlement.amount,
-                settlement.settlement_date,
-            ),
-        )
+        try:
+            cursor.execute(
+                """
+                INSERT INTO settlements (group_id, debtor_id, creditor_id, amount, settlement_date)
+                VALUES (%s, %s, %s, %s, %s)
+                """,
+                (
+                    settlement.group_id,
+                    settlement.debtor.id,
+                    settlement.creditor.id,
+                    settlement.amount,
+                    settlement.settlement_date,
+                ),
+            )
 
-        settlement.id = cursor.lastrowid
-        conn.commit()
-        cursor.close()
-        conn.close()
+            settlement.id = cursor.lastrowid
+
+            cents = to_cents(settlement.amount)
+            deltas = {settlement.debtor.id: cents}
+            deltas[settlement.creditor.id] = deltas.get(settlement.creditor.id, 0) - cents
+            apply_balance_deltas(cursor, settlement.group_id, deltas, from_expense=False)
+            bump_group_version(cursor, settlement.group_id)
+
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
 
         return settlement
 
@@ -48,15 +74,7 @@ class SettlementRepositoryMySQL(SettlementRepository):
 
         try:
             cursor.execute(
-                """
-                SELECT s.id, s.group_id, s.debtor_id, d.name, d.email,
-                       s.creditor_id, c.name, c.email, s.amount, s.settlement_date
-                FROM settlements s
-                JOIN users d ON d.id = s.debtor_id
-                JOIN users c ON c.id = s.creditor_id
-                WHERE s.group_id = %s
-                ORDER BY s.settlement_date DESC
-                """,
+                f"{_SETTLEMENT_COLUMNS} WHERE s.group_id = %s ORDER BY s.settlement_date DESC",
                 (group_id,),
             )
             rows = cursor.fetchall()
@@ -64,24 +82,7 @@ class SettlementRepositoryMySQL(SettlementRepository):
             cursor.close()
             conn.close()
 
-        if not rows:
-            return []
-
-        settlements = []
-        for row in rows:
-            debtor = User(row[2], row[3], row[4])
-            creditor = User(row[5], row[6], row[7])
-            settlement = Settlement(
-                settlement_id=row[0],
-                group_id=row[1],
-                debtor=debtor,
-                creditor=creditor,
-                amount=float(row[8]),
-                settlement_date=row[9],
-            )
-            settlements.append(settlement)
-
-        return settlements
+        return [self._to_settlement(row) for row in rows]
 
     def get_all(self) -> List[Settlement]:
         """Get all settlements."""
@@ -90,35 +91,75 @@ class SettlementRepositoryMySQL(SettlementRepository):
 
         try:
             cursor.execute(
-                """
-                SELECT s.id, s.group_id, s.debtor_id, d.name, d.email,
-                       s.creditor_id, c.name, c.email, s.amount, s.settlement_date
-                FROM settlements s
-                JOIN users d ON d.id = s.debtor_id
-                JOIN users c ON c.id = s.creditor_id
-                ORDER BY s.settlement_date DESC
-                """
+                f"{_SETTLEMENT_COLUMNS} ORDER BY s.settlement_date DESC"
             )
             rows = cursor.fetchall()
         finally:
             cursor.close()
             conn.close()
 
-        if not rows:
-            return []
-
-        settlements = []
-        for row in rows:
-            debtor = User(row[2], row[3], row[4])
-            creditor = User(row[5], row[6], row[7])
-            settlement = Settlement(
-                settlement_id=row[0],
-                group_id=row[1],
-                debtor=debtor,
-                creditor=creditor,
-                amount=float(row[8]),
-                settlement_date=row[9],
-            )
-            settlements.append(settlement)
+        return [self._to_settlement(row) for row in rows]
+
+    def iter_by_group(
+        self, group_id: int, batch_size: Optional[int] = None
+    ) -> Iterator[Settlement]:
+        """Stream a group's settlements newest first, one keyset page at a time."""
+        return self._iter_pages(group_id, batch_size or self._page_size)
+
+    def iter_all(self, batch_size: Optional[int] = None) -> Iterator[Settlement]:
+        """Stream all settlements newest first, one keyset page at a time."""
+        return self._iter_pages(None, batch_size or self._page_size)
+
+    def _iter_pages(self, group_id: Optional[int], limit: int) -> Iterator[Settlement]:
+        """Yield settlements by descending id, borrowing a connection per page."""
+        before_id: Optional[int] = None
+
+        while True:
+            conditions = []
+            params: list = []
+            if group_id is not None:
+                conditions.append("s.group_id = %s")
+                params.append(group_id)
+            if before_id is not None:
+                conditions.append("s.id < %s")
+                params.append(before_id)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+            conn = self._db.connect()
+            # Unbuffered: rows are decoded as they arrive instead of all at once
+            cursor = conn.cursor(buffered=False)
+            try:
+                cursor.execute(
+                    f"{_SETTLEMENT_COLUMNS} {where} ORDER BY s.id DESC LIMIT %s",
+                    (*params, limit),
+                )
+                page = [self._to_settlement(row) for row in cursor]
+            finally:
+                cursor.close()
+                conn.close()
+
+            yield from page
+
+            if len(page) < limit:
+                return
+            before_id = page[-1].id
+
+    @staticmethod
+    def _to_settlement(row) -> Settlement:
+        """Build a Settlement from a settlement+users row."""
+        return Settlement(
+            settlement_id=row[0],
+            group_id=row[1],
+            debtor=intern_user(row[2], row[3], row[4]),
+            creditor=intern_user(row[5], row[6], row[7]),
+            amount=float(row[8]),
+            settlement_date=row[9],
+        )
+
+    def get_net_balances(self, group_id: int) -> Dict[User, float]:
+        """Read net balances per user from the group_balances ledger."""
+        return self._ledger.get_balances(group_id)
 
-        return settlements
+    def get_net_balances_many(self, group_ids: Iterable[int]) -> Dict[int, Dict[User, float]]:
+        """Read net balances for a batch of groups from the ledger."""
+        return self._ledger.get_balances_many(group_ids)
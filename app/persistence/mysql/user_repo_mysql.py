@@ -1,11 +1,16 @@
 """MySQL implementation for user repository."""
 
-from typing import Optional
+from typing import Dict, Iterable, Optional
 from app.domain.entities.user import User
+from app.persistence.identity_map import intern_user
 from app.domain.repositories.user_repository import UserRepository
 from .db import MySQLDatabase
 
 
+# Maximum ids bound into a single IN (...) list
+_IN_CHUNK = 1000
+
+
 class UserRepositoryMySQL(UserRepository):
     """Handles user persistence in MySQL."""
 
@@ -18,71 +23,126 @@ class UserRepositoryMySQL(UserRepository):
         conn = self._db.connect()
         cursor = conn.cursor()
 
-        cursor.execute(
-            "INSERT INTO users (name, email) VALUES (%s, %s)",
-            (user.name, user.email)
-        )
+        try:
+            cursor.execute(
+                "INSERT INTO users (name, email) VALUES (%s, %s)",
+                (user.name, user.email)
+            )
 
-        conn.commit()
-        new_id = cursor.lastrowid
-        cursor.close()
-        conn.close()
+            conn.commit()
+            new_id = cursor.lastrowid
+        finally:
+            cursor.close()
+            conn.close()
 
-        return User(id=new_id, name=user.name, email=user.email)
+        return intern_user(new_id, user.name, user.email)
 
     def get_by_id(self, user_id: int) -> Optional[User]:
         """Fetch a user by id."""
         conn = self._db.connect()
         cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT id, name, email FROM users WHERE id = %s",
-            (user_id,)
-        )
+        try:
+            cursor.execute(
+                "SELECT id, name, email FROM users WHERE id = %s",
+                (user_id,)
+            )
 
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
 
         if not row:
             return None
 
-        return User(int(row[0]), row[1], row[2])
+        return intern_user(row[0], row[1], row[2])
+
+    def get_many_by_ids(self, user_ids: Iterable[int]) -> Dict[int, User]:
+        """Fetch several users with one query per 1000 ids."""
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return {}
+
+        conn = self._db.connect()
+        cursor = conn.cursor()
+        users: Dict[int, User] = {}
+
+        try:
+            for start in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[start:start + _IN_CHUNK]
+                placeholders = ", ".join(["%s"] * len(chunk))
+                cursor.execute(
+                    f"SELECT id, name, email FROM users WHERE id IN ({placeholders})",
+                    tuple(chunk)
+                )
+                for row in cursor.fetchall():
+                    users[int(row[0])] = intern_user(row[0], row[1], row[2])
+        finally:
+            cursor.close()
+            conn.close()
+
+        return users
 
     def get_by_email(self, email: str) -> Optional[User]:
-        """Fetch a user by email."""
+        """Fetch a user by email, normalized in SQL exactly like email_key."""
+        conn = self._db.connect()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                "SELECT id, name, email FROM users WHERE email_key = LOWER(TRIM(%s))",
+                (email,)
+            )
+
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+
+        if not row:
+            return None
+
+        return intern_user(row[0], row[1], row[2])
+
+    def get_by_name(self, name: str) -> Optional[User]:
+        """Fetch a user by name, normalized in SQL exactly like name_key."""
         conn = self._db.connect()
         cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT id, name, email FROM users WHERE LOWER(email) = LOWER(%s)",
-            (email,)
-        )
+        try:
+            cursor.execute(
+                "SELECT id, name, email FROM users WHERE name_key = LOWER(TRIM(%s))",
+                (name,)
+            )
 
-        row = cursor.fetchone()
-        cursor.close()
-        conn.close()
+            row = cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
 
         if not row:
             return None
 
-        return User(int(row[0]), row[1], row[2])
+        return intern_user(row[0], row[1], row[2])
 
     def get_all(self) -> list:
         """Return all users."""
         conn = self._db.connect()
         cursor = conn.cursor()
 
-        cursor.execute(
-            "SELECT id, name, email FROM users ORDER BY id"
-        )
+        try:
+            cursor.execute(
+                "SELECT id, name, email FROM users ORDER BY id"
+            )
 
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+            rows = cursor.fetchall()
+        finally:
+            cursor.close()
+            conn.close()
 
         users = []
         for row in rows:
-            users.append(User(int(row[0]), row[1], row[2]))
+            users.append(intern_user(row[0], row[1], row[2]))
 
         return users
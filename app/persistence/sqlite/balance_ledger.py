@@ -0,0 +1,95 @@
+"""group_balances ledger maintenance for the SQLite backend."""
+
+import sqlite3
+from collections.abc import Iterable
+
+from app.domain.entities.user import User
+from app.persistence.identity_map import intern_user
+
+# Maximum ids bound into a single IN (...) list (SQLite's default limit is 999)
+_IN_CHUNK = 900
+
+
+def apply_balance_deltas(
+    cursor: sqlite3.Cursor,
+    group_id: int,
+    deltas: dict[int, int],
+    from_expense: bool,
+) -> None:
+    """Add per-user cent deltas to the ledger inside the caller's transaction."""
+    if not deltas:
+        return
+
+    cursor.executemany(
+        """
+        INSERT INTO group_balances (group_id, user_id, net_cents, in_expenses)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT (group_id, user_id) DO UPDATE SET
+            net_cents = net_cents + excluded.net_cents,
+            in_expenses = MAX(in_expenses, excluded.in_expenses)
+        """,
+        [
+            (group_id, user_id, cents, int(from_expense))
+            for user_id, cents in deltas.items()
+        ],
+    )
+
+
+def bump_group_version(cursor: sqlite3.Cursor, group_id: int) -> None:
+    """Mark a group changed inside the caller's transaction."""
+    cursor.execute(
+        """
+        UPDATE expense_groups
+        SET version = version + 1,
+            updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')
+        WHERE id = ?
+        """,
+        (group_id,),
+    )
+
+
+def read_balances(conn: sqlite3.Connection, group_id: int) -> dict[User, float]:
+    """Return net balances for users who appear in the group's expenses."""
+    rows = conn.execute(
+        """
+        SELECT u.id, u.name, u.email, gb.net_cents
+        FROM group_balances gb
+        JOIN users u ON u.id = gb.user_id
+        WHERE gb.group_id = ? AND gb.in_expenses = 1
+        ORDER BY u.id
+        """,
+        (group_id,),
+    ).fetchall()
+
+    return {intern_user(row[0], row[1], row[2]): int(row[3]) / 100 for row in rows}
+
+
+def read_balances_many(
+    conn: sqlite3.Connection, group_ids: Iterable[int]
+) -> dict[int, dict[User, float]]:
+    """Return net balances keyed by group, one query per chunk of groups."""
+    ids = sorted(set(group_ids))
+    balances: dict[int, dict[User, float]] = {}
+
+    for start in range(0, len(ids), _IN_CHUNK):
+        chunk = ids[start : start + _IN_CHUNK]
+        placeholders = ", ".join(["?"] * len(chunk))
+        # LEFT JOINs keep existing groups that have no ledger rows yet
+        rows = conn.execute(
+            f"""
+            SELECT g.id, u.id, u.name, u.email, gb.net_cents
+            FROM expense_groups g
+            LEFT JOIN group_balances gb ON gb.group_id = g.id AND gb.in_expenses = 1
+            LEFT JOIN users u ON u.id = gb.user_id
+            WHERE g.id IN ({placeholders})
+            ORDER BY g.id, u.id
+            """,
+            chunk,
+        ).fetchall()
+
+        for row in rows:
+            group = balances.setdefault(row[0], {})
+            if row[1] is not None:
+                group[intern_user(row[1], row[2], row[3])] = int(row[4]) / 100
+
+    return balances
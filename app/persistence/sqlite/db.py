@@ -0,0 +1,99 @@
+"""SQLite database helper with one long-lived connection per thread."""
+
+import logging
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from app.persistence.instrumentation import InstrumentedConnection, QueryRecorder
+
+from .schema import ADDED_COLUMNS, SCHEMA
+
+logger = logging.getLogger(__name__)
+
+
+class SQLiteDatabase:
+    """Open the database file in WAL mode and hand each thread its own connection.
+
+    Connections run in autocommit mode so reads never hold a snapshot open;
+    writes go through transaction(), which takes the write lock up front.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        busy_timeout: float = 10.0,
+        recorder: QueryRecorder | None = None,
+    ):
+        """Create the helper and make sure the schema exists."""
+        self._path = path
+        self._busy_timeout = busy_timeout
+        self._recorder = recorder
+        self._local = threading.local()
+        self._connections: list[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+
+        conn = self.connect()
+        self._add_missing_columns(conn)
+        conn.executescript(SCHEMA)
+        logger.info("SQLite database ready at %s", path)
+
+    def connect(self) -> sqlite3.Connection:
+        """Return this thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._open_connection()
+            if self._recorder is not None:
+                conn = InstrumentedConnection(conn, self._recorder)
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run a write transaction on this thread's connection."""
+        conn = self.connect()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            yield cursor
+            cursor.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                cursor.execute("ROLLBACK")
+            raise
+        finally:
+            cursor.close()
+
+    def close(self) -> None:
+        """Close every connection opened by any thread."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open and configure a connection for the current thread."""
+        conn = sqlite3.connect(
+            self._path,
+            timeout=self._busy_timeout,
+            isolation_level=None,
+            check_same_thread=False,
+        )
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+
+        with self._lock:
+            self._connections.append(conn)
+        return conn
+
+    @staticmethod
+    def _add_missing_columns(conn: sqlite3.Connection) -> None:
+        """Upgrade files created by an older schema before indexes reference new columns."""
+        for table, column, definition in ADDED_COLUMNS:
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            # An empty result means the table does not exist yet; SCHEMA creates it
+            if existing and column not in existing:
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
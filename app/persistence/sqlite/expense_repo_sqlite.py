@@ -0,0 +1,181 @@
+"""SQLite implementation for expense repository."""
+
+import sqlite3
+from collections.abc import Callable, Iterator
+
+from app.common.money import to_cents
+from app.domain.entities.expense import Expense
+from app.domain.entities.user import User
+from app.domain.repositories.expense_repository import (
+    ExpenseRepository,
+    LedgerColumns,
+)
+from app.domain.split_strategies.base import SplitStrategy
+from app.domain.split_strategies.custom import CustomSplitStrategy
+from app.domain.split_strategies.equal import EqualSplitStrategy
+from app.domain.split_strategies.percentage import PercentageSplitStrategy
+from app.persistence.expense_rows import (
+    assemble_expenses,
+    ledger_columns,
+    percentages_from_shares,
+)
+
+from .balance_ledger import apply_balance_deltas, bump_group_version
+from .db import SQLiteDatabase
+
+# Expenses per keyset page when streaming
+_PAGE_SIZE = 500
+
+_EXPENSE_COLUMNS = """
+    SELECT e.id, e.paid_by, payer.name, payer.email, e.amount, e.split_type,
+           u.id, u.name, u.email, es.amount
+"""
+
+
+class ExpenseRepositorySQLite(ExpenseRepository):
+    """Handles expense persistence in SQLite."""
+
+    def __init__(self, db: SQLiteDatabase, page_size: int = _PAGE_SIZE):
+        """Create repo with DB helper and the streaming page size."""
+        self._db = db
+        self._page_size = page_size
+
+    def save(self, expense: Expense, group_id: int) -> Expense:
+        """Insert an expense, its splits and its ledger deltas in one transaction."""
+        return self.save_many([expense], group_id)[0]
+
+    def save_many(self, expenses: list[Expense], group_id: int) -> list[Expense]:
+        """Insert many expenses with one executemany per table."""
+        if not expenses:
+            return []
+
+        # Validate every split up front so a bad row never opens a transaction
+        all_splits = [expense.split() for expense in expenses]
+
+        with self._db.transaction() as cursor:
+            cursor.executemany(
+                """
+                INSERT INTO expenses (group_id, paid_by, amount, split_type)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (
+                        group_id,
+                        expense.paid_by.id,
+                        _amount(expense.amount),
+                        expense.split_strategy.__class__.__name__,
+                    )
+                    for expense in expenses
+                ],
+            )
+            # The write lock is held and ids only grow, so the batch got the
+            # n ids ending at the last one assigned.
+            last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+            expense_ids = list(range(last_id - len(expenses) + 1, last_id + 1))
+
+            cursor.executemany(
+                "INSERT INTO expense_splits (expense_id, user_id, amount) VALUES (?, ?, ?)",
+                [
+                    (expense_id, user.id, _amount(value))
+                    for expense_id, splits in zip(expense_ids, all_splits, strict=False)
+                    for user, value in splits.items()
+                ],
+            )
+
+            deltas: dict[int, int] = {}
+            for expense, splits in zip(expenses, all_splits, strict=False):
+                if not splits:
+                    continue
+                payer_id = expense.paid_by.id
+                deltas[payer_id] = deltas.get(payer_id, 0) + to_cents(expense.amount)
+                for user, value in splits.items():
+                    deltas[user.id] = deltas.get(user.id, 0) - to_cents(value)
+            apply_balance_deltas(cursor, group_id, deltas, from_expense=True)
+            bump_group_version(cursor, group_id)
+
+        for expense, expense_id in zip(expenses, expense_ids, strict=False):
+            expense.id = expense_id
+        return expenses
+
+    def get_by_group(self, group_id: int) -> list[Expense]:
+        """Return all expenses for a group."""
+        return fetch_group_expenses(self._db.connect(), group_id, self._create_strategy)
+
+    def get_ledger_columns(self, group_id: int) -> LedgerColumns:
+        """Return the group's stored splits and payer credits as flat columns."""
+        return ledger_columns(_group_rows(self._db.connect(), group_id))
+
+    def iter_by_group(
+        self, group_id: int, batch_size: int | None = None
+    ) -> Iterator[Expense]:
+        """Stream a group's expenses in id order, one keyset page at a time."""
+        conn = self._db.connect()
+        limit = batch_size or self._page_size
+        after_id = 0
+
+        while True:
+            rows = conn.execute(
+                f"""
+                {_EXPENSE_COLUMNS}
+                FROM (
+                    SELECT id FROM expenses x
+                    WHERE group_id = ? AND id > ?
+                      AND EXISTS (SELECT 1 FROM expense_splits es WHERE es.expense_id = x.id)
+                    ORDER BY id
+                    LIMIT ?
+                ) page
+                JOIN expenses e ON e.id = page.id
+                JOIN users payer ON payer.id = e.paid_by
+                JOIN expense_splits es ON es.expense_id = e.id
+                JOIN users u ON u.id = es.user_id
+                ORDER BY e.id, es.id
+                """,
+                (group_id, after_id, limit),
+            )
+            page = assemble_expenses(rows, self._create_strategy)
+
+            yield from page
+
+            if len(page) < limit:
+                return
+            after_id = page[-1].id
+
+    @staticmethod
+    def _create_strategy(split_type: str, amounts: dict[User, float]) -> SplitStrategy:
+        """Create appropriate strategy based on split_type."""
+        if split_type == "EqualSplitStrategy":
+            return EqualSplitStrategy()
+        elif split_type == "PercentageSplitStrategy":
+            return PercentageSplitStrategy(percentages_from_shares(amounts))
+        else:  # CustomSplitStrategy
+            return CustomSplitStrategy(amounts)
+
+
+def fetch_group_expenses(
+    conn: sqlite3.Connection,
+    group_id: int,
+    strategy_factory: Callable[[str, dict[User, float]], SplitStrategy],
+) -> list[Expense]:
+    """Load a group's expenses with their splits in a single query."""
+    return assemble_expenses(_group_rows(conn, group_id), strategy_factory)
+
+
+def _group_rows(conn: sqlite3.Connection, group_id: int) -> sqlite3.Cursor:
+    """Run the expense+split join for a whole group, ordered by expense id."""
+    return conn.execute(
+        f"""
+        {_EXPENSE_COLUMNS}
+        FROM expenses e
+        JOIN users payer ON payer.id = e.paid_by
+        JOIN expense_splits es ON es.expense_id = e.id
+        JOIN users u ON u.id = es.user_id
+        WHERE e.group_id = ?
+        ORDER BY e.id, es.id
+        """,
+        (group_id,),
+    )
+
+
+def _amount(value: float) -> float:
+    """Round an amount the way a DECIMAL(10,2) column would."""
+    return to_cents(value) / 100
@@ -0,0 +1,194 @@
+"""SQLite implementation for group repository."""
+
+from collections.abc import Iterable
+from datetime import datetime
+
+from app.domain.entities.expense import Expense
+from app.domain.entities.group import Group, GroupSummary, GroupVersion
+from app.domain.entities.user import User
+from app.domain.repositories.group_repository import GroupRepository
+from app.domain.split_strategies.custom import CustomSplitStrategy
+from app.persistence.identity_map import intern_user
+
+from .balance_ledger import bump_group_version
+from .db import SQLiteDatabase
+from .expense_repo_sqlite import fetch_group_expenses
+
+
+class GroupRepositorySQLite(GroupRepository):
+    """Handles group persistence in SQLite."""
+
+    def __init__(self, db: SQLiteDatabase):
+        """Create repo with DB helper."""
+        self._db = db
+
+    def save(self, group: Group) -> Group:
+        """Insert or update a group, writing only membership changes."""
+        added, removed = group.pending_member_changes()
+
+        with self._db.transaction() as cursor:
+            if group.id is None:
+                cursor.execute(
+                    "INSERT INTO expense_groups (name) VALUES (?)", (group.name,)
+                )
+                group_id = cursor.lastrowid
+            else:
+                cursor.execute(
+                    "UPDATE expense_groups SET name = ? WHERE id = ?",
+                    (group.name, group.id),
+                )
+                group_id = group.id
+                bump_group_version(cursor, group_id)
+
+            if removed:
+                cursor.executemany(
+                    "DELETE FROM group_members WHERE group_id = ? AND user_id = ?",
+                    [(group_id, member.id) for member in removed],
+                )
+
+            if added:
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO group_members (group_id, user_id) VALUES (?, ?)",
+                    [(group_id, member.id) for member in added],
+                )
+
+        group.id = group_id
+        group.mark_members_clean()
+        return group
+
+    def get_by_id(self, group_id: int) -> Group | None:
+        """Fetch a group with members; expenses load on first access."""
+        conn = self._db.connect()
+        row = conn.execute(
+            "SELECT id, name FROM expense_groups WHERE id = ?", (group_id,)
+        ).fetchone()
+        if not row:
+            return None
+
+        loaded_id = int(row[0])
+        group = Group(
+            group_id=loaded_id,
+            name=row[1],
+            expenses_loader=lambda: self._load_expenses(loaded_id),
+        )
+
+        for member in self._fetch_members(loaded_id):
+            group.add_member(member)
+        group.mark_members_clean()
+
+        return group
+
+    def get_summary(self, group_id: int) -> GroupSummary | None:
+        """Fetch a group header (name and counts) without members or expenses."""
+        row = (
+            self._db.connect()
+            .execute(
+                """
+            SELECT g.id, g.name,
+                   (SELECT COUNT(*) FROM group_members gm WHERE gm.group_id = g.id),
+                   (SELECT COUNT(*) FROM expenses e WHERE e.group_id = g.id)
+            FROM expense_groups g
+            WHERE g.id = ?
+            """,
+                (group_id,),
+            )
+            .fetchone()
+        )
+
+        if not row:
+            return None
+
+        return GroupSummary(
+            id=int(row[0]),
+            name=row[1],
+            member_count=int(row[2]),
+            expense_count=int(row[3]),
+        )
+
+    def exists(self, group_id: int) -> bool:
+        """Return True if the group exists (primary key probe)."""
+        row = (
+            self._db.connect()
+            .execute("SELECT 1 FROM expense_groups WHERE id = ?", (group_id,))
+            .fetchone()
+        )
+        return row is not None
+
+    def get_members_by_ids(
+        self, group_id: int, user_ids: Iterable[int]
+    ) -> dict[int, User]:
+        """Return the given users that are members of the group, keyed by id."""
+        ids = list(dict.fromkeys(user_ids))
+        if not ids:
+            return {}
+
+        placeholders = ", ".join(["?"] * len(ids))
+        rows = (
+            self._db.connect()
+            .execute(
+                f"""
+            SELECT u.id, u.name, u.email
+            FROM group_members gm
+            JOIN users u ON u.id = gm.user_id
+            WHERE gm.group_id = ? AND gm.user_id IN ({placeholders})
+            """,
+                (group_id, *ids),
+            )
+            .fetchall()
+        )
+
+        return {int(row[0]): intern_user(row[0], row[1], row[2]) for row in rows}
+
+    def get_all(self) -> list[Group]:
+        """Return all groups (read-only)."""
+        rows = (
+            self._db.connect().execute("SELECT id, name FROM expense_groups").fetchall()
+        )
+
+        return [Group(group_id=int(row[0]), name=row[1]) for row in rows]
+
+    def get_versions_since(self, since: datetime | None) -> list[GroupVersion]:
+        """Return change stamps of groups updated at or after since (all if None)."""
+        sql = "SELECT id, name, version, updated_at FROM expense_groups"
+        params: tuple = ()
+        if since is not None:
+            sql += " WHERE updated_at >= ?"
+            params = (since.isoformat(sep=" ", timespec="milliseconds"),)
+
+        rows = self._db.connect().execute(sql, params).fetchall()
+
+        return [
+            GroupVersion(
+                id=int(row[0]),
+                name=row[1],
+                version=int(row[2]),
+                updated_at=datetime.fromisoformat(row[3]),
+            )
+            for row in rows
+        ]
+
+    def _fetch_members(self, group_id: int) -> list[User]:
+        """Load group members for a given group id."""
+        rows = (
+            self._db.connect()
+            .execute(
+                """
+            SELECT u.id, u.name, u.email
+            FROM group_members gm
+            JOIN users u ON gm.user_id = u.id
+            WHERE gm.group_id = ?
+            """,
+                (group_id,),
+            )
+            .fetchall()
+        )
+
+        return [intern_user(row[0], row[1], row[2]) for row in rows]
+
+    def _load_expenses(self, group_id: int) -> list[Expense]:
+        """Load expenses for a given group id."""
+        return fetch_group_expenses(
+            self._db.connect(),
+            group_id,
+            lambda split_type, amounts: CustomSplitStrategy(amounts),
+        )
@@ -0,0 +1,76 @@
+"""SQLite translation of docker/db/init.sql."""
+
+# Same tables, keys and indexes as the MySQL schema. DECIMAL columns keep
+# NUMERIC affinity; dates and timestamps are stored as ISO-8601 text (UTC).
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name VARCHAR(100) NOT NULL,
+  email VARCHAR(255) NOT NULL,
+  name_key VARCHAR(100) GENERATED ALWAYS AS (LOWER(TRIM(name))) STORED,
+  email_key VARCHAR(255) GENERATED ALWAYS AS (LOWER(TRIM(email))) STORED
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uniq_user_name_key ON users (name_key);
+CREATE UNIQUE INDEX IF NOT EXISTS uniq_user_email_key ON users (email_key);
+
+CREATE TABLE IF NOT EXISTS expense_groups (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  name VARCHAR(100) NOT NULL,
+  version INTEGER NOT NULL DEFAULT 0,
+  updated_at TEXT NOT NULL DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now'))
+);
+CREATE INDEX IF NOT EXISTS idx_groups_updated_at ON expense_groups (updated_at);
+
+CREATE TABLE IF NOT EXISTS group_members (
+  group_id INTEGER NOT NULL REFERENCES expense_groups(id) ON DELETE CASCADE,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  PRIMARY KEY (group_id, user_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS expenses (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  group_id INTEGER NOT NULL REFERENCES expense_groups(id) ON DELETE CASCADE,
+  paid_by INTEGER NOT NULL REFERENCES users(id) ON DELETE RESTRICT,
+  amount DECIMAL(10,2) NOT NULL,
+  split_type VARCHAR(80) NOT NULL,
+  description VARCHAR(255) NOT NULL DEFAULT '',
+  expense_date DATE NOT NULL DEFAULT (DATE('now'))
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_group_date ON expenses (group_id, expense_date);
+CREATE INDEX IF NOT EXISTS idx_expenses_paid_by ON expenses (paid_by);
+
+CREATE TABLE IF NOT EXISTS expense_splits (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  expense_id INTEGER NOT NULL REFERENCES expenses(id) ON DELETE CASCADE,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  amount DECIMAL(10,2) NOT NULL,
+  UNIQUE (expense_id, user_id)
+);
+CREATE INDEX IF NOT EXISTS idx_splits_user ON expense_splits (user_id);
+
+CREATE TABLE IF NOT EXISTS settlements (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  group_id INTEGER NOT NULL REFERENCES expense_groups(id) ON DELETE CASCADE,
+  debtor_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  creditor_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  amount DECIMAL(10,2) NOT NULL,
+  settlement_date DATE NOT NULL DEFAULT (DATE('now'))
+);
+CREATE INDEX IF NOT EXISTS idx_settlements_group ON settlements (group_id);
+CREATE INDEX IF NOT EXISTS idx_settlements_date ON settlements (settlement_date);
+
+CREATE TABLE IF NOT EXISTS group_balances (
+  group_id INTEGER NOT NULL REFERENCES expense_groups(id) ON DELETE CASCADE,
+  user_id INTEGER NOT NULL REFERENCES users(id) ON DELETE CASCADE,
+  net_cents INTEGER NOT NULL DEFAULT 0,
+  in_expenses INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (group_id, user_id)
+) WITHOUT ROWID;
+"""
+
+# Columns added after the first release, as (table, column, definition);
+# ALTER TABLE needs constant defaults, so old rows get the epoch.
+ADDED_COLUMNS = (
+    ("expense_groups", "version", "INTEGER NOT NULL DEFAULT 0"),
+    ("expense_groups", "updated_at", "TEXT NOT NULL DEFAULT '1970-01-01 00:00:00.000'"),
+)
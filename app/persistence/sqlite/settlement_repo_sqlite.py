@@ -0,0 +1,154 @@
+"""SQLite implementation for settlement repository."""
+
+from collections.abc import Iterable, Iterator
+from datetime import date
+
+from app.common.money import to_cents
+from app.domain.entities.settlement import Settlement
+from app.domain.entities.user import User
+from app.domain.repositories.settlement_repository import SettlementRepository
+from app.persistence.identity_map import intern_user
+
+from .balance_ledger import (
+    apply_balance_deltas,
+    bump_group_version,
+    read_balances,
+    read_balances_many,
+)
+from .db import SQLiteDatabase
+
+# Settlements per keyset page when streaming
+_PAGE_SIZE = 500
+
+_SETTLEMENT_COLUMNS = """
+    SELECT s.id, s.group_id, s.debtor_id, d.name, d.email,
+           s.creditor_id, c.name, c.email, s.amount, s.settlement_date
+    FROM settlements s
+    JOIN users d ON d.id = s.debtor_id
+    JOIN users c ON c.id = s.creditor_id
+"""
+
+
+class SettlementRepositorySQLite(SettlementRepository):
+    """Handles settlement persistence in SQLite."""
+
+    def __init__(self, db: SQLiteDatabase, page_size: int = _PAGE_SIZE):
+        """Create repo with DB helper and the streaming page size."""
+        self._db = db
+        self._page_size = page_size
+
+    def save(self, settlement: Settlement) -> Settlement:
+        """Insert a settlement and move its amount in the ledger."""
+        cents = to_cents(settlement.amount)
+
+        with self._db.transaction() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO settlements (group_id, debtor_id, creditor_id, amount, settlement_date)
+                VALUES (?, ?, ?, ?, ?)
+                """,
+                (
+                    settlement.group_id,
+                    settlement.debtor.id,
+                    settlement.creditor.id,
+                    cents / 100,
+                    settlement.settlement_date.isoformat(),
+                ),
+            )
+            settlement.id = cursor.lastrowid
+
+            deltas = {settlement.debtor.id: cents}
+            deltas[settlement.creditor.id] = (
+                deltas.get(settlement.creditor.id, 0) - cents
+            )
+            apply_balance_deltas(
+                cursor, settlement.group_id, deltas, from_expense=False
+            )
+            bump_group_version(cursor, settlement.group_id)
+
+        return settlement
+
+    def get_by_group(self, group_id: int) -> list[Settlement]:
+        """Get all settlements for a group."""
+        rows = (
+            self._db.connect()
+            .execute(
+                f"{_SETTLEMENT_COLUMNS} WHERE s.group_id = ? ORDER BY s.settlement_date DESC",
+                (group_id,),
+            )
+            .fetchall()
+        )
+
+        return [self._to_settlement(row) for row in rows]
+
+    def get_all(self) -> list[Settlement]:
+        """Get all settlements."""
+        rows = (
+            self._db.connect()
+            .execute(f"{_SETTLEMENT_COLUMNS} ORDER BY s.settlement_date DESC")
+            .fetchall()
+        )
+
+        return [self._to_settlement(row) for row in rows]
+
+    def iter_by_group(
+        self, group_id: int, batch_size: int | None = None
+    ) -> Iterator[Settlement]:
+        """Stream a group's settlements newest first, one keyset page at a time."""
+        return self._iter_pages(group_id, batch_size or self._page_size)
+
+    def iter_all(self, batch_size: int | None = None) -> Iterator[Settlement]:
+        """Stream all settlements newest first, one keyset page at a time."""
+        return self._iter_pages(None, batch_size or self._page_size)
+
+    def get_net_balances(self, group_id: int) -> dict[User, float]:
+        """Read net balances per user from the group_balances ledger."""
+        return read_balances(self._db.connect(), group_id)
+
+    def get_net_balances_many(
+        self, group_ids: Iterable[int]
+    ) -> dict[int, dict[User, float]]:
+        """Read net balances for a batch of groups from the ledger."""
+        return read_balances_many(self._db.connect(), group_ids)
+
+    def _iter_pages(self, group_id: int | None, limit: int) -> Iterator[Settlement]:
+        """Yield settlements by descending id, one query per page."""
+        conn = self._db.connect()
+        before_id: int | None = None
+
+        while True:
+            conditions = []
+            params: list = []
+            if group_id is not None:
+                conditions.append("s.group_id = ?")
+                params.append(group_id)
+            if before_id is not None:
+                conditions.append("s.id < ?")
+                params.append(before_id)
+            where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+            page = [
+                self._to_settlement(row)
+                for row in conn.execute(
+                    f"{_SETTLEMENT_COLUMNS} {where} ORDER BY s.id DESC LIMIT ?",
+                    (*params, limit),
+                )
+            ]
+
+            yield from page
+
+            if len(page) < limit:
+                return
+            before_id = page[-1].id
+
+    @staticmethod
+    def _to_settlement(row) -> Settlement:
+        """Build a Settlement from a settlement+users row."""
+        return Settlement(
+            settlement_id=row[0],
+            group_id=row[1],
+            debtor=intern_user(row[2], row[3], row[4]),
+            creditor=intern_user(row[5], row[6], row[7]),
+            amount=float(row[8]),
+            settlement_date=date.fromisoformat(row[9]),
+        )
@@ -0,0 +1,101 @@
+"""SQLite implementation for user repository."""
+
+from collections.abc import Iterable
+
+from app.domain.entities.user import User
+from app.domain.repositories.user_repository import UserRepository
+from app.persistence.identity_map import intern_user
+
+from .db import SQLiteDatabase
+
+# Stay under SQLite's default limit of 999 bound parameters
+_IN_CHUNK = 900
+
+
+class UserRepositorySQLite(UserRepository):
+    """Handles user persistence in SQLite."""
+
+    def __init__(self, db: SQLiteDatabase):
+        """Create repo with DB helper."""
+        self._db = db
+
+    def save(self, user: User) -> User:
+        """Insert a user and return the saved record."""
+        with self._db.transaction() as cursor:
+            cursor.execute(
+                "INSERT INTO users (name, email) VALUES (?, ?)", (user.name, user.email)
+            )
+            new_id = cursor.lastrowid
+
+        return intern_user(new_id, user.name, user.email)
+
+    def get_by_id(self, user_id: int) -> User | None:
+        """Fetch a user by id."""
+        row = (
+            self._db.connect()
+            .execute("SELECT id, name, email FROM users WHERE id = ?", (user_id,))
+            .fetchone()
+        )
+
+        if not row:
+            return None
+
+        return intern_user(row[0], row[1], row[2])
+
+    def get_many_by_ids(self, user_ids: Iterable[int]) -> dict[int, User]:
+        """Fetch several users with one query per chunk of ids."""
+        ids = list(dict.fromkeys(user_ids))
+        conn = self._db.connect()
+        users: dict[int, User] = {}
+
+        for start in range(0, len(ids), _IN_CHUNK):
+            chunk = ids[start : start + _IN_CHUNK]
+            placeholders = ", ".join(["?"] * len(chunk))
+            for row in conn.execute(
+                f"SELECT id, name, email FROM users WHERE id IN ({placeholders})", chunk
+            ):
+                users[int(row[0])] = intern_user(row[0], row[1], row[2])
+
+        return users
+
+    def get_by_email(self, email: str) -> User | None:
+        """Fetch a user by email, normalized in SQL exactly like email_key."""
+        row = (
+            self._db.connect()
+            .execute(
+                "SELECT id, name, email FROM users WHERE email_key = LOWER(TRIM(?))",
+                (email,),
+            )
+            .fetchone()
+        )
+
+        if not row:
+            return None
+
+        return intern_user(row[0], row[1], row[2])
+
+    def get_by_name(self, name: str) -> User | None:
+        """Fetch a user by name (case-insensitive)."""
+        row = (
+            self._db.connect()
+            .execute(
+                "SELECT id, name, email FROM users WHERE name_key = LOWER(TRIM(?))",
+                (name,),
+            )
+            .fetchone()
+        )
+
+        if not row:
+            return None
+
+        return intern_user(row[0], row[1], row[2])
+
+    def get_all(self) -> list:
+        """Return all users."""
+        rows = (
+            self._db.connect()
+            .execute("SELECT id, name, email FROM users ORDER BY id")
+            .fetchall()
+        )
+
+        return [intern_user(row[0], row[1], row[2]) for row in rows]
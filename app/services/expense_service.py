@@ -1,6 +1,10 @@
 """Expense service for business logic."""
 
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional
+from app.common.dirty_groups import DirtyGroups
+from app.domain.domain_services.incremental_settlement_calculator import (
+    IncrementalSettlementCalculator,
+)
 from app.domain.entities.expense import Expense
 from app.domain.entities.user import User
 from app.domain.repositories.expense_repository import ExpenseRepository
@@ -23,12 +27,16 @@ class ExpenseService:
         self,
         expense_repository: ExpenseRepository,
         group_repository: GroupRepository,
-        user_repository: UserRepository
+        user_repository: UserRepository,
+        balance_tracker: Optional[IncrementalSettlementCalculator] = None,
+        dirty_groups: Optional[DirtyGroups] = None
     ):
-        """Create the service with repositories."""
+        """Create the service with repositories, running balances and change tracking."""
         self._expense_repo = expense_repository
         self._group_repo = group_repository
         self._user_repo = user_repository
+        self._balance_tracker = balance_tracker
+        self._dirty_groups = dirty_groups
 
     def add_expense(
         self,
@@ -41,17 +49,19 @@ class ExpenseService:
     ) -> Expense:
         """Create and save a new expense for a group."""
 
-        group = self._group_repo.get_by_id(group_id)
-        if not group:
+        if not self._group_repo.exists(group_id):
             raise ValueError("Group not found")
 
-        paid_by = self._user_repo.get_by_id(paid_by_id)
+        # One round trip for the payer and every participant
+        users = self._user_repo.get_many_by_ids([paid_by_id, *participant_ids])
+
+        paid_by = users.get(paid_by_id)
         if not paid_by:
             raise ValueError("Payer not found")
 
         participants = []
         for uid in participant_ids:
-            user = self._user_repo.get_by_id(uid)
+            user = users.get(uid)
             if not user:
                 raise ValueError(f"User {uid} not found")
             participants.append(user)
@@ -70,18 +80,37 @@ class ExpenseService:
             split_strategy=strategy
         )
 
-        saved = self._expense_repo.save(expense, group_id)
-        logger.info(f"Adding expense | group={group_id} | amount={amount} | split={split_type.value}")  
+        if self._balance_tracker:
+            # Keeps concurrent replays from seeding until the delta is applied
+            with self._balance_tracker.writing(group_id):
+                saved = self._expense_repo.save(expense, group_id)
+                self._balance_tracker.apply_expense(group_id, saved)
+        else:
+            saved = self._expense_repo.save(expense, group_id)
+        if self._dirty_groups is not None:
+            self._dirty_groups.mark(group_id)
+        logger.info(
+            "Adding expense | group=%s | amount=%s | split=%s",
+            group_id, amount, split_type.value,
+        )
         return saved
 
     def list_expenses(self, group_id: int) -> List[Expense]:
         """Return expenses for a group."""
-        group = self._group_repo.get_by_id(group_id)
-        if not group:
+        if not self._group_repo.exists(group_id):
             raise ValueError("Group not found")
 
         return self._expense_repo.get_by_group(group_id)
 
+    def iter_expenses(
+        self, group_id: int, batch_size: Optional[int] = None
+    ) -> Iterator[Expense]:
+        """Stream expenses for a group page by page."""
+        if not self._group_repo.exists(group_id):
+            raise ValueError("Group not found")
+
+        return self._expense_repo.iter_by_group(group_id, batch_size)
+
     def _normalize_split_data(
         self,
         split_data: Dict[Any, float],
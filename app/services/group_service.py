@@ -1,6 +1,8 @@
 """Group service for business logic."""
 
-from app.domain.entities.group import Group
+from typing import Optional
+from app.common.dirty_groups import DirtyGroups
+from app.domain.entities.group import Group, GroupSummary
 from app.domain.repositories.group_repository import GroupRepository
 from app.domain.repositories.user_repository import UserRepository
 
@@ -15,17 +17,20 @@ class GroupService:
     def __init__(
         self,
         group_repository: GroupRepository,
-        user_repository: UserRepository
+        user_repository: UserRepository,
+        dirty_groups: Optional[DirtyGroups] = None
     ):
-        """Create the service with repositories."""
+        """Create the service with repositories and optional change tracking."""
         self._group_repository = group_repository
         self._user_repository = user_repository
+        self._dirty_groups = dirty_groups
 
     def create_group(self, name: str) -> Group:
         """Create and save a new group."""
         group = Group(group_id=None, name=name)
         saved = self._group_repository.save(group)
-        logger.info(f"Creating group | name={name}")
+        self._mark_dirty(saved.id)
+        logger.info("Creating group | name=%s", name)
         return saved
 
     def add_member(self, group_id: int, user_id: int) -> None:
@@ -40,6 +45,7 @@ class GroupService:
 
         group.add_member(user)
         self._group_repository.save(group)
+        self._mark_dirty(group_id)
 
     def remove_member(self, group_id: int, user_id: int) -> None:
         """Remove a user from a group."""
@@ -53,14 +59,27 @@ class GroupService:
 
         group.remove_member(user)
         self._group_repository.save(group)
+        self._mark_dirty(group_id)
 
     def list_groups(self) -> list[Group]:
         """Return all groups."""
         return self._group_repository.get_all()
 
     def get_group_details(self, group_id: int) -> Group:
-        """Return a group with members and expenses."""
+        """Return a group with members; expenses load on first access."""
         group = self._group_repository.get_by_id(group_id)
         if not group:
             raise ValueError("Group not found")
         return group
+
+    def get_group_summary(self, group_id: int) -> GroupSummary:
+        """Return a group's name and counts without loading members or expenses."""
+        summary = self._group_repository.get_summary(group_id)
+        if not summary:
+            raise ValueError("Group not found")
+        return summary
+
+    def _mark_dirty(self, group_id: int) -> None:
+        """Flag a group for the background balance job."""
+        if self._dirty_groups is not None:
+            self._dirty_groups.mark(group_id)
@@ -1,13 +1,38 @@
 """Settlement service for balances and suggestions."""
 
-from typing import Dict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
 from datetime import date
+from app.common.dirty_groups import DirtyGroups
 from app.domain.domain_services.settlement_calculator import SettlementCalculator
+from app.domain.domain_services.incremental_settlement_calculator import (
+    IncrementalSettlementCalculator,
+)
+from app.domain.domain_services.settlement_solver import (
+    GreedySettlementSolver,
+    SettlementSolver,
+)
+from app.domain.entities.group import Group
 from app.domain.entities.user import User
 from app.domain.entities.settlement import Settlement
 from app.domain.repositories.group_repository import GroupRepository
 from app.domain.repositories.settlement_repository import SettlementRepository
 
+import logging
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class SettlementPlan:
+    """Everything the settlement screen shows, computed from one group load."""
+    group_id: int
+    group_name: str
+    members: List[User]
+    balances: Dict[User, float]
+    suggestions: List[tuple[User, User, float]]
+    balances_after: Dict[User, float]
+    mode: str = "greedy"
+
 
 class SettlementService:
     """Handles balance calculation and settlement suggestions."""
@@ -16,111 +41,169 @@ class SettlementService:
         self,
         group_repository: GroupRepository,
         calculator: SettlementCalculator,
-        settlement_repository: SettlementRepository = None
+        settlement_repository: SettlementRepository = None,
+        solver: Optional[SettlementSolver] = None,
+        dirty_groups: Optional[DirtyGroups] = None
     ):
-        """Create the service with repo and calculator."""
+        """Create the service with repo, calculator, solver and change tracking."""
         self._group_repo = group_repository
         self._calculator = calculator
         self._settlement_repo = settlement_repository
+        self._solver = solver or GreedySettlementSolver()
+        self._dirty_groups = dirty_groups
+        self._tracker = (
+            calculator
+            if isinstance(calculator, IncrementalSettlementCalculator)
+            else None
+        )
 
     def get_balances(self, group_id: int) -> Dict[User, float]:
         """Return net balances for a group after deducting recorded settlements."""
-        group = self._group_repo.get_by_id(group_id)
-        if not group:
-            raise ValueError("Group not found")
-
-        balances = self._calculator.calculate_balances(group)
-        
-        # Deduct recorded settlements from balances
-        if self._settlement_repo:
-            settlements = self._settlement_repo.get_by_group(group_id)
-            
-            # Convert balances to dict keyed by user ID for easier lookup
-            balance_by_id = {user.id: balance for user, balance in balances.items()}
-            user_by_id = {user.id: user for user in balances.keys()}
-            
-            for settlement in settlements:
-                # Debtor's balance improves (becomes less negative/more positive)
-                if settlement.debtor.id in balance_by_id:
-                    balance_by_id[settlement.debtor.id] += float(settlement.amount)
-                    
-                # Creditor's balance decreases (becomes less positive/more negative)
-                if settlement.creditor.id in balance_by_id:
-                    balance_by_id[settlement.creditor.id] -= float(settlement.amount)
-            
-            # Reconstruct balances dict with User objects
-            balances = {user_by_id[user_id]: balance for user_id, balance in balance_by_id.items()}
-        
-        # Normalize near-zero balances
-        normalized: Dict[User, float] = {}
-        for user, balance in balances.items():
-            if abs(balance) < 0.01:
-                normalized[user] = 0.0
+        return self._balances(group_id)
+
+    def get_balances_many(
+        self, group_ids: Iterable[int], fresh: bool = False
+    ) -> Dict[int, Dict[User, float]]:
+        """Return net balances keyed by group for a batch of groups.
+
+        Groups not already tracked are read with one set-based repository query
+        for the whole batch; ids of groups that do not exist are left out. With
+        fresh, tracked balances are skipped and every group is read and
+        re-seeded, so writes made by other processes are seen.
+        """
+        ids = list(dict.fromkeys(group_ids))
+        balances: Dict[int, Dict[User, float]] = {}
+        pending: List[int] = []
+
+        for group_id in ids:
+            tracked = (
+                self._tracker.get_balances(group_id)
+                if self._tracker and not fresh
+                else None
+            )
+            if tracked is not None:
+                balances[group_id] = tracked
             else:
-                normalized[user] = round(balance, 2)
-        
-        return normalized
+                pending.append(group_id)
+
+        if pending:
+            tokens = (
+                {group_id: self._tracker.replay_token(group_id) for group_id in pending}
+                if self._tracker else {}
+            )
+            for group_id, loaded in self._load_balances_many(pending).items():
+                if self._tracker:
+                    self._seed_tracker(group_id, loaded, tokens[group_id])
+                balances[group_id] = loaded
+
+        return {
+            group_id: self._normalize(balances[group_id])
+            for group_id in ids
+            if group_id in balances
+        }
+
+    def forget_balances(self, group_ids: Iterable[int]) -> None:
+        """Drop tracked balances of groups written outside this process."""
+        if self._tracker:
+            for group_id in group_ids:
+                self._tracker.forget(group_id)
 
     def get_settlement_suggestions(self, group_id: int) -> list[tuple[User, User, float]]:
         """Return payment suggestions to settle balances."""
-        balances = self.get_balances(group_id)
-
-        debtors: list[tuple[User, float]] = []
-        creditors: list[tuple[User, float]] = []
+        return self._solver.solve(self.get_balances(group_id)).transfers
 
-        for user, balance in balances.items():
-            if balance < -0.01:
-                debtors.append((user, -balance))  # store positive value owed
-            elif balance > 0.01:
-                creditors.append((user, balance))
+    def get_balances_after_settlement(self, group_id: int) -> Dict[User, float]:
+        """Return balances after applying settlement suggestions (simulated)."""
+        balances = self.get_balances(group_id)
+        return self._apply_suggestions(balances, self._solver.solve(balances).transfers)
 
-        debtors.sort(key=lambda x: x[1], reverse=True)
-        creditors.sort(key=lambda x: x[1], reverse=True)
+    def get_settlement_plan(self, group_id: int) -> SettlementPlan:
+        """Return balances, suggestions and simulated outcome from one group load."""
+        group = self._group_repo.get_by_id(group_id)
+        if not group:
+            raise ValueError("Group not found")
 
-        suggestions: list[tuple[User, User, float]] = []
+        balances = self._balances(group_id, group)
+        solution = self._solver.solve(balances)
 
-        debtor_idx = 0
-        creditor_idx = 0
+        return SettlementPlan(
+            group_id=group_id,
+            group_name=group.name,
+            members=group.members,
+            balances=balances,
+            suggestions=solution.transfers,
+            balances_after=self._apply_suggestions(balances, solution.transfers),
+            mode=solution.mode,
+        )
 
-        while debtor_idx < len(debtors) and creditor_idx < len(creditors):
-            debtor, debt_amount = debtors[debtor_idx]
-            creditor, credit_amount = creditors[creditor_idx]
+    def _balances(self, group_id: int, group: Optional[Group] = None) -> Dict[User, float]:
+        """Return normalized balances, reusing an already loaded group."""
+        if self._tracker:
+            tracked = self._tracker.get_balances(group_id)
+            if tracked is not None:
+                return self._normalize(tracked)
+
+        token = self._tracker.replay_token(group_id) if self._tracker else None
+        balances = self._load_balances(group_id, group)
+
+        if self._tracker:
+            self._seed_tracker(group_id, balances, token)
+
+        return self._normalize(balances)
+
+    def _seed_tracker(self, group_id: int, balances: Dict[User, float], token: int) -> None:
+        """Hand freshly read balances to the tracker and report any drift."""
+        # Full replay doubles as the consistency check for tracked balances
+        drift = self._tracker.seed(group_id, balances, token)
+        if drift:
+            logger.warning(
+                "Running balances drifted from full replay | group=%s | users=%s",
+                group_id,
+                ", ".join(f"{user.id}:{delta:+.2f}" for user, delta in drift.items()),
+            )
+
+    def _load_balances(
+        self, group_id: int, group: Optional[Group] = None
+    ) -> Dict[User, float]:
+        """Compute raw balances from the repository or a full ledger replay."""
+        if self._settlement_repo:
+            # Aggregated by the repository: one row per user instead of the ledger
+            if group is None and not self._group_repo.exists(group_id):
+                raise ValueError("Group not found")
 
-            amount = min(debt_amount, credit_amount)
-            suggestions.append((debtor, creditor, round(amount, 2)))
+            return self._settlement_repo.get_net_balances(group_id)
 
-            debt_amount -= amount
-            credit_amount -= amount
+        if group is None:
+            group = self._group_repo.get_by_id(group_id)
+            if not group:
+                raise ValueError("Group not found")
 
-            if debt_amount <= 0.01:
-                debtor_idx += 1
-            else:
-                debtors[debtor_idx] = (debtor, debt_amount)
+        return self._calculator.calculate_balances(group)
 
-            if credit_amount <= 0.01:
-                creditor_idx += 1
-            else:
-                creditors[creditor_idx] = (creditor, credit_amount)
+    def _load_balances_many(self, group_ids: List[int]) -> Dict[int, Dict[User, float]]:
+        """Compute raw balances for existing groups among group_ids."""
+        if self._settlement_repo:
+            return self._settlement_repo.get_net_balances_many(group_ids)
 
-        return suggestions
-
-    def get_balances_after_settlement(self, group_id: int) -> Dict[User, float]:
-        """Return balances after applying settlement suggestions (simulated)."""
-        balances = self.get_balances(group_id)
-        suggestions = self.get_settlement_suggestions(group_id)
+        balances: Dict[int, Dict[User, float]] = {}
+        for group_id in group_ids:
+            group = self._group_repo.get_by_id(group_id)
+            if group:
+                balances[group_id] = self._calculator.calculate_balances(group)
+        return balances
 
+    def _apply_suggestions(
+        self,
+        balances: Dict[User, float],
+        suggestions: list[tuple[User, User, float]],
+    ) -> Dict[User, float]:
+        """Return a copy of balances with suggested payments applied."""
+        after = dict(balances)
         for debtor, creditor, amount in suggestions:
-            balances[debtor] = balances.get(debtor, 0) + amount
-            balances[creditor] = balances.get(creditor, 0) - amount
-
-        normalized: Dict[User, float] = {}
-        for user, balance in balances.items():
-            if abs(balance) < 0.01:
-                normalized[user] = 0.0
-            else:
-                normalized[user] = round(balance, 2)
+            after[debtor] = after.get(debtor, 0) + amount
+            after[creditor] = after.get(creditor, 0) - amount
 
-        return normalized
+        return self._normalize(after)
 
     def record_settlement(
         self, group_id: int, debtor_id: int, creditor_id: int, amount: float
@@ -129,19 +212,12 @@ class SettlementService:
         if not self._settlement_repo:
             raise ValueError("Settlement repository not configured")
 
-        # Get user details
-        group = self._group_repo.get_by_id(group_id)
-        if not group:
+        if not self._group_repo.exists(group_id):
             raise ValueError("Group not found")
 
-        debtor = None
-        creditor = None
-
-        for member in group.members:
-            if member.id == debtor_id:
-                debtor = member
-            if member.id == creditor_id:
-                creditor = member
+        members = self._group_repo.get_members_by_ids(group_id, [debtor_id, creditor_id])
+        debtor = members.get(debtor_id)
+        creditor = members.get(creditor_id)
 
         if not debtor or not creditor:
             raise ValueError("One or both users not found in group")
@@ -155,7 +231,16 @@ class SettlementService:
             settlement_date=date.today(),
         )
 
-        return self._settlement_repo.save(settlement)
+        if self._tracker:
+            # Keeps concurrent replays from seeding until the delta is applied
+            with self._tracker.writing(group_id):
+                saved = self._settlement_repo.save(settlement)
+                self._tracker.apply_settlement(group_id, saved)
+        else:
+            saved = self._settlement_repo.save(settlement)
+        if self._dirty_groups is not None:
+            self._dirty_groups.mark(group_id)
+        return saved
 
     def get_all_settlements(self, group_id: int) -> list[Settlement]:
         """Get all recorded settlements for a group."""
@@ -164,3 +249,23 @@ class SettlementService:
 
         return self._settlement_repo.get_by_group(group_id)
 
+    def iter_settlements(
+        self, group_id: int, batch_size: Optional[int] = None
+    ) -> Iterator[Settlement]:
+        """Stream recorded settlements for a group, newest first."""
+        if not self._settlement_repo:
+            return iter(())
+
+        return self._settlement_repo.iter_by_group(group_id, batch_size)
+
+    @staticmethod
+    def _normalize(balances: Dict[User, float]) -> Dict[User, float]:
+        """Round balances to cents and snap near-zero values to 0."""
+        normalized: Dict[User, float] = {}
+        for user, balance in balances.items():
+            if abs(balance) < 0.01:
+                normalized[user] = 0.0
+            else:
+                normalized[user] = round(balance, 2)
+
+        return normalized
@@ -36,13 +36,13 @@ class UserService:
             return existing
 
         # Validate name uniqueness (case-insensitive)
-        for user in self._user_repository.get_all():
-            if user.name.strip().lower() == normalized_name.lower():
-                return user
+        existing = self._user_repository.get_by_name(normalized_name)
+        if existing:
+            return existing
 
         user = User(id=None, name=normalized_name, email=normalized_email)
         saved = self._user_repository.save(user)
-        logger.info(f"Creating user: {saved.name} ({saved.email})")
+        logger.info("Creating user: %s (%s)", saved.name, saved.email)
         return saved
 
     def get_user(self, user_id: int) -> User | None:
@@ -53,6 +53,10 @@ class UserService:
         """Return a user by email if found."""
         return self._user_repository.get_by_email(email.strip().lower())
 
+    def get_user_by_name(self, name: str) -> User | None:
+        """Return a user by name (case-insensitive) if found."""
+        return self._user_repository.get_by_name(name.strip())
+
     def list_users(self) -> list[User]:
         """Return all users."""
         return self._user_repository.get_all()
@@ -0,0 +1,309 @@
+"""Run the benchmark scenarios, write JSON results and compare to a baseline.
+
+    python -m benchmarks.run --size small --output results.json \
+        --baseline benchmarks/baseline.json --threshold 0.25
+
+Exits with status 1 when any scenario's median is slower than the
+baseline's by more than the threshold.
+"""
+
+import argparse
+import gc
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Sequence
+from contextlib import ExitStack
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+
+from .scenarios import BACKENDS, Scenario, ScenarioSkipped, build_scenarios
+from .workload import PRESETS, Workload, WorkloadSpec, generate_workload
+
+logger = logging.getLogger(__name__)
+
+# Shortest sample worth timing for read-only scenarios
+_MIN_SAMPLE_SECONDS = 0.05
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """One scenario's current median against its baseline median."""
+
+    name: str
+    baseline_seconds: float | None
+    current_seconds: float
+    status: str  # "ok", "regressed", "improved" or "new"
+
+    @property
+    def ratio(self) -> float | None:
+        """Current over baseline time; above 1 means slower."""
+        if not self.baseline_seconds:
+            return None
+        return self.current_seconds / self.baseline_seconds
+
+
+def time_scenario(
+    scenario: Scenario,
+    workload: Workload,
+    repeat: int,
+    warmup: int,
+    min_sample: float = _MIN_SAMPLE_SECONDS,
+) -> dict[str, float]:
+    """Time a scenario repeat times after warmup untimed runs; values are per call.
+
+    Read-only scenarios call the thunk in a loop sized so each sample takes
+    at least min_sample seconds, which keeps sub-millisecond work measurable.
+    """
+    timings: list[float] = []
+    loops = 1
+
+    with ExitStack() as stack:
+        thunk = None if scenario.per_run_setup else scenario.setup(workload, stack)
+
+        for run in range(warmup + repeat):
+            with ExitStack() as run_stack:
+                if scenario.per_run_setup:
+                    thunk = scenario.setup(workload, run_stack)
+                elif run == 0:
+                    loops = _calibrate(thunk, min_sample)
+                elapsed = _timed(thunk, loops) / loops
+            if run >= warmup:
+                timings.append(elapsed)
+
+    return {
+        "runs": repeat,
+        "loops": loops,
+        "min_s": min(timings),
+        "median_s": statistics.median(timings),
+        "mean_s": statistics.fmean(timings),
+        "max_s": max(timings),
+    }
+
+
+def run_benchmarks(
+    spec: WorkloadSpec,
+    scenarios: Sequence[Scenario],
+    repeat: int = 5,
+    warmup: int = 1,
+    min_sample: float = _MIN_SAMPLE_SECONDS,
+) -> dict[str, dict[str, float]]:
+    """Generate the workload once and time every scenario against it."""
+    workload = generate_workload(spec)
+    results: dict[str, dict[str, float]] = {}
+
+    for scenario in scenarios:
+        try:
+            results[scenario.name] = time_scenario(
+                scenario, workload, repeat, warmup, min_sample
+            )
+        except ScenarioSkipped as exc:
+            logger.warning("Skipping %s: %s", scenario.name, exc)
+            continue
+        logger.info(
+            "%s | median=%.6fs", scenario.name, results[scenario.name]["median_s"]
+        )
+
+    return results
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[Comparison]:
+    """Compare medians; a scenario regresses when slower than baseline * (1 + threshold)."""
+    comparisons = []
+
+    for name, stats in results.items():
+        current = stats["median_s"]
+        previous = baseline.get(name, {}).get("median_s")
+
+        if not previous:
+            status = "new"
+        elif current > previous * (1 + threshold):
+            status = "regressed"
+        elif current < previous * (1 - threshold):
+            status = "improved"
+        else:
+            status = "ok"
+        comparisons.append(Comparison(name, previous, current, status))
+
+    return comparisons
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command-line entry point; returns the process exit status."""
+    args = _parse_args(argv)
+
+    spec = PRESETS[args.size]
+    if args.seed is not None:
+        spec = replace(spec, seed=args.seed)
+
+    scenarios = [
+        scenario
+        for scenario in build_scenarios(args.backends)
+        if not args.filter or any(part in scenario.name for part in args.filter)
+    ]
+    results = run_benchmarks(spec, scenarios, args.repeat, args.warmup)
+
+    report = {
+        "meta": {
+            "size": args.size,
+            # Round-tripped so it compares equal to a spec read back from JSON
+            "spec": json.loads(json.dumps(asdict(spec))),
+            "repeat": args.repeat,
+            "warmup": args.warmup,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+
+    exit_status = 0
+    if args.baseline and not args.update_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["meta"]["spec"] != report["meta"]["spec"]:
+            print(
+                "Baseline was recorded with a different workload; re-record it "
+                "with --update-baseline",
+                file=sys.stderr,
+            )
+            return 2
+
+        comparisons = compare(results, baseline["results"], args.threshold)
+        report["comparison"] = {
+            "baseline": args.baseline,
+            "threshold": args.threshold,
+            "scenarios": {
+                c.name: {"ratio": c.ratio, "status": c.status} for c in comparisons
+            },
+        }
+        _print_comparison(comparisons)
+        if any(c.status == "regressed" for c in comparisons):
+            exit_status = 1
+    else:
+        _print_results(results)
+
+    output = args.baseline if args.update_baseline else args.output
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    return exit_status
+
+
+def _timed(thunk, loops: int = 1) -> float:
+    """Time loops calls with the garbage collector paused, as timeit does."""
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = time.perf_counter()
+        for _ in range(loops):
+            thunk()
+        return time.perf_counter() - started
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+
+def _calibrate(thunk, min_sample: float) -> int:
+    """Return the loop count that makes one sample last at least min_sample."""
+    loops = 1
+    while True:
+        elapsed = _timed(thunk, loops)
+        if elapsed >= min_sample:
+            return loops
+        # Aim a little past the target so the next try usually lands
+        loops = max(loops * 2, int(loops * min_sample * 1.2 / max(elapsed, 1e-9)))
+
+
+def _print_results(results: dict[str, dict[str, float]]) -> None:
+    """Print a median/min table to stderr."""
+    for name, stats in results.items():
+        print(
+            f"{name:<55} median {stats['median_s'] * 1000:10.3f} ms"
+            f"   min {stats['min_s'] * 1000:10.3f} ms",
+            file=sys.stderr,
+        )
+
+
+def _print_comparison(comparisons: list[Comparison]) -> None:
+    """Print current vs baseline medians to stderr."""
+    for c in comparisons:
+        baseline = (
+            f"{c.baseline_seconds * 1000:10.3f} ms" if c.baseline_seconds else " " * 13
+        )
+        change = f"{(c.ratio - 1) * 100:+7.1f}%" if c.ratio is not None else " " * 8
+        print(
+            f"{c.name:<55} {c.current_seconds * 1000:10.3f} ms  vs {baseline}"
+            f"  {change}  {c.status}",
+            file=sys.stderr,
+        )
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Run the expense manager benchmarks.")
+    parser.add_argument(
+        "--size",
+        choices=sorted(PRESETS),
+        default="small",
+        help="workload preset (default: small)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="override the preset's random seed"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="timed runs per scenario (default: 5)"
+    )
+    parser.add_argument(
+        "--warmup", type=int, default=1, help="untimed runs before timing (default: 1)"
+    )
+    parser.add_argument(
+        "--backend",
+        dest="backends",
+        action="append",
+        choices=BACKENDS,
+        help="repository backend to run (repeatable; default: all)",
+    )
+    parser.add_argument(
+        "-k",
+        "--filter",
+        action="append",
+        help="only run scenarios whose name contains this (repeatable)",
+    )
+    parser.add_argument("--output", help="write JSON results here instead of stdout")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown before a regression (default: 0.25 = 25%%)",
+    )
+    parser.add_argument(
+        "--update-baseline",
+        action="store_true",
+        help="write the results to --baseline instead of comparing",
+    )
+    args = parser.parse_args(argv)
+
+    if args.update_baseline and not args.baseline:
+        parser.error("--update-baseline requires --baseline")
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    args.backends = args.backends or list(BACKENDS)
+    return args
+
+
+if __name__ == "__main__":
+    sys.exit(main())
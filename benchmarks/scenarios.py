@@ -0,0 +1,276 @@
+"""Timed benchmark scenarios over a generated workload.
+
+Each scenario's setup builds whatever state it needs (outside the timed
+region) and returns the thunk that gets timed; resources it opens are
+registered on the ExitStack so they are released after the runs.
+"""
+
+import os
+import tempfile
+from collections.abc import Callable, Sequence
+from contextlib import ExitStack
+from dataclasses import dataclass
+
+from app.domain.domain_services.settlement_calculator import SettlementCalculator
+from app.domain.domain_services.settlement_solver import (
+    ExactSettlementSolver,
+    GreedySettlementSolver,
+)
+from app.domain.entities.group import Group
+from app.domain.entities.user import User
+from app.domain.split_strategies.factory import SplitType
+from app.persistence.memory.expense_repo_memory import ExpenseRepositoryMemory
+from app.persistence.memory.group_repo_memory import GroupRepositoryMemory
+from app.persistence.memory.settlement_repo_memory import SettlementRepositoryMemory
+from app.persistence.memory.store import MemoryStore
+from app.persistence.memory.user_repo_memory import UserRepositoryMemory
+from app.persistence.sqlite.db import SQLiteDatabase
+from app.persistence.sqlite.expense_repo_sqlite import ExpenseRepositorySQLite
+from app.persistence.sqlite.group_repo_sqlite import GroupRepositorySQLite
+from app.persistence.sqlite.settlement_repo_sqlite import SettlementRepositorySQLite
+from app.persistence.sqlite.user_repo_sqlite import UserRepositorySQLite
+from app.services.settlement_service import SettlementService
+
+from .workload import Workload, build_expense, build_group, build_settlements
+
+Thunk = Callable[[], object]
+
+BACKENDS = ("memory", "sqlite")
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """A named piece of work to time."""
+
+    name: str
+    setup: Callable[[Workload, ExitStack], Thunk]
+    # Rebuild state before every run, for scenarios that write
+    per_run_setup: bool = False
+
+
+class ScenarioSkipped(Exception):
+    """Raised by a setup whose optional dependency is missing."""
+
+
+def build_scenarios(backends: Sequence[str] = BACKENDS) -> list[Scenario]:
+    """Return every scenario, repository and service ones once per backend."""
+    scenarios = [
+        Scenario("calculator.python.calculate_balances", _python_balances),
+        Scenario("calculator.numpy.calculate_balances", _numpy_balances),
+        Scenario("solver.greedy.solve", _solver(GreedySettlementSolver)),
+        Scenario("solver.exact.solve", _solver(ExactSettlementSolver)),
+    ]
+    scenarios += [
+        Scenario(f"split.{split_type.value}", _split(split_type))
+        for split_type in SplitType
+    ]
+
+    for backend in backends:
+        scenarios += [
+            Scenario(
+                f"repository.{backend}.expense.save_many",
+                _save_many(backend),
+                per_run_setup=True,
+            ),
+            Scenario(
+                f"repository.{backend}.expense.get_by_group",
+                _expense_reads(backend, streaming=False),
+            ),
+            Scenario(
+                f"repository.{backend}.expense.iter_by_group",
+                _expense_reads(backend, streaming=True),
+            ),
+            Scenario(
+                f"repository.{backend}.settlement.get_net_balances",
+                _net_balances(backend),
+            ),
+            Scenario(
+                f"repository.{backend}.settlement.get_net_balances_many",
+                _net_balances(backend, batched=True),
+            ),
+            Scenario(
+                f"repository.{backend}.settlement.iter_all", _settlement_stream(backend)
+            ),
+            Scenario(
+                f"service.{backend}.get_settlement_suggestions", _suggestions(backend)
+            ),
+        ]
+
+    return scenarios
+
+
+def open_repositories(backend: str, stack: ExitStack) -> tuple:
+    """Return fresh (user, group, expense, settlement) repositories."""
+    if backend == "memory":
+        store = MemoryStore()
+        return (
+            UserRepositoryMemory(store),
+            GroupRepositoryMemory(store),
+            ExpenseRepositoryMemory(store),
+            SettlementRepositoryMemory(store),
+        )
+
+    if backend == "sqlite":
+        directory = stack.enter_context(tempfile.TemporaryDirectory())
+        db = SQLiteDatabase(os.path.join(directory, "bench.db"))
+        stack.callback(db.close)
+        return (
+            UserRepositorySQLite(db),
+            GroupRepositorySQLite(db),
+            ExpenseRepositorySQLite(db),
+            SettlementRepositorySQLite(db),
+        )
+
+    raise ValueError(f"Unsupported benchmark backend: {backend}")
+
+
+def seed_repositories(
+    repos: tuple, workload: Workload, with_expenses: bool = True
+) -> tuple[list[User], list[int]]:
+    """Store the workload; return saved users (by workload index) and group ids."""
+    user_repo, group_repo, expense_repo, settlement_repo = repos
+
+    users = [
+        user_repo.save(User(id=None, name=user.name, email=user.email))
+        for user in workload.users
+    ]
+
+    group_ids = []
+    for record in workload.groups:
+        group = Group(group_id=None, name=record.name)
+        for i in record.members:
+            group.add_member(users[i])
+        group_id = group_repo.save(group).id
+        group_ids.append(group_id)
+
+        if with_expenses:
+            expense_repo.save_many(
+                [build_expense(expense, users) for expense in record.expenses],
+                group_id,
+            )
+            for settlement in build_settlements(record, users, group_id):
+                settlement_repo.save(settlement)
+
+    return users, group_ids
+
+
+def _groups(workload: Workload) -> list[Group]:
+    """Materialize every generated group in memory."""
+    return [
+        build_group(record, workload.users, group_id)
+        for group_id, record in enumerate(workload.groups, start=1)
+    ]
+
+
+def _python_balances(workload: Workload, stack: ExitStack) -> Thunk:
+    groups = _groups(workload)
+    calculator = SettlementCalculator()
+    return lambda: [calculator.calculate_balances(group) for group in groups]
+
+
+def _numpy_balances(workload: Workload, stack: ExitStack) -> Thunk:
+    from app.domain.domain_services.vectorized_settlement_calculator import (
+        VectorizedSettlementCalculator,
+    )
+
+    try:
+        calculator = VectorizedSettlementCalculator()
+    except ImportError as exc:
+        raise ScenarioSkipped(str(exc)) from exc
+
+    groups = _groups(workload)
+    return lambda: [calculator.calculate_balances(group) for group in groups]
+
+
+def _solver(solver_class) -> Callable[[Workload, ExitStack], Thunk]:
+    def setup(workload: Workload, stack: ExitStack) -> Thunk:
+        calculator = SettlementCalculator()
+        balances = [calculator.calculate_balances(group) for group in _groups(workload)]
+        solver = solver_class()
+        return lambda: [solver.solve(group_balances) for group_balances in balances]
+
+    return setup
+
+
+def _split(split_type: SplitType) -> Callable[[Workload, ExitStack], Thunk]:
+    def setup(workload: Workload, stack: ExitStack) -> Thunk:
+        expenses = [
+            build_expense(expense, workload.users)
+            for record in workload.groups
+            for expense in record.expenses
+            if expense.split_type == split_type
+        ]
+        return lambda: [expense.split() for expense in expenses]
+
+    return setup
+
+
+def _save_many(backend: str) -> Callable[[Workload, ExitStack], Thunk]:
+    def setup(workload: Workload, stack: ExitStack) -> Thunk:
+        repos = open_repositories(backend, stack)
+        users, group_ids = seed_repositories(repos, workload, with_expenses=False)
+        batches = [
+            ([build_expense(expense, users) for expense in record.expenses], group_id)
+            for record, group_id in zip(workload.groups, group_ids, strict=True)
+        ]
+        expense_repo = repos[2]
+        return lambda: [expense_repo.save_many(*batch) for batch in batches]
+
+    return setup
+
+
+def _expense_reads(
+    backend: str, streaming: bool
+) -> Callable[[Workload, ExitStack], Thunk]:
+    def setup(workload: Workload, stack: ExitStack) -> Thunk:
+        repos = open_repositories(backend, stack)
+        _, group_ids = seed_repositories(repos, workload)
+        expense_repo = repos[2]
+        if streaming:
+            return lambda: [
+                sum(1 for _ in expense_repo.iter_by_group(g)) for g in group_ids
+            ]
+        return lambda: [expense_repo.get_by_group(g) for g in group_ids]
+
+    return setup
+
+
+def _net_balances(
+    backend: str, batched: bool = False
+) -> Callable[[Workload, ExitStack], Thunk]:
+    def setup(workload: Workload, stack: ExitStack) -> Thunk:
+        repos = open_repositories(backend, stack)
+        _, group_ids = seed_repositories(repos, workload)
+        settlement_repo = repos[3]
+        if batched:
+            return lambda: settlement_repo.get_net_balances_many(group_ids)
+        return lambda: [settlement_repo.get_net_balances(g) for g in group_ids]
+
+    return setup
+
+
+def _settlement_stream(backend: str) -> Callable[[Workload, ExitStack], Thunk]:
+    def setup(workload: Workload, stack: ExitStack) -> Thunk:
+        repos = open_repositories(backend, stack)
+        seed_repositories(repos, workload)
+        settlement_repo = repos[3]
+        return lambda: sum(1 for _ in settlement_repo.iter_all())
+
+    return setup
+
+
+def _suggestions(backend: str) -> Callable[[Workload, ExitStack], Thunk]:
+    def setup(workload: Workload, stack: ExitStack) -> Thunk:
+        repos = open_repositories(backend, stack)
+        _, group_ids = seed_repositories(repos, workload)
+        _, group_repo, _, settlement_repo = repos
+        # No running-balance tracker, so every call reads the ledger
+        service = SettlementService(
+            group_repo,
+            SettlementCalculator(),
+            settlement_repo,
+            GreedySettlementSolver(),
+        )
+        return lambda: [service.get_settlement_suggestions(g) for g in group_ids]
+
+    return setup
@@ -0,0 +1,194 @@
+"""Seeded synthetic workloads: users, groups, expenses and settlements."""
+
+import random
+from collections.abc import Sequence
+from dataclasses import dataclass
+
+from app.domain.entities.expense import Expense
+from app.domain.entities.group import Group
+from app.domain.entities.settlement import Settlement
+from app.domain.entities.user import User
+from app.domain.split_strategies.factory import SplitStrategyFactory, SplitType
+
+
+@dataclass(frozen=True)
+class WorkloadSpec:
+    """Shape of a generated workload; the same spec always yields the same data."""
+
+    users: int = 200
+    groups: int = 10
+    group_size: int = 8
+    expenses_per_group: int = 200
+    settlements_per_group: int = 20
+    # Relative weights of equal / percentage / custom splits
+    split_mix: tuple[int, int, int] = (2, 1, 1)
+    seed: int = 42
+
+
+# Named sizes for the runner's --size option
+PRESETS: dict[str, WorkloadSpec] = {
+    "small": WorkloadSpec(
+        users=50,
+        groups=5,
+        group_size=6,
+        expenses_per_group=100,
+        settlements_per_group=10,
+    ),
+    "medium": WorkloadSpec(),
+    "large": WorkloadSpec(
+        users=2000,
+        groups=20,
+        group_size=25,
+        expenses_per_group=2000,
+        settlements_per_group=200,
+    ),
+}
+
+
+@dataclass(frozen=True)
+class ExpenseRecord:
+    """One generated expense; users are indexes into Workload.users."""
+
+    payer: int
+    participants: tuple[int, ...]
+    amount: float
+    split_type: SplitType
+    # Percent or amount per participant index; None for equal splits
+    split_data: dict[int, float] | None
+
+
+@dataclass(frozen=True)
+class SettlementRecord:
+    """One generated settlement between two members."""
+
+    debtor: int
+    creditor: int
+    amount: float
+
+
+@dataclass(frozen=True)
+class GroupRecord:
+    """One generated group with its members, expenses and settlements."""
+
+    name: str
+    members: tuple[int, ...]
+    expenses: tuple[ExpenseRecord, ...]
+    settlements: tuple[SettlementRecord, ...]
+
+
+@dataclass(frozen=True)
+class Workload:
+    """Generated data, independent of any backend."""
+
+    spec: WorkloadSpec
+    users: tuple[User, ...]
+    groups: tuple[GroupRecord, ...]
+
+
+def generate_workload(spec: WorkloadSpec) -> Workload:
+    """Generate a deterministic workload for the spec."""
+    if spec.group_size < 2 or spec.group_size > spec.users:
+        raise ValueError("Group size must be between 2 and the number of users")
+
+    rng = random.Random(spec.seed)
+    users = tuple(
+        User(id=i + 1, name=f"user{i:05d}", email=f"user{i:05d}@bench.example.com")
+        for i in range(spec.users)
+    )
+
+    groups = []
+    for g in range(spec.groups):
+        members = tuple(sorted(rng.sample(range(spec.users), spec.group_size)))
+        expenses = tuple(
+            _expense(rng, members, spec.split_mix)
+            for _ in range(spec.expenses_per_group)
+        )
+        settlements = tuple(
+            _settlement(rng, members) for _ in range(spec.settlements_per_group)
+        )
+        groups.append(GroupRecord(f"group{g:04d}", members, expenses, settlements))
+
+    return Workload(spec=spec, users=users, groups=tuple(groups))
+
+
+def build_expense(record: ExpenseRecord, users: Sequence[User]) -> Expense:
+    """Materialize an expense record against the given users."""
+    participants = [users[i] for i in record.participants]
+    split_data = None
+    if record.split_data is not None:
+        split_data = {users[i]: value for i, value in record.split_data.items()}
+
+    return Expense(
+        expense_id=None,
+        paid_by=users[record.payer],
+        amount=record.amount,
+        participants=participants,
+        split_strategy=SplitStrategyFactory.create(record.split_type, split_data),
+    )
+
+
+def build_group(record: GroupRecord, users: Sequence[User], group_id: int) -> Group:
+    """Materialize a fully loaded in-memory Group for calculator scenarios."""
+    group = Group(group_id=group_id, name=record.name)
+    for i in record.members:
+        group.add_member(users[i])
+    for expense in record.expenses:
+        group.add_expense(build_expense(expense, users))
+    group.mark_members_clean()
+    return group
+
+
+def build_settlements(
+    record: GroupRecord, users: Sequence[User], group_id: int
+) -> list[Settlement]:
+    """Materialize a group's settlement records."""
+    return [
+        Settlement(None, group_id, users[s.debtor], users[s.creditor], s.amount)
+        for s in record.settlements
+    ]
+
+
+def _expense(
+    rng: random.Random, members: tuple[int, ...], split_mix: tuple[int, int, int]
+) -> ExpenseRecord:
+    """Draw one expense among the members."""
+    payer = rng.choice(members)
+    participants = tuple(sorted(rng.sample(members, rng.randint(2, len(members)))))
+    split_type = rng.choices(
+        (SplitType.EQUAL, SplitType.PERCENTAGE, SplitType.CUSTOM), weights=split_mix
+    )[0]
+
+    if split_type == SplitType.EQUAL:
+        # Whole cents per head so stored shares add back up to the amount
+        cents = rng.randint(1, 500) * 100 * len(participants)
+        return ExpenseRecord(payer, participants, cents / 100, split_type, None)
+
+    cents = rng.randint(100, 50000)
+    weights = [rng.randint(1, 10) for _ in participants]
+
+    if split_type == SplitType.PERCENTAGE:
+        values = _apportion(10000, weights)  # basis points of 100%
+    else:
+        values = _apportion(cents, weights)
+
+    return ExpenseRecord(
+        payer,
+        participants,
+        cents / 100,
+        split_type,
+        {i: value / 100 for i, value in zip(participants, values, strict=True)},
+    )
+
+
+def _settlement(rng: random.Random, members: tuple[int, ...]) -> SettlementRecord:
+    """Draw one settlement between two distinct members."""
+    debtor, creditor = rng.sample(members, 2)
+    return SettlementRecord(debtor, creditor, rng.randint(100, 20000) / 100)
+
+
+def _apportion(total: int, weights: list[int]) -> list[int]:
+    """Split an integer total by weights, giving the remainder to the first slot."""
+    weight_sum = sum(weights)
+    parts = [total * w // weight_sum for w in weights]
+    parts[0] += total - sum(parts)
+    return parts
@@ -1,5 +1,6 @@
 -- Re-runnable init (drops in dependency order)
 -- Creates core tables for users, groups, expenses, and splits
+DROP TABLE IF EXISTS group_balances;
 DROP TABLE IF EXISTS settlements;
 DROP TABLE IF EXISTS expense_splits;
 DROP TABLE IF EXISTS expenses;
@@ -7,18 +8,29 @@ DROP TABLE IF EXISTS group_members;
 DROP TABLE IF EXISTS expense_groups;
 DROP TABLE IF EXISTS users;
 
+-- name_key/email_key hold the trimmed, lower-cased values the app compares
+-- on, so uniqueness checks are single index probes.
 CREATE TABLE users (
   id INT UNSIGNED NOT NULL AUTO_INCREMENT,
   name VARCHAR(100) NOT NULL,
   email VARCHAR(255) NOT NULL,
+  name_key VARCHAR(100) AS (LOWER(TRIM(name))) STORED,
+  email_key VARCHAR(255) AS (LOWER(TRIM(email))) STORED,
   PRIMARY KEY (id),
-  UNIQUE KEY uniq_user_email (email)
+  UNIQUE KEY uniq_user_name_key (name_key),
+  UNIQUE KEY uniq_user_email_key (email_key)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
+-- version/updated_at are bumped in the same transaction as every write to
+-- the group, so readers can find changed groups since a watermark.
 CREATE TABLE expense_groups (
   id INT UNSIGNED NOT NULL AUTO_INCREMENT,
   name VARCHAR(100) NOT NULL,
-  PRIMARY KEY (id)
+  version BIGINT UNSIGNED NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6)
+    ON UPDATE CURRENT_TIMESTAMP(6),
+  PRIMARY KEY (id),
+  KEY idx_groups_updated_at (updated_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
 
 CREATE TABLE group_members (
@@ -91,3 +103,19 @@ CREATE TABLE settlements (
   INDEX idx_settlements_group (group_id),
   INDEX idx_settlements_date (settlement_date)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
+
+-- Running net balance per group member in cents, updated in the same
+-- transaction as every expense/settlement insert. in_expenses marks users
+-- who appear in the group's expenses (only those are reported).
+-- Rebuild/verify with: python -m app.interface.ledger rebuild|verify
+CREATE TABLE group_balances (
+  group_id INT UNSIGNED NOT NULL,
+  user_id INT UNSIGNED NOT NULL,
+  net_cents BIGINT NOT NULL DEFAULT 0,
+  in_expenses TINYINT(1) NOT NULL DEFAULT 0,
+  PRIMARY KEY (group_id, user_id),
+  CONSTRAINT fk_group_balances_group
+    FOREIGN KEY (group_id) REFERENCES expense_groups(id) ON DELETE CASCADE,
+  CONSTRAINT fk_group_balances_user
+    FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4;
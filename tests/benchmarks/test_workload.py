@@ -0,0 +1,50 @@
+"""Tests for the benchmark workload generator and baseline comparison."""
+
+import pytest
+
+from app.domain.split_strategies.factory import SplitType
+from benchmarks.run import compare
+from benchmarks.workload import WorkloadSpec, build_expense, generate_workload
+
+SPEC = WorkloadSpec(
+    users=20,
+    groups=3,
+    group_size=5,
+    expenses_per_group=60,
+    settlements_per_group=5,
+    seed=7,
+)
+
+
+def test_same_seed_generates_same_workload():
+    """Verify the generator is deterministic per seed."""
+    assert generate_workload(SPEC) == generate_workload(SPEC)
+    assert generate_workload(SPEC) != generate_workload(
+        WorkloadSpec(**{**SPEC.__dict__, "seed": 8})
+    )
+
+
+def test_generated_expenses_split_cleanly():
+    """Verify every generated expense splits without a validation error."""
+    workload = generate_workload(SPEC)
+    expenses = [e for group in workload.groups for e in group.expenses]
+
+    assert {e.split_type for e in expenses} == set(SplitType)
+    for record in expenses:
+        expense = build_expense(record, workload.users)
+        assert sum(expense.split().values()) == pytest.approx(expense.amount, abs=0.01)
+
+
+def test_compare_flags_slowdowns_beyond_threshold():
+    """Verify regression, improvement and new-scenario statuses."""
+    baseline = {"a": {"median_s": 1.0}, "b": {"median_s": 1.0}, "c": {"median_s": 1.0}}
+    results = {
+        "a": {"median_s": 1.3},
+        "b": {"median_s": 0.7},
+        "c": {"median_s": 1.1},
+        "d": {"median_s": 1.0},
+    }
+
+    statuses = {c.name: c.status for c in compare(results, baseline, threshold=0.2)}
+
+    assert statuses == {"a": "regressed", "b": "improved", "c": "ok", "d": "new"}
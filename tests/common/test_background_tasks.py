@@ -0,0 +1,224 @@
+"""Tests for the background balance logger."""
+
+import asyncio
+import threading
+import time
+from datetime import datetime
+from unittest.mock import Mock
+
+from app.bootstrap.container import build_services
+from app.common.background_tasks import BalanceLogger
+from app.common.config import AppConfig
+from app.common.dirty_groups import DirtyGroups
+from app.domain.entities.group import GroupVersion
+from app.domain.split_strategies.factory import SplitType
+
+T0 = datetime(2026, 1, 1, 12, 0, 0)
+
+
+def _groups(count, version=0):
+    return [GroupVersion(i, f"g{i}", version, T0) for i in range(1, count + 1)]
+
+
+def _empty_balances(group_ids, fresh=False):
+    return {group_id: {} for group_id in group_ids}
+
+
+def test_cycle_runs_every_batch_with_bounded_concurrency():
+    """Verify all groups are logged and at most `concurrency` batches run at once."""
+    lock = threading.Lock()
+    running = {"now": 0, "peak": 0}
+
+    def get_balances_many(group_ids, fresh=False):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+        time.sleep(0.01)
+        with lock:
+            running["now"] -= 1
+        return _empty_balances(group_ids)
+
+    group_repo = Mock()
+    group_repo.get_versions_since.return_value = _groups(12)
+    settlement_service = Mock()
+    settlement_service.get_balances_many.side_effect = get_balances_many
+
+    balance_logger = BalanceLogger(
+        settlement_service, group_repo, concurrency=3, batch_size=1
+    )
+    try:
+        stats = asyncio.run(balance_logger.run_cycle())
+    finally:
+        balance_logger.close()
+
+    assert (stats.groups, stats.succeeded, stats.failed) == (12, 12, 0)
+    assert running["peak"] <= 3
+    assert settlement_service.get_balances_many.call_count == 12
+
+
+def test_groups_are_read_in_batches():
+    """Verify one balance query covers a whole batch of groups."""
+    group_repo = Mock()
+    group_repo.get_versions_since.return_value = _groups(12)
+    settlement_service = Mock()
+    # Group 12 was deleted after the scan
+    settlement_service.get_balances_many.side_effect = (
+        lambda group_ids, fresh=False: _empty_balances(i for i in group_ids if i != 12)
+    )
+
+    balance_logger = BalanceLogger(settlement_service, group_repo, batch_size=5)
+    try:
+        stats = asyncio.run(balance_logger.run_cycle())
+    finally:
+        balance_logger.close()
+
+    calls = settlement_service.get_balances_many.call_args_list
+    assert all(c.kwargs == {"fresh": True} for c in calls)
+    batches = [c.args[0] for c in calls]
+    assert sorted(map(tuple, batches)) == [(1, 2, 3, 4, 5), (6, 7, 8, 9, 10), (11, 12)]
+    assert (stats.groups, stats.succeeded) == (12, 12)
+
+
+def test_slow_group_times_out_and_is_skipped_while_running():
+    """Verify a timed-out group is reported and not restarted by the next cycle."""
+    release = threading.Event()
+
+    def get_balances_many(group_ids, fresh=False):
+        if group_ids == [1]:
+            release.wait(5)
+        if group_ids == [2]:
+            raise RuntimeError("db down")
+        return _empty_balances(group_ids)
+
+    group_repo = Mock()
+    group_repo.get_versions_since.return_value = _groups(3)
+    settlement_service = Mock()
+    settlement_service.get_balances_many.side_effect = get_balances_many
+
+    balance_logger = BalanceLogger(
+        settlement_service, group_repo, concurrency=2, group_timeout=0.05, batch_size=1
+    )
+
+    async def two_cycles():
+        first = await balance_logger.run_cycle()
+        second = await balance_logger.run_cycle()
+        release.set()
+        return first, second
+
+    try:
+        first, second = asyncio.run(two_cycles())
+    finally:
+        balance_logger.close()
+
+    assert (first.succeeded, first.failed, first.timed_out) == (1, 1, 1)
+    # Only the failed and still-running groups are retried
+    assert (second.groups, second.skipped, second.failed) == (2, 1, 1)
+
+
+def test_only_changed_or_marked_groups_are_recomputed():
+    """Verify idle groups are skipped and version bumps or marks bring them back."""
+    group_repo = Mock()
+    group_repo.get_versions_since.return_value = _groups(3)
+    settlement_service = Mock()
+    settlement_service.get_balances_many.side_effect = _empty_balances
+    dirty = DirtyGroups()
+
+    balance_logger = BalanceLogger(settlement_service, group_repo, dirty_groups=dirty)
+
+    async def cycles():
+        first = await balance_logger.run_cycle()
+        idle = await balance_logger.run_cycle()
+
+        group_repo.get_versions_since.return_value = [
+            GroupVersion(2, "g2", 1, T0.replace(second=1))
+        ]
+        dirty.mark(3)
+        changed = await balance_logger.run_cycle()
+        return first, idle, changed
+
+    try:
+        first, idle, changed = asyncio.run(cycles())
+    finally:
+        balance_logger.close()
+
+    assert (first.groups, idle.groups, changed.groups) == (3, 0, 2)
+    assert group_repo.get_versions_since.call_args_list[0].args == (None,)
+    # Later scans start just behind the highest updated_at seen
+    assert group_repo.get_versions_since.call_args_list[1].args[0] < T0
+    batches = [c.args[0] for c in settlement_service.get_balances_many.call_args_list]
+    assert batches[0] == [1, 2, 3]
+    assert sorted(batches[1]) == [2, 3]
+
+
+def test_cycles_finish_while_every_worker_is_hung():
+    """Verify a pool full of hung batches neither stalls the scan nor the cycle."""
+    release = threading.Event()
+
+    def get_balances_many(group_ids, fresh=False):
+        if group_ids == [1]:
+            release.wait(5)
+        return _empty_balances(group_ids)
+
+    group_repo = Mock()
+    group_repo.get_versions_since.return_value = _groups(2)
+    settlement_service = Mock()
+    settlement_service.get_balances_many.side_effect = get_balances_many
+
+    balance_logger = BalanceLogger(
+        settlement_service, group_repo, concurrency=1, group_timeout=0.05, batch_size=1
+    )
+
+    async def two_cycles():
+        first = await balance_logger.run_cycle()
+        second = await balance_logger.run_cycle()
+        return first, second
+
+    try:
+        first, second = asyncio.run(asyncio.wait_for(two_cycles(), 2))
+    finally:
+        release.set()
+        balance_logger.close()
+
+    # Group 1 holds the only worker, so group 2 never gets a slot
+    assert (first.timed_out, first.skipped) == (1, 1)
+    assert (second.groups, second.skipped) == (2, 2)
+
+
+def test_writes_from_another_process_are_logged_fresh(tmp_path, caplog):
+    """Verify a group written by another process is logged from the ledger."""
+    config = AppConfig(db_backend="sqlite", sqlite_path=str(tmp_path / "app.db"))
+    local, other = build_services(config), build_services(config)
+
+    sam = local["user"].create_user("sam", "sam@example.com")
+    ria = local["user"].create_user("ria", "ria@example.com")
+    group = local["group"].create_group("goa")
+    local["group"].add_member(group.id, sam.id)
+    local["group"].add_member(group.id, ria.id)
+    local["expense"].add_expense(
+        group.id, sam.id, [sam.id, ria.id], 50, SplitType.EQUAL
+    )
+
+    balance_logger = BalanceLogger(
+        local["settlement"], local["group_repo"], dirty_groups=local["dirty_groups"]
+    )
+
+    async def cycles():
+        await balance_logger.run_cycle()
+        other["expense"].add_expense(
+            group.id, ria.id, [sam.id, ria.id], 30, SplitType.EQUAL
+        )
+        caplog.clear()
+        return await balance_logger.run_cycle()
+
+    try:
+        with caplog.at_level("INFO"):
+            changed = asyncio.run(cycles())
+    finally:
+        balance_logger.close()
+
+    assert (changed.groups, changed.succeeded) == (1, 1)
+    lines = [r.getMessage() for r in caplog.records if r.name.endswith(".groups")]
+    assert lines == [f"[Group: goa | {group.id}] Balances → sam: 10.00, ria: -10.00"]
+    # The stale tracked copy was dropped, not reported as drift
+    assert not any("drifted" in r.getMessage() for r in caplog.records)
+    assert local["settlement"].get_balances(group.id) == {sam: 10.0, ria: -10.0}
@@ -0,0 +1,73 @@
+"""Tests for the queued logging setup."""
+
+import json
+import logging
+import os
+import time
+
+import pytest
+
+from app.common import logger as app_logger
+from app.common.logger import RateLimitFilter, setup_logging, stop_logging
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    """Point the log files at a temporary directory and restore the root logger."""
+    monkeypatch.setattr(app_logger, "LOG_DIR", str(tmp_path))
+    monkeypatch.setattr(app_logger, "LOG_FILE", os.path.join(tmp_path, "app.log"))
+    monkeypatch.setattr(
+        app_logger, "SLOW_QUERY_LOG_FILE", os.path.join(tmp_path, "slow_queries.log")
+    )
+    root = logging.getLogger()
+    saved = root.handlers[:], root.level
+    yield tmp_path
+    stop_logging()
+    root.handlers[:], root.level = saved
+
+
+def _lines(path):
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_records_are_written_as_json_by_the_listener(log_dir):
+    """Verify records reach the files as JSON once the queue is drained."""
+    setup_logging("json")
+    logging.getLogger("app.test").info("Saved %s | group=%s", "expense", 7)
+    logging.getLogger(app_logger.SLOW_QUERY_LOGGER).warning("%.1f ms | slow", 250.0)
+    try:
+        raise RuntimeError("db down")
+    except RuntimeError:
+        logging.getLogger("app.test").exception("Recompute failed")
+    stop_logging()
+
+    records = _lines(log_dir / "app.log")
+    assert records[1]["message"] == "Saved expense | group=7"
+    assert records[1]["name"] == "app.test"
+    assert records[1]["levelname"] == "INFO"
+    assert "RuntimeError: db down" in records[2]["exc_info"]
+    # Slow queries stay in their own file
+    assert [r["message"] for r in _lines(log_dir / "slow_queries.log")] == [
+        "250.0 ms | slow"
+    ]
+    assert all("slow" not in r["message"] for r in records)
+
+
+def test_rate_limit_drops_excess_and_reports_the_count():
+    """Verify records over the budget are dropped and counted on the next pass."""
+    limiter = RateLimitFilter(rate=2, per=0.05)
+
+    def record(group_id):
+        return logging.LogRecord(
+            "app.test", logging.INFO, __file__, 1, "Group %s", (group_id,), None
+        )
+
+    passed = [limiter.filter(record(i)) for i in range(5)]
+    assert passed == [True, True, False, False, False]
+
+    time.sleep(0.06)
+    next_record = record(6)
+    assert limiter.filter(next_record)
+    assert next_record.getMessage() == "Group 6 (3 similar suppressed)"
+    assert next_record.suppressed == 3
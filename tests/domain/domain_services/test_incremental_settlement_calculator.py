@@ -0,0 +1,105 @@
+"""Tests for incremental settlement calculator."""
+
+from app.domain.domain_services.incremental_settlement_calculator import (
+    IncrementalSettlementCalculator,
+)
+from app.domain.entities.expense import Expense
+from app.domain.entities.group import Group
+from app.domain.entities.settlement import Settlement
+from app.domain.entities.user import User
+from app.domain.split_strategies.equal import EqualSplitStrategy
+
+BOB = User(id=2, name="Bob", email="bob@example.com")
+
+
+def test_deltas_match_full_replay(user_a):
+    """Verify applied writes give the same balances as a full replay."""
+    group = Group(group_id=1, name="goa")
+    calculator = IncrementalSettlementCalculator()
+    calculator.seed(1, calculator.calculate_balances(group))
+
+    first = Expense(1, user_a, 100, [user_a, BOB], EqualSplitStrategy())
+    second = Expense(2, BOB, 40, [user_a, BOB], EqualSplitStrategy())
+    for expense in (first, second):
+        group.add_expense(expense)
+        calculator.apply_expense(1, expense)
+
+    assert calculator.get_balances(1) == calculator.calculate_balances(group)
+
+    settlement = Settlement(None, 1, BOB, user_a, 30)
+    calculator.apply_settlement(1, settlement)
+    assert calculator.get_balances(1) == {user_a: 0, BOB: 0}
+
+    calculator.revert_settlement(1, settlement)
+    calculator.revert_expense(1, second)
+    assert calculator.get_balances(1) == {user_a: 50, BOB: -50}
+
+
+def test_untracked_and_stale_groups_need_replay(user_a):
+    """Verify writes to untracked groups are ignored and old state expires."""
+    now = [0.0]
+    calculator = IncrementalSettlementCalculator(
+        replay_interval=10, clock=lambda: now[0]
+    )
+
+    calculator.apply_expense(1, Expense(1, user_a, 10, [user_a], EqualSplitStrategy()))
+    assert calculator.get_balances(1) is None
+
+    calculator.seed(1, {user_a: 0.0})
+    assert calculator.get_balances(1) == {user_a: 0.0}
+
+    now[0] = 10.0
+    assert calculator.get_balances(1) is None
+
+
+def test_replay_racing_a_write_is_not_seeded(user_a):
+    """Verify a replay that may have missed a write leaves the group untracked."""
+    calculator = IncrementalSettlementCalculator()
+
+    token = calculator.replay_token(1)
+    calculator.apply_expense(
+        1, Expense(1, user_a, 10, [user_a, BOB], EqualSplitStrategy())
+    )
+    calculator.seed(1, {user_a: 0.0}, token)
+
+    assert calculator.get_balances(1) is None
+
+
+def test_seed_reports_drift(user_a):
+    """Verify reseeding returns differences from the tracked balances."""
+    calculator = IncrementalSettlementCalculator()
+    calculator.seed(1, {user_a: 5.0, BOB: -5.0})
+
+    drift = calculator.seed(1, {user_a: 4.0, BOB: -5.0})
+
+    assert drift == {user_a: 1.0}
+
+
+def test_deltas_are_rounded_to_cents_like_the_ledger(user_a):
+    """Verify uneven splits are tracked in cents, so a ledger reseed finds no drift."""
+    carl = User(id=3, name="Carl", email="carl@example.com")
+    calculator = IncrementalSettlementCalculator()
+    calculator.seed(1, {})
+
+    for expense_id in range(1, 4):
+        calculator.apply_expense(
+            1,
+            Expense(expense_id, user_a, 10, [user_a, BOB, carl], EqualSplitStrategy()),
+        )
+
+    # The ledger stores each 3.333... share as 3.33
+    assert calculator.seed(1, {user_a: 20.01, BOB: -9.99, carl: -9.99}) == {}
+
+
+def test_replay_during_a_write_is_not_seeded(user_a):
+    """Verify a replay taken while a write is in progress leaves the group untracked."""
+    calculator = IncrementalSettlementCalculator()
+
+    with calculator.writing(1):
+        token = calculator.replay_token(1)
+        calculator.seed(1, {user_a: 0.0}, token)
+        assert calculator.get_balances(1) is None
+
+    token = calculator.replay_token(1)
+    calculator.seed(1, {user_a: 0.0}, token)
+    assert calculator.get_balances(1) == {user_a: 0.0}
@@ -0,0 +1,113 @@
+"""Tests for settlement solvers."""
+
+import pytest
+
+from app.domain.domain_services.settlement_solver import (
+    ExactSettlementSolver,
+    GreedySettlementSolver,
+    SettlementSolution,
+    SettlementSolver,
+)
+from app.domain.entities.user import User
+
+
+def _users(count):
+    return [
+        User(id=i, name=f"U{i}", email=f"u{i}@example.com") for i in range(1, count + 1)
+    ]
+
+
+def _settles(balances, transfers):
+    remaining = dict(balances)
+    for debtor, creditor, amount in transfers:
+        remaining[debtor] += amount
+        remaining[creditor] -= amount
+    return all(abs(value) <= 0.011 for value in remaining.values())
+
+
+def test_exact_solver_beats_greedy():
+    """Verify zero-sum subsets are settled separately with fewer transfers."""
+    a, b, c, d, e, f = _users(6)
+    balances = {a: 3.0, b: 3.0, c: 9.0, d: -4.0, e: -5.0, f: -6.0}
+
+    greedy = GreedySettlementSolver().solve(balances)
+    exact = ExactSettlementSolver().solve(balances)
+
+    assert exact.mode == "exact"
+    assert len(exact.transfers) == 4
+    assert len(exact.transfers) < len(greedy.transfers)
+    assert _settles(balances, exact.transfers)
+
+
+def test_exact_solver_falls_back_when_over_budget():
+    """Verify the greedy plan is returned once the time budget is spent."""
+    ticks = iter(range(0, 10_000, 10))
+    solver = ExactSettlementSolver(time_budget=1, clock=lambda: next(ticks))
+    amounts = [2, 3, 5, 7, 11, 17, -1, -4, -6, -8, -10, -16]
+    balances = {
+        user: float(amount) for user, amount in zip(_users(12), amounts, strict=False)
+    }
+
+    solution = solver.solve(balances)
+
+    assert solution.mode == "greedy"
+    assert solution.transfers == GreedySettlementSolver().solve(balances).transfers
+
+
+def test_exact_solver_skips_large_groups():
+    """Verify groups above the size cap use the greedy plan."""
+    users = _users(4)
+    balances = {users[0]: 10.0, users[1]: -4.0, users[2]: -3.0, users[3]: -3.0}
+
+    solution = ExactSettlementSolver(max_balances=3).solve(balances)
+
+    assert solution.mode == "greedy"
+
+
+def test_exact_solver_rejects_caps_too_large_to_allocate():
+    """Verify caps whose 2^n DP tables would not fit in memory are refused."""
+    with pytest.raises(ValueError, match="at most 22"):
+        ExactSettlementSolver(max_balances=25)
+
+
+def test_exact_solver_delegates_to_its_fallback():
+    """Verify skipped groups get the plan of the solver it holds."""
+
+    class Fixed(SettlementSolver):
+        def solve(self, balances):
+            return SettlementSolution([], "fixed")
+
+    users = _users(4)
+    balances = {users[0]: 10.0, users[1]: -4.0, users[2]: -3.0, users[3]: -3.0}
+
+    solution = ExactSettlementSolver(max_balances=3, fallback=Fixed()).solve(balances)
+
+    assert solution.mode == "fixed"
+
+
+def test_exact_solver_only_runs_the_fallback_when_returning_it():
+    """Verify solved groups never pay for the fallback plan."""
+    calls = []
+
+    class Counting(SettlementSolver):
+        def solve(self, balances):
+            calls.append(balances)
+            return GreedySettlementSolver().solve(balances)
+
+    a, b, c, d, e, f = _users(6)
+    balances = {a: 3.0, b: 3.0, c: 9.0, d: -4.0, e: -5.0, f: -6.0}
+
+    solution = ExactSettlementSolver(fallback=Counting()).solve(balances)
+
+    assert solution.mode == "exact"
+    assert calls == []
+
+
+def test_exact_solver_default_cap_fits_the_default_budget():
+    """Verify groups the default budget cannot finish skip the search outright."""
+    amounts = [float(i) for i in range(1, 17)] + [-136.0]
+    balances = dict(zip(_users(17), amounts, strict=True))
+
+    solver = ExactSettlementSolver(clock=lambda: pytest.fail("search started"))
+
+    assert solver.solve(balances).mode == "greedy"
@@ -0,0 +1,128 @@
+"""Tests for the NumPy settlement calculator."""
+
+import pytest
+
+from app.domain.domain_services.settlement_calculator import SettlementCalculator
+from app.domain.entities.expense import Expense
+from app.domain.entities.group import Group
+from app.domain.entities.user import User
+from app.domain.split_strategies.custom import CustomSplitStrategy
+from app.domain.split_strategies.equal import EqualSplitStrategy
+from app.domain.split_strategies.percentage import PercentageSplitStrategy
+from app.persistence.memory.expense_repo_memory import ExpenseRepositoryMemory
+from app.persistence.memory.group_repo_memory import GroupRepositoryMemory
+from app.persistence.memory.settlement_repo_memory import SettlementRepositoryMemory
+from app.persistence.memory.store import MemoryStore
+from app.persistence.memory.user_repo_memory import UserRepositoryMemory
+from app.persistence.sqlite.db import SQLiteDatabase
+from app.persistence.sqlite.expense_repo_sqlite import ExpenseRepositorySQLite
+from app.persistence.sqlite.group_repo_sqlite import GroupRepositorySQLite
+from app.persistence.sqlite.settlement_repo_sqlite import SettlementRepositorySQLite
+from app.persistence.sqlite.user_repo_sqlite import UserRepositorySQLite
+
+pytest.importorskip("numpy")
+
+from app.domain.domain_services.vectorized_settlement_calculator import (  # noqa: E402
+    VectorizedSettlementCalculator,
+)
+
+
+def test_matches_python_calculator(user_a):
+    """Verify vectorized balances equal the reference calculator exactly."""
+    bob = User(id=2, name="Bob", email="bob@example.com")
+    carol = User(id=3, name="Carol", email="carol@example.com")
+
+    group = Group(group_id=1, name="goa")
+    group.add_expense(
+        Expense(1, user_a, 100, [user_a, bob, carol], EqualSplitStrategy())
+    )
+    group.add_expense(
+        Expense(
+            2,
+            bob,
+            90,
+            [user_a, carol],
+            PercentageSplitStrategy({user_a: 30, carol: 70}),
+        )
+    )
+    group.add_expense(
+        Expense(
+            3,
+            carol,
+            40.5,
+            [bob, carol],
+            CustomSplitStrategy({bob: 10.25, carol: 30.25}),
+        )
+    )
+
+    expected = SettlementCalculator().calculate_balances(group)
+    actual = VectorizedSettlementCalculator().calculate_balances(group)
+
+    assert actual == expected
+    assert list(actual) == list(expected)
+
+
+def test_empty_group_has_no_balances():
+    """Verify a group without expenses returns an empty mapping."""
+    group = Group(group_id=1, name="goa")
+
+    assert VectorizedSettlementCalculator().calculate_balances(group) == {}
+
+
+def _memory_repositories(tmp_path):
+    store = MemoryStore()
+    return (
+        UserRepositoryMemory(store),
+        GroupRepositoryMemory(store),
+        ExpenseRepositoryMemory(store),
+        SettlementRepositoryMemory(store),
+    )
+
+
+def _sqlite_repositories(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "app.db"))
+    return (
+        UserRepositorySQLite(db),
+        GroupRepositorySQLite(db),
+        ExpenseRepositorySQLite(db),
+        SettlementRepositorySQLite(db),
+    )
+
+
+@pytest.mark.parametrize("repositories", [_memory_repositories, _sqlite_repositories])
+def test_unloaded_groups_are_read_from_stored_split_rows(repositories, tmp_path):
+    """Verify stored rows give the ledger's balances without building expenses."""
+    user_repo, group_repo, expense_repo, settlement_repo = repositories(tmp_path)
+    sam, ria, joe = (
+        user_repo.save(User(None, name, f"{name}@example.com"))
+        for name in ("sam", "ria", "joe")
+    )
+    group = Group(None, "goa")
+    for user in (sam, ria, joe):
+        group.add_member(user)
+    group_id = group_repo.save(group).id
+
+    expense_repo.save_many(
+        [
+            Expense(None, sam, 100, [sam, ria, joe], EqualSplitStrategy()),
+            Expense(
+                None, ria, 90, [sam, joe], PercentageSplitStrategy({sam: 30, joe: 70})
+            ),
+            Expense(
+                None,
+                joe,
+                40.5,
+                [ria, joe],
+                CustomSplitStrategy({ria: 10.25, joe: 30.25}),
+            ),
+        ],
+        group_id,
+    )
+
+    stored = group_repo.get_by_id(group_id)
+    actual = VectorizedSettlementCalculator(expense_repo).calculate_balances(stored)
+
+    assert not stored.expenses_loaded
+    assert actual == pytest.approx(settlement_repo.get_net_balances(group_id))
+    # Same key order as SettlementCalculator: split rows first, then the payer
+    assert list(actual) == [sam, ria, joe]
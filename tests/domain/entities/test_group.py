@@ -0,0 +1,113 @@
+"""Tests for group entity."""
+
+import pytest
+
+from app.domain.entities.expense import Expense
+from app.domain.entities.group import Group
+from app.domain.entities.user import User
+from app.domain.split_strategies.equal import EqualSplitStrategy
+
+
+def test_expenses_load_lazily_once(user_a):
+    """Verify the expense loader runs only on first access."""
+    calls = []
+    stored = Expense(
+        expense_id=1,
+        paid_by=user_a,
+        amount=50,
+        participants=[user_a],
+        split_strategy=EqualSplitStrategy(),
+    )
+
+    def loader():
+        calls.append(1)
+        return [stored]
+
+    group = Group(group_id=1, name="goa", expenses_loader=loader)
+    group.add_member(user_a)
+
+    assert not calls
+    assert not group.expenses_loaded
+
+    new = Expense(
+        expense_id=2,
+        paid_by=user_a,
+        amount=20,
+        participants=[user_a],
+        split_strategy=EqualSplitStrategy(),
+    )
+    group.add_expense(new)
+
+    assert group.expenses == [stored, new]
+    assert group.expenses == [stored, new]
+    assert len(calls) == 1
+
+
+def test_membership_changes_are_tracked(user_a):
+    """Verify only unsaved membership changes are reported."""
+    bob = User(id=2, name="Bob", email="bob@example.com")
+    carol = User(id=3, name="Carol", email="carol@example.com")
+
+    group = Group(group_id=1, name="goa")
+    group.add_member(user_a)
+    group.add_member(bob)
+    group.mark_members_clean()
+
+    group.add_member(carol)
+    group.remove_member(bob)
+    assert group.pending_member_changes() == ([carol], [bob])
+
+    group.remove_member(carol)
+    group.add_member(bob)
+    assert group.pending_member_changes() == ([], [])
+
+
+def test_expense_added_and_persisted_before_load_appears_once(user_a):
+    """Verify an in-memory expense also returned by the loader is not duplicated."""
+    saved = Expense(
+        expense_id=1,
+        paid_by=user_a,
+        amount=50,
+        participants=[user_a],
+        split_strategy=EqualSplitStrategy(),
+    )
+    unsaved = Expense(
+        expense_id=None,
+        paid_by=user_a,
+        amount=20,
+        participants=[user_a],
+        split_strategy=EqualSplitStrategy(),
+    )
+
+    group = Group(group_id=1, name="goa", expenses_loader=lambda: [saved])
+    group.add_expense(saved)
+    group.add_expense(unsaved)
+
+    assert group.expenses == [saved, unsaved]
+
+
+def test_failed_expense_load_is_retried(user_a):
+    """Verify a loader that raises leaves the group unloaded for the next access."""
+    stored = Expense(
+        expense_id=1,
+        paid_by=user_a,
+        amount=50,
+        participants=[user_a],
+        split_strategy=EqualSplitStrategy(),
+    )
+    results = [RuntimeError("pool checkout timed out"), [stored]]
+
+    def loader():
+        result = results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    group = Group(group_id=1, name="goa", expenses_loader=loader)
+
+    with pytest.raises(RuntimeError):
+        _ = group.expenses
+    assert not group.expenses_loaded
+
+    assert group.expenses == [stored]
+    assert group.expenses_loaded
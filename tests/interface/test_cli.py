@@ -0,0 +1,43 @@
+"""Tests for running the blocking menu off the event loop."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.interface.cli import run_in_daemon_thread
+
+
+def test_event_loop_keeps_running_while_menu_blocks():
+    """Verify background tasks get turns while the blocking call waits."""
+    release = threading.Event()
+    ticks = []
+
+    async def background():
+        while True:
+            ticks.append(1)
+            if len(ticks) == 3:
+                release.set()
+            await asyncio.sleep(0.01)
+
+    async def scenario():
+        task = asyncio.create_task(background())
+        result = await run_in_daemon_thread(lambda: release.wait(5) and "done")
+        task.cancel()
+        return result
+
+    assert asyncio.run(scenario()) == "done"
+    assert len(ticks) >= 3
+
+
+def test_exceptions_from_the_thread_propagate():
+    """Verify errors raised in the thread surface to the awaiting coroutine."""
+
+    def boom():
+        raise ValueError("bad input")
+
+    async def scenario():
+        await run_in_daemon_thread(boom)
+
+    with pytest.raises(ValueError, match="bad input"):
+        asyncio.run(scenario())
@@ -0,0 +1,136 @@
+"""Tests for the MySQL group_balances ledger and its maintenance command."""
+
+import pytest
+
+from app.interface import ledger as ledger_cli
+from app.persistence.mysql.balance_ledger import (
+    BalanceLedgerMySQL,
+    LedgerMismatch,
+    apply_balance_deltas,
+)
+from tests.support.fake_mysql import FakeDatabase
+
+
+class LedgerDatabase(FakeDatabase):
+    """Emulates the ledger statements over in-memory rows.
+
+    `history` stands in for the full-history aggregate: one
+    (group_id, user_id, net_cents, from_expense) row per user.
+    """
+
+    def __init__(self, history=()):
+        super().__init__(
+            on_execute={
+                "DELETE FROM group_balances": self._delete,
+                "INSERT INTO group_balances": self._rebuild,
+                "SELECT t.group_id": self._history,
+                "SELECT group_id, user_id, net_cents FROM group_balances": self._rows,
+            },
+            on_executemany={"INSERT INTO group_balances": self._upsert},
+            strict=True,
+        )
+        self.history = list(history)
+        self.balances = {}
+        self.upserts = 0
+
+    def history_rows(self, group_id):
+        return [row for row in self.history if group_id in (None, row[0])]
+
+    def _delete(self, cursor, params):
+        group_id = params[0] if params else None
+        for key in [k for k in self.balances if group_id in (None, k[0])]:
+            del self.balances[key]
+
+    def _rebuild(self, cursor, params):
+        assert "SELECT" in cursor.db.statements[-1]
+        rows = self.history_rows(params[0] if params else None)
+        for g, u, cents, from_expense in rows:
+            self.balances[(g, u)] = [cents, from_expense]
+        cursor.rowcount = len(rows)
+
+    def _history(self, cursor, params):
+        return self.history_rows(params[0] if params else None)
+
+    def _rows(self, cursor, params):
+        group_id = params[0] if params else None
+        return [
+            (g, u, cents)
+            for (g, u), (cents, _) in sorted(self.balances.items())
+            if group_id in (None, g)
+        ]
+
+    def _upsert(self, cursor, rows):
+        assert "ON DUPLICATE KEY UPDATE" in cursor.db.statements[-1]
+        self.upserts += 1
+        for group_id, user_id, cents, in_expenses in rows:
+            row = self.balances.setdefault((group_id, user_id), [0, 0])
+            row[0] += cents
+            row[1] = max(row[1], in_expenses)
+
+
+def test_deltas_accumulate_and_track_expense_membership():
+    """Verify deltas add up per user and only expense writes set in_expenses."""
+    db = LedgerDatabase()
+    cursor = db.cursor()
+
+    # Sam pays 50 split with Ria, then Ria settles 20 with Joe, who has no expenses
+    apply_balance_deltas(cursor, 1, {1: 2500, 2: -2500}, from_expense=True)
+    apply_balance_deltas(cursor, 1, {2: 2000, 3: -2000}, from_expense=False)
+    apply_balance_deltas(cursor, 1, {}, from_expense=True)
+
+    assert db.balances == {(1, 1): [2500, 1], (1, 2): [-500, 1], (1, 3): [-2000, 0]}
+    assert db.upserts == 2
+
+
+def test_verify_finds_drift_and_rebuild_fixes_it():
+    """Verify a drifted row is reported, and a rebuild makes the ledger match."""
+    db = LedgerDatabase(history=[(1, 1, 2500, 1), (1, 2, -2500, 1), (2, 1, 0, 1)])
+    ledger = BalanceLedgerMySQL(db)
+    cursor = db.cursor()
+    apply_balance_deltas(cursor, 1, {1: 2500, 2: -2400}, from_expense=True)
+    apply_balance_deltas(cursor, 2, {1: 0}, from_expense=True)
+
+    assert ledger.verify() == [LedgerMismatch(1, 2, -2400, -2500)]
+    assert ledger.verify(2) == []
+
+    assert ledger.rebuild(1) == 2
+    assert ledger.verify() == []
+    assert db.balances[(2, 1)] == [0, 1]
+
+
+@pytest.fixture
+def ledger_command(monkeypatch):
+    """Run the ledger command against a fake database."""
+    db = LedgerDatabase(history=[(1, 1, 2500, 1), (1, 2, -2500, 1)])
+    monkeypatch.setattr(ledger_cli, "setup_logging", lambda: None)
+    monkeypatch.setattr(ledger_cli, "load_database_config", lambda: None)
+
+    class Database:
+        def __init__(self, config):
+            pass
+
+        def connect(self):
+            return db.connect()
+
+        def close(self):
+            pass
+
+    monkeypatch.setattr(ledger_cli, "MySQLDatabase", Database)
+    return db
+
+
+def test_command_exit_codes(ledger_command, capsys):
+    """Verify verify exits 1 on mismatches and 0 once rebuild fixed them."""
+    apply_balance_deltas(ledger_command.cursor(), 1, {1: 2500}, from_expense=True)
+
+    assert ledger_cli.main(["verify"]) == 1
+    assert "group=1 user=2 ledger=0.00 expected=-25.00" in capsys.readouterr().out
+
+    assert ledger_cli.main(["rebuild", "--group", "1"]) == 0
+    assert "2 rows written" in capsys.readouterr().out
+
+    assert ledger_cli.main(["verify"]) == 0
+
+    with pytest.raises(SystemExit) as exit_info:
+        ledger_cli.main(["repair"])
+    assert exit_info.value.code == 2
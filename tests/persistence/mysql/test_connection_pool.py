@@ -0,0 +1,60 @@
+"""Tests for the bounded connection pool."""
+
+import pytest
+
+from app.persistence.mysql.pool import ConnectionPool, PoolTimeoutError
+from tests.support.fake_mysql import FakeConnection
+
+
+def test_connections_are_reused():
+    """Verify a released connection is handed out again."""
+    created = []
+
+    def factory():
+        conn = FakeConnection()
+        created.append(conn)
+        return conn
+
+    pool = ConnectionPool(factory, max_size=2)
+
+    conn = pool.acquire()
+    conn.close()
+    conn = pool.acquire()
+    conn.close()
+
+    stats = pool.stats()
+    assert len(created) == 1
+    assert stats.creations == 1
+    assert stats.checkouts == 2
+    assert stats.idle == 1
+
+
+def test_checkout_times_out_when_exhausted():
+    """Verify borrowing beyond the pool size waits then fails."""
+    pool = ConnectionPool(FakeConnection, max_size=1, timeout=0.05)
+
+    held = pool.acquire()
+    with pytest.raises(PoolTimeoutError):
+        pool.acquire()
+
+    stats = pool.stats()
+    assert stats.waits == 1
+    assert stats.timeouts == 1
+    held.close()
+
+
+def test_dead_connections_are_replaced():
+    """Verify liveness validation discards stale connections."""
+    pool = ConnectionPool(FakeConnection, max_size=1, validate=lambda conn: conn.alive)
+
+    conn = pool.acquire()
+    raw = conn._raw
+    conn.close()
+    raw.alive = False
+
+    fresh = pool.acquire()
+
+    assert fresh._raw is not raw
+    assert raw.closed
+    assert pool.stats().discarded == 1
+    fresh.close()
@@ -0,0 +1,66 @@
+"""Tests for keyset-paginated expense streaming."""
+
+from app.persistence.mysql.expense_repo_mysql import ExpenseRepositoryMySQL
+from tests.support.fake_mysql import FakeDatabase
+
+
+def _database(rows):
+    """Serve the expense join rows of the page requested by the query params."""
+    db = FakeDatabase()
+    db.queries = []
+
+    def page(cursor, params):
+        group_id, after_id, limit = params
+        db.queries.append(params)
+        ids = sorted({row[0] for row in rows if row[0] > after_id})[:limit]
+        return [row for row in rows if row[0] in ids]
+
+    db.on_execute["SELECT"] = page
+    return db
+
+
+def _rows(count):
+    """One equal split between two users per expense."""
+    rows = []
+    for expense_id in range(1, count + 1):
+        for user_id in (1, 2):
+            rows.append(
+                (
+                    expense_id,
+                    1,
+                    "sam",
+                    "sam@gmail.com",
+                    10,
+                    "EqualSplitStrategy",
+                    user_id,
+                    f"u{user_id}",
+                    f"u{user_id}@x.com",
+                    5,
+                )
+            )
+    return rows
+
+
+def test_iter_by_group_pages_by_id():
+    """Verify expenses stream across pages keyed on the last id seen."""
+    db = _database(_rows(5))
+    repo = ExpenseRepositoryMySQL(db, page_size=2)
+
+    expenses = list(repo.iter_by_group(7))
+
+    assert [expense.id for expense in expenses] == [1, 2, 3, 4, 5]
+    assert [params[1] for params in db.queries] == [0, 2, 4]
+    assert all(len(expense.participants) == 2 for expense in expenses)
+    assert db.open_connections == 0
+
+
+def test_iter_by_group_is_lazy():
+    """Verify only the first page is read before the consumer advances."""
+    db = _database(_rows(5))
+    repo = ExpenseRepositoryMySQL(db, page_size=2)
+
+    stream = repo.iter_by_group(7)
+    next(stream)
+
+    assert len(db.queries) == 1
+    assert db.open_connections == 0
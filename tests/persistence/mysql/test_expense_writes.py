@@ -0,0 +1,122 @@
+"""Tests for transactional expense inserts."""
+
+import pytest
+
+from app.domain.entities.expense import Expense
+from app.domain.entities.user import User
+from app.domain.split_strategies.equal import EqualSplitStrategy
+from app.persistence.mysql import expense_repo_mysql
+from app.persistence.mysql.expense_repo_mysql import ExpenseRepositoryMySQL
+from tests.support.fake_mysql import FakeDatabase
+
+SAM = User(1, "sam", "sam@example.com")
+RIA = User(2, "ria", "ria@example.com")
+
+
+class ExpensesDatabase(FakeDatabase):
+    """Keeps an expenses table with an auto-increment counter in memory."""
+
+    def __init__(self, id_step=1, fail_splits=False):
+        super().__init__(
+            on_execute={
+                "INSERT INTO expenses": self._insert_expense,
+                "SELECT id FROM expenses": self._select_ids,
+            },
+            on_executemany={
+                "INSERT INTO expenses": self._insert_expenses,
+                "INSERT INTO expense_splits": self._insert_splits,
+            },
+        )
+        self.id_step = id_step
+        self.fail_splits = fail_splits
+        self.next_id = 1
+        self.last_insert_id = None
+        self.expenses = {}
+        self.splits = []
+
+    def insert_expenses(self, rows):
+        """Allocate ids like InnoDB; id_step=2 mimics interleaved lock mode gaps."""
+        first = self.next_id
+        for row in rows:
+            self.expenses[self.next_id] = row
+            self.next_id += self.id_step
+        self.last_insert_id = first
+        return first
+
+    def _insert_expense(self, cursor, params):
+        cursor.lastrowid = self.insert_expenses([params])
+
+    def _insert_expenses(self, cursor, rows):
+        cursor.lastrowid = self.insert_expenses(rows)
+
+    def _select_ids(self, cursor, params):
+        group_id, limit = params
+        return [
+            (expense_id,)
+            for expense_id, row in sorted(self.expenses.items())
+            if row[0] == group_id and expense_id >= self.last_insert_id
+        ][:limit]
+
+    def _insert_splits(self, cursor, rows):
+        if self.fail_splits:
+            raise RuntimeError("split insert failed")
+        self.splits.extend(rows)
+
+
+def _expense(amount):
+    return Expense(None, SAM, amount, [SAM, RIA], EqualSplitStrategy())
+
+
+def test_save_writes_splits_ledger_and_version_in_one_transaction():
+    """Verify an expense, its splits and ledger deltas commit together."""
+    db = ExpensesDatabase()
+    repo = ExpenseRepositoryMySQL(db)
+
+    saved = repo.save(_expense(50), 7)
+
+    assert saved.id == 1
+    assert db.splits == [(1, SAM.id, 25.0), (1, RIA.id, 25.0)]
+    assert any(s.startswith("INSERT INTO group_balances") for s in db.statements)
+    assert db.statements[-1].startswith("UPDATE expense_groups")
+    assert db.events[1:] == ["commit", "close"]
+
+
+def test_save_rolls_back_when_splits_fail():
+    """Verify a failed split insert rolls the expense back and leaves no id."""
+    db = ExpensesDatabase(fail_splits=True)
+    repo = ExpenseRepositoryMySQL(db)
+    expense = _expense(50)
+
+    with pytest.raises(RuntimeError, match="split insert failed"):
+        repo.save(expense, 7)
+
+    assert expense.id is None
+    assert db.events[1:] == ["rollback", "close"]
+    assert not any(s.startswith("INSERT INTO group_balances") for s in db.statements)
+
+
+def test_save_many_reads_back_ids_that_are_not_consecutive(monkeypatch):
+    """Verify each chunk's ids are read back rather than assumed contiguous."""
+    monkeypatch.setattr(expense_repo_mysql, "_BATCH_SIZE", 2)
+    db = ExpensesDatabase(id_step=2)
+    repo = ExpenseRepositoryMySQL(db)
+    expenses = [_expense(amount) for amount in (10, 20, 30)]
+
+    repo.save_many(expenses, 7)
+
+    assert [expense.id for expense in expenses] == [1, 3, 5]
+    assert [row[0] for row in db.splits] == [1, 1, 3, 3, 5, 5]
+    assert db.events == [("begin", {"consistent_snapshot": True}), "commit", "close"]
+
+
+def test_save_many_rolls_back_on_failure():
+    """Verify a failed batch commits nothing and assigns no ids."""
+    db = ExpensesDatabase(fail_splits=True)
+    repo = ExpenseRepositoryMySQL(db)
+    expenses = [_expense(10), _expense(20)]
+
+    with pytest.raises(RuntimeError):
+        repo.save_many(expenses, 7)
+
+    assert [expense.id for expense in expenses] == [None, None]
+    assert db.events[1:] == ["rollback", "close"]
@@ -0,0 +1,221 @@
+"""End-to-end tests for the SQLite repository backend."""
+
+import sqlite3
+import threading
+
+import pytest
+
+from app.bootstrap.container import build_services
+from app.common.config import AppConfig
+from app.domain.entities.expense import Expense
+from app.domain.entities.user import User
+from app.domain.split_strategies.equal import EqualSplitStrategy
+from app.domain.split_strategies.factory import SplitType
+from app.domain.split_strategies.percentage import PercentageSplitStrategy
+from app.persistence.sqlite.db import SQLiteDatabase
+from app.persistence.sqlite.expense_repo_sqlite import ExpenseRepositorySQLite
+from app.persistence.sqlite.user_repo_sqlite import UserRepositorySQLite
+
+
+@pytest.fixture
+def services(tmp_path):
+    """Services wired to a fresh SQLite file."""
+    return build_services(
+        AppConfig(db_backend="sqlite", sqlite_path=str(tmp_path / "app.db"))
+    )
+
+
+def _group_with_members(services, *names):
+    """Create users and a group containing them."""
+    users = [
+        services["user"].create_user(name, f"{name}@example.com") for name in names
+    ]
+    group = services["group"].create_group("goa")
+    for user in users:
+        services["group"].add_member(group.id, user.id)
+    return group, users
+
+
+def test_database_uses_wal_and_one_connection_per_thread(tmp_path):
+    """Verify WAL journaling and a long-lived connection per thread."""
+    db = SQLiteDatabase(str(tmp_path / "app.db"))
+    main_conn = db.connect()
+    other = []
+
+    thread = threading.Thread(target=lambda: other.append(db.connect()))
+    thread.start()
+    thread.join()
+
+    assert main_conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert db.connect() is main_conn
+    assert other[0] is not main_conn
+    db.close()
+
+
+def test_balances_and_settlements_round_trip(services):
+    """Verify the ledger tracks expenses and settlements."""
+    group, (sam, ria) = _group_with_members(services, "sam", "ria")
+    services["expense"].add_expense(
+        group.id, sam.id, [sam.id, ria.id], 50, SplitType.EQUAL
+    )
+
+    assert services["settlement"].get_balances(group.id) == {sam: 25.0, ria: -25.0}
+
+    services["settlement"].record_settlement(group.id, ria.id, sam.id, 25)
+
+    assert services["settlement"].get_balances(group.id) == {sam: 0.0, ria: 0.0}
+    assert [s.amount for s in services["settlement"].iter_settlements(group.id)] == [
+        25.0
+    ]
+
+
+def test_save_many_assigns_ids_in_order(tmp_path):
+    """Verify batched inserts hand back the ids the rows were stored under."""
+    services = build_services(
+        AppConfig(db_backend="sqlite", sqlite_path=str(tmp_path / "app.db"))
+    )
+    group, (sam, ria) = _group_with_members(services, "sam", "ria")
+    repo = ExpenseRepositorySQLite(
+        SQLiteDatabase(str(tmp_path / "app.db")), page_size=2
+    )
+
+    expenses = [
+        Expense(None, sam, amount, [sam, ria], EqualSplitStrategy())
+        for amount in (10, 20, 30)
+    ]
+    repo.save_many(expenses, group.id)
+
+    stored = {expense.id: expense.amount for expense in repo.iter_by_group(group.id)}
+    assert stored == {expense.id: expense.amount for expense in expenses}
+
+
+def test_name_uniqueness_uses_index(services):
+    """Verify name and email lookups are case-insensitive."""
+    sam = services["user"].create_user("Sam", "Sam@Example.com")
+
+    assert services["user"].get_user_by_name("SAM") == sam
+    assert services["user"].get_user_by_email("sam@example.com") == sam
+
+
+def test_percentage_expenses_reload(services):
+    """Verify stored percentage shares rebuild a valid strategy on read."""
+    group, (sam, ria) = _group_with_members(services, "sam", "ria")
+    services["expense"].add_expense(
+        group.id,
+        sam.id,
+        [sam.id, ria.id],
+        80,
+        SplitType.PERCENTAGE,
+        {sam.id: 25, ria.id: 75},
+    )
+
+    (expense,) = services["expense"].list_expenses(group.id)
+    assert expense.split() == pytest.approx({sam: 20.0, ria: 60.0})
+
+
+def test_repository_rebuilds_percentage_splits_from_shares(tmp_path):
+    """Verify get_by_group and iter_by_group turn stored shares back into percentages."""
+    services = build_services(
+        AppConfig(db_backend="sqlite", sqlite_path=str(tmp_path / "app.db"))
+    )
+    group, (sam, ria) = _group_with_members(services, "sam", "ria")
+    repo = ExpenseRepositorySQLite(SQLiteDatabase(str(tmp_path / "app.db")))
+
+    for amount in (80, 0):
+        split = PercentageSplitStrategy({sam: 25, ria: 75})
+        repo.save(Expense(None, sam, amount, [sam, ria], split), group.id)
+
+    for expenses in (repo.get_by_group(group.id), list(repo.iter_by_group(group.id))):
+        assert [e.split() for e in expenses] == [
+            pytest.approx({sam: 20.0, ria: 60.0}),
+            {sam: 0.0, ria: 0.0},
+        ]
+
+
+def test_writes_bump_group_version(services):
+    """Verify expense, settlement and membership writes bump the change stamp."""
+    group, (sam, ria) = _group_with_members(services, "sam", "ria")
+    repo = services["group_repo"]
+    (before,) = repo.get_versions_since(None)
+
+    services["expense"].add_expense(
+        group.id, sam.id, [sam.id, ria.id], 50, SplitType.EQUAL
+    )
+    services["settlement"].record_settlement(group.id, ria.id, sam.id, 25)
+
+    (after,) = repo.get_versions_since(before.updated_at)
+    assert after.version == before.version + 2
+    assert after.updated_at >= before.updated_at
+    assert (
+        repo.get_versions_since(
+            after.updated_at.replace(year=after.updated_at.year + 1)
+        )
+        == []
+    )
+    assert services["dirty_groups"].drain() == {group.id}
+
+
+def test_old_database_files_gain_version_columns(tmp_path):
+    """Verify opening a file created before version tracking adds the columns."""
+    path = str(tmp_path / "old.db")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE expense_groups (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT)"
+    )
+    conn.execute("INSERT INTO expense_groups (name) VALUES ('goa')")
+    conn.commit()
+    conn.close()
+
+    db = SQLiteDatabase(path)
+    row = (
+        db.connect()
+        .execute("SELECT version, updated_at FROM expense_groups")
+        .fetchone()
+    )
+    assert row == (0, "1970-01-01 00:00:00.000")
+
+
+def test_balances_many_reads_a_batch_of_groups(services):
+    """Verify batch balances match per-group reads and skip unknown groups."""
+    goa, (sam, ria) = _group_with_members(services, "sam", "ria")
+    services["expense"].add_expense(
+        goa.id, sam.id, [sam.id, ria.id], 50, SplitType.EQUAL
+    )
+    idle = services["group"].create_group("idle")
+
+    balances = services["settlement"].get_balances_many([goa.id, idle.id, 999])
+
+    assert balances == {goa.id: {sam: 25.0, ria: -25.0}, idle.id: {}}
+    assert balances[goa.id] == services["settlement"].get_balances(goa.id)
+
+
+def test_split_less_expenses_are_skipped_by_every_read(tmp_path):
+    """Verify get_by_group and iter_by_group agree on expenses without splits."""
+    services = build_services(
+        AppConfig(db_backend="sqlite", sqlite_path=str(tmp_path / "app.db"))
+    )
+    group, (sam,) = _group_with_members(services, "sam")
+    db = SQLiteDatabase(str(tmp_path / "app.db"))
+    repo = ExpenseRepositorySQLite(db, page_size=2)
+    repo.save(Expense(None, sam, 10, [sam], EqualSplitStrategy()), group.id)
+    with db.transaction() as cursor:
+        cursor.execute(
+            "INSERT INTO expenses (group_id, paid_by, amount, split_type) VALUES (?, ?, 0, ?)",
+            (group.id, sam.id, "EqualSplitStrategy"),
+        )
+    for amount in (20, 30):
+        repo.save(Expense(None, sam, amount, [sam], EqualSplitStrategy()), group.id)
+
+    listed = [expense.amount for expense in repo.get_by_group(group.id)]
+    streamed = [expense.amount for expense in repo.iter_by_group(group.id)]
+    assert listed == streamed == [10, 20, 30]
+
+
+def test_user_keys_trim_spaces_like_sql(tmp_path):
+    """Verify lookups normalize exactly like the generated key columns."""
+    repo = UserRepositorySQLite(SQLiteDatabase(str(tmp_path / "app.db")))
+    sam = repo.save(User(None, "Sam\t", "sam@example.com "))
+
+    assert repo.get_by_name(" sam\t") == sam
+    assert repo.get_by_name("sam") is None
+    assert repo.get_by_email("SAM@example.com") == sam
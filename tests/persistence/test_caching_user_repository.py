@@ -0,0 +1,100 @@
+"""Tests for the caching user repository."""
+
+from unittest.mock import Mock
+
+from app.domain.entities.user import User
+from app.persistence.caching_user_repository import CachingUserRepository
+
+
+def test_get_by_id_hits_cache_after_first_read():
+    """Verify a second lookup is served without touching the inner repo."""
+    sam = User(1, "sam", "sam@gmail.com")
+    inner = Mock()
+    inner.get_by_id.return_value = sam
+
+    repo = CachingUserRepository(inner)
+
+    assert repo.get_by_id(1) is sam
+    assert repo.get_by_id(1) is sam
+
+    inner.get_by_id.assert_called_once_with(1)
+    stats = repo.stats()
+    assert (stats.hits, stats.misses) == (1, 1)
+
+
+def test_get_many_by_ids_fetches_only_misses():
+    """Verify bulk lookups only ask the inner repo for uncached ids."""
+    sam = User(1, "sam", "sam@gmail.com")
+    ria = User(2, "ria", "ria@gmail.com")
+    inner = Mock()
+    inner.get_by_id.return_value = sam
+    inner.get_many_by_ids.return_value = {ria.id: ria}
+
+    repo = CachingUserRepository(inner)
+    repo.get_by_id(1)
+
+    users = repo.get_many_by_ids([1, 2])
+
+    inner.get_many_by_ids.assert_called_once_with([2])
+    assert users == {1: sam, 2: ria}
+
+
+def test_lru_evicts_least_recently_used():
+    """Verify the cache stays bounded and keeps recently used users."""
+    inner = Mock()
+    inner.get_many_by_ids.return_value = {}
+    repo = CachingUserRepository(inner, max_size=2)
+
+    for user_id in (1, 2):
+        inner.get_by_id.return_value = User(user_id, f"u{user_id}", f"u{user_id}@x.com")
+        repo.get_by_id(user_id)
+
+    repo.get_by_id(1)
+    inner.get_by_id.return_value = User(3, "u3", "u3@x.com")
+    repo.get_by_id(3)
+
+    assert repo.stats().size == 2
+    assert repo.get_many_by_ids([1, 3]).keys() == {1, 3}
+    repo.get_many_by_ids([2])
+    inner.get_many_by_ids.assert_called_once_with([2])
+
+
+def test_save_writes_through_and_serves_email_lookups():
+    """Verify a saved user is cached for later email lookups."""
+    inner = Mock()
+    inner.save.side_effect = lambda user: User(7, user.name, user.email)
+
+    repo = CachingUserRepository(inner)
+    saved = repo.save(User(None, "sam", "Sam@Gmail.com"))
+
+    assert repo.get_by_email("sam@gmail.com") is saved
+    inner.get_by_email.assert_not_called()
+
+
+def test_name_lookups_share_the_cache():
+    """Verify a user cached by id also answers name lookups."""
+    sam = User(1, "Sam", "sam@gmail.com")
+    inner = Mock()
+    inner.get_by_id.return_value = sam
+
+    repo = CachingUserRepository(inner)
+    repo.get_by_id(1)
+
+    assert repo.get_by_name(" sam ") is sam
+    inner.get_by_name.assert_not_called()
+
+
+def test_get_all_leaves_the_cache_alone():
+    """Verify listing every user does not evict the entries lookups reuse."""
+    sam = User(1, "sam", "sam@gmail.com")
+    inner = Mock()
+    inner.get_by_id.return_value = sam
+    inner.get_all.return_value = [User(i, f"u{i}", f"u{i}@x.com") for i in range(2, 6)]
+
+    repo = CachingUserRepository(inner, max_size=2)
+    repo.get_by_id(1)
+
+    assert len(repo.get_all()) == 4
+    assert repo.get_by_id(1) is sam
+    inner.get_by_id.assert_called_once_with(1)
+    assert repo.stats().size == 1
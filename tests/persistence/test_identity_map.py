@@ -0,0 +1,32 @@
+"""Tests for the user identity map."""
+
+from app.persistence.identity_map import UserIdentityMap
+
+
+def test_same_row_returns_same_instance():
+    """Verify repeated rows for one id share a single User instance."""
+    users = UserIdentityMap()
+
+    first = users.intern(1, "sam", "sam@gmail.com")
+    second = users.intern(1, "sam", "sam@gmail.com")
+
+    assert first is second
+
+
+def test_changed_row_replaces_instance():
+    """Verify a row with new details is not served the stale instance."""
+    users = UserIdentityMap()
+
+    old = users.intern(1, "sam", "sam@gmail.com")
+    new = users.intern(1, "sam", "sam@example.com")
+
+    assert new is not old
+    assert users.get(1) is new
+
+
+def test_unreferenced_users_are_dropped():
+    """Verify entries are held weakly."""
+    users = UserIdentityMap()
+    users.intern(1, "sam", "sam@gmail.com")
+
+    assert users.get(1) is None
@@ -0,0 +1,63 @@
+"""Tests for per-statement query instrumentation."""
+
+import logging
+import sqlite3
+
+from app.common.logger import SLOW_QUERY_LOGGER
+from app.persistence.instrumentation import InstrumentedConnection, QueryRecorder
+
+
+class ReportRepository:
+    """Stand-in repository issuing statements through a connection."""
+
+    def __init__(self, conn):
+        self._conn = conn
+
+    def count_rows(self):
+        cursor = self._conn.cursor()
+        try:
+            cursor.execute("SELECT value FROM t ORDER BY value")
+            return len(cursor.fetchall())
+        finally:
+            cursor.close()
+
+    def first_value(self):
+        return self._conn.execute("SELECT value FROM t ORDER BY value").fetchone()[0]
+
+
+def _connection(recorder):
+    """An instrumented in-memory database with three rows."""
+    raw = sqlite3.connect(":memory:")
+    raw.execute("CREATE TABLE t (value INTEGER)")
+    raw.executemany("INSERT INTO t VALUES (?)", [(1,), (2,), (3,)])
+    return InstrumentedConnection(raw, recorder)
+
+
+def test_statements_are_grouped_by_repository_method():
+    """Verify each statement is attributed to the calling repository method."""
+    recorder = QueryRecorder(slow_threshold=None)
+    repo = ReportRepository(_connection(recorder))
+
+    assert repo.count_rows() == 3
+    assert repo.count_rows() == 3
+    assert repo.first_value() == 1
+
+    stats = recorder.snapshot()
+    assert stats["ReportRepository.count_rows"].count == 2
+    assert stats["ReportRepository.count_rows"].rows == 6
+    assert sum(stats["ReportRepository.count_rows"].buckets) == 2
+    assert stats["ReportRepository.first_value"].rows == 1
+
+
+def test_slow_statements_go_to_slow_query_log(caplog):
+    """Verify statements over the threshold are written to the slow-query log."""
+    recorder = QueryRecorder(slow_threshold=0.0)
+    repo = ReportRepository(_connection(recorder))
+
+    with caplog.at_level(logging.WARNING, logger=SLOW_QUERY_LOGGER):
+        repo.count_rows()
+
+    records = [r for r in caplog.records if r.name == SLOW_QUERY_LOGGER]
+    assert len(records) == 1
+    assert "ReportRepository.count_rows" in records[0].getMessage()
+    assert "SELECT value FROM t" in records[0].getMessage()
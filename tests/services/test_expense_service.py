@@ -1,8 +1,8 @@
 """Tests for expense service."""
 
+import pytest
 from unittest.mock import Mock
 from app.services.expense_service import ExpenseService
-from app.domain.entities.group import Group
 from app.domain.entities.user import User
 from app.domain.split_strategies.factory import SplitType
 
@@ -16,8 +16,8 @@ def test_add_expense_equal_split():
     user_repo = Mock()
     expense_repo = Mock()
 
-    group_repo.get_by_id.return_value = Group(group_id, "goa")
-    user_repo.get_by_id.return_value = user
+    group_repo.exists.return_value = True
+    user_repo.get_many_by_ids.return_value = {user.id: user}
     expense_repo.save.side_effect = lambda exp, gid: exp  # return same expense with assigned data
 
     service = ExpenseService(expense_repo, group_repo, user_repo)
@@ -32,3 +32,47 @@ def test_add_expense_equal_split():
 
     expense_repo.save.assert_called_once()
     assert expense.amount == 100
+
+
+def test_add_expense_looks_up_users_in_one_call():
+    """Verify payer and participants are fetched with a single bulk lookup."""
+    sam = User(1, "sam", "sam@gmail.com")
+    ria = User(2, "ria", "ria@gmail.com")
+
+    group_repo = Mock()
+    user_repo = Mock()
+    expense_repo = Mock()
+
+    group_repo.exists.return_value = True
+    user_repo.get_many_by_ids.return_value = {sam.id: sam, ria.id: ria}
+    expense_repo.save.side_effect = lambda exp, gid: exp
+
+    service = ExpenseService(expense_repo, group_repo, user_repo)
+
+    expense = service.add_expense(
+        group_id=1,
+        paid_by_id=sam.id,
+        participant_ids=[sam.id, ria.id],
+        amount=50,
+        split_type=SplitType.EQUAL
+    )
+
+    user_repo.get_many_by_ids.assert_called_once()
+    user_repo.get_by_id.assert_not_called()
+    group_repo.get_by_id.assert_not_called()
+    assert expense.participants == [sam, ria]
+
+
+def test_add_expense_rejects_unknown_participant():
+    """Verify a missing participant id raises a clear error."""
+    sam = User(1, "sam", "sam@gmail.com")
+
+    group_repo = Mock()
+    user_repo = Mock()
+    group_repo.exists.return_value = True
+    user_repo.get_many_by_ids.return_value = {sam.id: sam}
+
+    service = ExpenseService(Mock(), group_repo, user_repo)
+
+    with pytest.raises(ValueError, match="User 9 not found"):
+        service.add_expense(1, sam.id, [sam.id, 9], 50, SplitType.EQUAL)
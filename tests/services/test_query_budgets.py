@@ -0,0 +1,85 @@
+"""Query budgets for service calls, run against the SQLite backend."""
+
+import pytest
+
+from app.bootstrap.container import build_services
+from app.common.config import AppConfig
+from app.domain.split_strategies.factory import SplitType
+from tests.support.query_budget import query_budget
+
+
+def _services(tmp_path):
+    """Instrumented services over a fresh SQLite file (no caches in the way)."""
+    return build_services(
+        AppConfig(
+            db_backend="sqlite",
+            sqlite_path=str(tmp_path / "budget.db"),
+            user_cache_size=0,
+            balance_tracking=False,
+            query_stats=True,
+            slow_query_ms=60_000,
+        )
+    )
+
+
+def _seed(services, members: int, expenses: int):
+    """Create a group with members and equal-split expenses among them."""
+    users = [
+        services["user"].create_user(f"user{i}", f"user{i}@example.com")
+        for i in range(members)
+    ]
+    group = services["group"].create_group("trip")
+    for user in users:
+        services["group"].add_member(group.id, user.id)
+    ids = [user.id for user in users]
+    for i in range(expenses):
+        services["expense"].add_expense(
+            group.id, ids[i % members], ids, 10 * members, SplitType.EQUAL
+        )
+    return group, users
+
+
+@pytest.mark.parametrize("members", [2, 25])
+def test_add_expense_is_constant_in_participants(tmp_path, members):
+    """Verify adding an expense does not query per participant."""
+    services = _services(tmp_path)
+    group, users = _seed(services, members, expenses=0)
+    ids = [user.id for user in users]
+
+    with query_budget(services["query_stats"], budget=9, label="add_expense"):
+        services["expense"].add_expense(
+            group.id, ids[0], ids, 10 * members, SplitType.EQUAL
+        )
+
+
+@pytest.mark.parametrize("expenses", [1, 40])
+def test_get_balances_is_constant_in_history(tmp_path, expenses):
+    """Verify balances are read without replaying expenses row by row."""
+    services = _services(tmp_path)
+    group, _ = _seed(services, members=4, expenses=expenses)
+
+    with query_budget(services["query_stats"], budget=2, label="get_balances"):
+        services["settlement"].get_balances(group.id)
+
+
+@pytest.mark.parametrize("expenses", [1, 40])
+def test_settlement_plan_is_constant_in_history(tmp_path, expenses):
+    """Verify the settlement screen loads the group and balances once."""
+    services = _services(tmp_path)
+    group, _ = _seed(services, members=4, expenses=expenses)
+
+    with query_budget(services["query_stats"], budget=4, label="get_settlement_plan"):
+        services["settlement"].get_settlement_plan(group.id)
+
+
+def test_budget_reports_offending_call_sites(tmp_path):
+    """Verify an exceeded budget fails with a per-call-site breakdown."""
+    services = _services(tmp_path)
+    group, users = _seed(services, members=3, expenses=0)
+
+    with (
+        pytest.raises(AssertionError, match="UserRepositorySQLite.get_by_id: 3"),
+        query_budget(services["query_stats"], budget=1, label="lookups"),
+    ):
+        for user in users:
+            services["user"].get_user(user.id)
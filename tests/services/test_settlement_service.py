@@ -1,9 +1,23 @@
 """Tests for settlement service."""
 
+import threading
 from unittest.mock import Mock
 from app.services.settlement_service import SettlementService
+from app.services.expense_service import ExpenseService
+from app.services.group_service import GroupService
+from app.services.user_service import UserService
+from app.domain.domain_services.incremental_settlement_calculator import (
+    IncrementalSettlementCalculator,
+)
 from app.domain.domain_services.settlement_calculator import SettlementCalculator
+from app.domain.split_strategies.factory import SplitType
+from app.persistence.memory.expense_repo_memory import ExpenseRepositoryMemory
+from app.persistence.memory.group_repo_memory import GroupRepositoryMemory
+from app.persistence.memory.settlement_repo_memory import SettlementRepositoryMemory
+from app.persistence.memory.store import MemoryStore
+from app.persistence.memory.user_repo_memory import UserRepositoryMemory
 from app.domain.entities.group import Group
+from app.domain.entities.user import User
 
 
 def test_get_balances():
@@ -20,3 +34,150 @@ def test_get_balances():
     balances = service.get_balances(group_id)
 
     assert isinstance(balances, dict)
+
+
+def test_get_balances_uses_repository_aggregation(user_a):
+    """Verify balances come from the aggregated repository query."""
+    group_repo = Mock()
+    settlement_repo = Mock()
+    settlement_repo.get_net_balances.return_value = {user_a: 12.345}
+
+    service = SettlementService(group_repo, SettlementCalculator(), settlement_repo)
+
+    balances = service.get_balances(1)
+
+    settlement_repo.get_net_balances.assert_called_once_with(1)
+    group_repo.get_by_id.assert_not_called()
+    assert balances == {user_a: 12.35}
+
+
+def test_settlement_plan_loads_group_once(user_a):
+    """Verify the plan is built from a single group load and balance read."""
+    bob = User(2, "Bob", "bob@example.com")
+    group = Group(1, "goa")
+    group.add_member(user_a)
+    group.add_member(bob)
+
+    group_repo = Mock()
+    group_repo.get_by_id.return_value = group
+    settlement_repo = Mock()
+    settlement_repo.get_net_balances.return_value = {user_a: 25.0, bob: -25.0}
+
+    service = SettlementService(group_repo, SettlementCalculator(), settlement_repo)
+
+    plan = service.get_settlement_plan(1)
+
+    group_repo.get_by_id.assert_called_once_with(1)
+    group_repo.exists.assert_not_called()
+    settlement_repo.get_net_balances.assert_called_once_with(1)
+    assert plan.group_name == "goa"
+    assert plan.members == [user_a, bob]
+    assert plan.suggestions == [(bob, user_a, 25.0)]
+    assert plan.balances_after == {user_a: 0.0, bob: 0.0}
+
+
+def test_record_settlement_fetches_only_the_two_members(user_a):
+    """Verify recording a settlement looks up just the debtor and creditor."""
+    bob = User(2, "Bob", "bob@example.com")
+
+    group_repo = Mock()
+    group_repo.exists.return_value = True
+    group_repo.get_members_by_ids.return_value = {user_a.id: user_a, bob.id: bob}
+    settlement_repo = Mock()
+    settlement_repo.save.side_effect = lambda settlement: settlement
+
+    service = SettlementService(group_repo, SettlementCalculator(), settlement_repo)
+
+    saved = service.record_settlement(1, user_a.id, bob.id, 10.0)
+
+    group_repo.get_members_by_ids.assert_called_once_with(1, [user_a.id, bob.id])
+    group_repo.get_by_id.assert_not_called()
+    assert saved.debtor == user_a and saved.creditor == bob
+
+
+def test_get_balances_many_reads_the_batch_in_one_query(user_a):
+    """Verify a batch of groups is read with a single repository call."""
+    group_repo = Mock()
+    settlement_repo = Mock()
+    settlement_repo.get_net_balances_many.return_value = {1: {user_a: 1.234}, 2: {}}
+
+    service = SettlementService(group_repo, SettlementCalculator(), settlement_repo)
+
+    balances = service.get_balances_many([1, 2, 3, 1])
+
+    settlement_repo.get_net_balances_many.assert_called_once_with([1, 2, 3])
+    settlement_repo.get_net_balances.assert_not_called()
+    group_repo.exists.assert_not_called()
+    assert balances == {1: {user_a: 1.23}, 2: {}}
+
+
+def test_replay_during_a_committed_write_is_not_counted_twice():
+    """Verify a replay that reads a just-committed expense does not double it."""
+    committed = threading.Event()
+    release = threading.Event()
+
+    class PausingExpenseRepository(ExpenseRepositoryMemory):
+        def save(self, expense, group_id):
+            saved = super().save(expense, group_id)
+            committed.set()
+            release.wait(5)
+            return saved
+
+    store = MemoryStore()
+    user_repo, group_repo = UserRepositoryMemory(store), GroupRepositoryMemory(store)
+    tracker = IncrementalSettlementCalculator()
+    users = UserService(user_repo)
+    groups = GroupService(group_repo, user_repo)
+    expenses = ExpenseService(
+        PausingExpenseRepository(store), group_repo, user_repo, tracker
+    )
+    service = SettlementService(group_repo, tracker, SettlementRepositoryMemory(store))
+
+    sam = users.create_user("sam", "sam@example.com")
+    ria = users.create_user("ria", "ria@example.com")
+    group = groups.create_group("goa")
+    groups.add_member(group.id, sam.id)
+    groups.add_member(group.id, ria.id)
+    service.get_balances(group.id)
+
+    writer = threading.Thread(
+        target=expenses.add_expense,
+        args=(group.id, sam.id, [sam.id, ria.id], 50, SplitType.EQUAL),
+    )
+    writer.start()
+    assert committed.wait(5)
+    # Expire the tracked state so this read replays the committed row
+    tracker.forget(group.id)
+    assert service.get_balances(group.id) == {sam: 25.0, ria: -25.0}
+    release.set()
+    writer.join(5)
+
+    assert service.get_balances(group.id) == {sam: 25.0, ria: -25.0}
+
+
+def test_get_balances_many_fresh_sees_writes_from_another_process():
+    """Verify fresh batch reads skip tracked balances that missed an outside write."""
+    store = MemoryStore()
+    user_repo, group_repo = UserRepositoryMemory(store), GroupRepositoryMemory(store)
+    users = UserService(user_repo)
+    groups = GroupService(group_repo, user_repo)
+    service = SettlementService(
+        group_repo, IncrementalSettlementCalculator(), SettlementRepositoryMemory(store)
+    )
+    # A second process writing to the same store, with its own tracker
+    other = ExpenseService(ExpenseRepositoryMemory(store), group_repo, user_repo)
+
+    sam = users.create_user("sam", "sam@example.com")
+    ria = users.create_user("ria", "ria@example.com")
+    group = groups.create_group("goa")
+    groups.add_member(group.id, sam.id)
+    groups.add_member(group.id, ria.id)
+    assert service.get_balances_many([group.id]) == {group.id: {}}
+
+    other.add_expense(group.id, sam.id, [sam.id, ria.id], 50, SplitType.EQUAL)
+
+    assert service.get_balances_many([group.id]) == {group.id: {}}
+    fresh = {group.id: {sam: 25.0, ria: -25.0}}
+    assert service.get_balances_many([group.id], fresh=True) == fresh
+    # The fresh read re-seeded the tracked copy
+    assert service.get_balances_many([group.id]) == fresh
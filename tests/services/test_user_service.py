@@ -9,13 +9,29 @@ def test_create_user():
     """Verify user creation with unique email."""
     user_repo = Mock()
     user_repo.get_by_email.return_value = None
-    user_repo.get_all.return_value = []
+    user_repo.get_by_name.return_value = None
     user_repo.save.return_value = User(id=1, name="sam", email="sam@gmail.com")
     service = UserService(user_repo)
 
     user = service.create_user("sam", "sam@gmail.com")
 
     user_repo.get_by_email.assert_called_once_with("sam@gmail.com")
+    user_repo.get_by_name.assert_called_once_with("sam")
+    user_repo.get_all.assert_not_called()
     user_repo.save.assert_called_once()
     assert user.name == "sam"
-    assert user.email == "sam@gmail.com"
\ No newline at end of file
+    assert user.email == "sam@gmail.com"
+
+
+def test_create_user_returns_existing_user_with_same_name():
+    """Verify a case-insensitive name match returns the existing user."""
+    existing = User(id=1, name="Sam", email="sam@gmail.com")
+    user_repo = Mock()
+    user_repo.get_by_email.return_value = None
+    user_repo.get_by_name.return_value = existing
+    service = UserService(user_repo)
+
+    user = service.create_user(" sam ", "other@gmail.com")
+
+    assert user is existing
+    user_repo.save.assert_not_called()
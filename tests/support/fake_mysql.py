@@ -0,0 +1,100 @@
+"""In-memory stand-in for the MySQL driver used by repository tests."""
+
+from collections.abc import Callable
+from typing import Any
+
+# handler(cursor, params) -> rows served by fetchall and iteration, or None
+Handler = Callable[["FakeCursor", Any], list[tuple] | None]
+
+
+class FakeCursor:
+    """Records statements and answers them through its database's handlers."""
+
+    def __init__(self, db: "FakeDatabase", buffered: bool | None = None):
+        self.db = db
+        self.buffered = buffered
+        self.lastrowid: int | None = None
+        self.rowcount = 0
+        self._result: list[tuple] = []
+
+    def execute(self, sql: str, params: Any = ()) -> None:
+        self._run(self.db.on_execute, sql, params)
+
+    def executemany(self, sql: str, rows: list[tuple]) -> None:
+        self._run(self.db.on_executemany, sql, rows)
+
+    def fetchall(self) -> list[tuple]:
+        return self._result
+
+    def __iter__(self):
+        return iter(self._result)
+
+    def close(self) -> None:
+        pass
+
+    def _run(self, handlers: dict[str, Handler], sql: str, params: Any) -> None:
+        """Dispatch on the first handler whose prefix starts the statement."""
+        sql = " ".join(sql.split())
+        self.db.statements.append(sql)
+        for prefix, handler in handlers.items():
+            if sql.startswith(prefix):
+                self._result = handler(self, params) or []
+                return
+        if self.db.strict:
+            raise AssertionError(f"unexpected statement: {sql}")
+
+
+class FakeConnection:
+    """Connection that logs transaction events on its database."""
+
+    def __init__(self, db: "FakeDatabase | None" = None):
+        self.db = db if db is not None else FakeDatabase()
+        self.alive = True
+        self.closed = False
+
+    def start_transaction(self, **options) -> None:
+        self.db.events.append(("begin", options))
+
+    def cursor(self, buffered: bool | None = None) -> FakeCursor:
+        return FakeCursor(self.db, buffered)
+
+    def commit(self) -> None:
+        self.db.events.append("commit")
+
+    def rollback(self) -> None:
+        self.db.events.append("rollback")
+
+    def close(self) -> None:
+        self.closed = True
+        self.db.events.append("close")
+        self.db.open_connections -= 1
+
+
+class FakeDatabase:
+    """Hands out fake connections and keeps what they did.
+
+    `on_execute` and `on_executemany` map a statement prefix (whitespace
+    collapsed) to a handler; statements without a handler are only recorded,
+    or rejected when `strict` is set.
+    """
+
+    def __init__(
+        self,
+        on_execute: dict[str, Handler] | None = None,
+        on_executemany: dict[str, Handler] | None = None,
+        strict: bool = False,
+    ):
+        self.on_execute = dict(on_execute or {})
+        self.on_executemany = dict(on_executemany or {})
+        self.strict = strict
+        self.statements: list[str] = []
+        self.events: list[Any] = []
+        self.open_connections = 0
+
+    def cursor(self) -> FakeCursor:
+        """Return a cursor outside any connection."""
+        return FakeCursor(self)
+
+    def connect(self) -> FakeConnection:
+        self.open_connections += 1
+        return FakeConnection(self)
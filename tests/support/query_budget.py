@@ -0,0 +1,53 @@
+"""Query-count budgets that fail tests on N+1 regressions."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from app.persistence.instrumentation import QueryRecorder
+
+
+@dataclass
+class QueryCount:
+    """Statements issued inside a query_budget block, filled in on exit."""
+
+    limit: int
+    total: int = 0
+    by_call_site: dict[str, int] = field(default_factory=dict)
+
+
+@contextmanager
+def query_budget(
+    recorder: QueryRecorder,
+    budget: int,
+    per_item: int = 0,
+    items: int = 0,
+    label: str = "block",
+) -> Iterator[QueryCount]:
+    """Fail when the block issues more than budget + per_item * items statements.
+
+    Use per_item for work that is legitimately linear in the dataset (e.g.
+    one batch per 1000 rows); N+1 patterns show up as counts that grow with
+    items while the declared budget stays flat.
+    """
+    count = QueryCount(limit=budget + per_item * items)
+    before = recorder.snapshot()
+
+    yield count
+
+    for call_site, stats in recorder.snapshot().items():
+        previous = before[call_site].count if call_site in before else 0
+        if stats.count > previous:
+            count.by_call_site[call_site] = stats.count - previous
+    count.total = sum(count.by_call_site.values())
+
+    if count.total > count.limit:
+        breakdown = "\n".join(
+            f"  {call_site}: {issued}"
+            for call_site, issued in sorted(
+                count.by_call_site.items(), key=lambda item: -item[1]
+            )
+        )
+        raise AssertionError(
+            f"{label} issued {count.total} statements, budget is {count.limit}:\n{breakdown}"
+        )